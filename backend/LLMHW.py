@@ -1,65 +1,68 @@
 # backend/LLMHW.py
 from __future__ import annotations
 
-import os
+import asyncio
+import contextvars
+import math
 import re
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 # Tools / store
-from backend.vector_store.retriever import BookRetriever
-from backend.tools.translation_tool import detect_language, translate
-from backend.tools.language_filter_tool import is_offensive
-from backend.tools.tts_tool import speak
+from backend.vector_store.retriever import get_retriever
+from backend.tools.translation_tool import detect_language, translate, translate_async
+from backend.tools.language_filter_tool import is_offensive_async, is_offensive_remote, precheck_offensive
 from backend.tools.book_summary_tool import (
     get_summary_by_title,
     list_titles,
     normalize_title,
     resolve_title_from_any_text,
 )
-from backend.tools.stt_tool import capture_and_transcribe_vad
+from backend.services.answer_cache import get_answer_cache
+from backend.services.language_detection import looks_like
+from backend.services.openai_client import get_async_openai_client, get_openai_client
+from backend.services.tracing import span
 
 
 # ---------------- OpenAI client (lazy) ----------------
 
 def _get_client() -> OpenAI:
-    """
-    Lazy-init pentru clientul OpenAI. NU creăm client la import, doar când chiar avem nevoie.
-    Curățăm potențialele newline/ghilimele din cheie.
-    """
-    raw = os.getenv("OPENAI_API_KEY", "")
-    api_key = raw.strip().strip('"').strip("'")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY missing. Set it in .env or environment.")
-    return OpenAI(api_key=api_key)
+    """Clientul OpenAI partajat (pool httpx comun, creat la primul apel, nu la import)."""
+    return get_openai_client("chat")
+
+
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_openai_client("chat")
 
 
 # ---------------- Vector retriever ----------------
 
-# Chroma nu depinde de cheia OpenAI, deci poate fi creat la import fără risc
-retriever = BookRetriever()
+# Creat la primul request (get_retriever), nu la import: importul modulului
+# (routes_chat) rămâne ieftin, iar lifespan-ul API-ului îl încălzește explicit.
+def __getattr__(name: str):
+    # compatibilitate: `LLMHW.retriever` pentru scripturile existente
+    if name == "retriever":
+        return get_retriever()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Moderation API în paralel cu traducerea, pe calea sync (chat_with_llm)
+_moderation_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="moderation")
 
 
 # ---------------- Heuristici limbă ----------------
 
 def looks_like_romanian(text: str) -> bool:
-    t = (text or "").lower()
-    ro_hints = [
-        "îmi", "imi", "poți", "poti", "te rog", "mulțumesc", "multumesc",
-        "carte", "despre", "vreau", "dragoni", "magie",
-        "ce este", "spune-mi", "spunemi", "știi", "stii",
-        "bună", "buna", "salut"
-    ]
-    if any(ch in t for ch in "ăâîșț"):
-        return True
-    return any(h in t for h in ro_hints)
+    return looks_like(text, "ro")
 
 
 def enforce_detected_lang(user_input: str, detected: Optional[str]) -> str:
     """
     Override pentru cazuri ambigue: dacă pare română, forțăm 'ro'.
     Dacă detectarea e necunoscută, cădem pe 'en'.
+    (detect_language aplică deja override-ul RO; aici rămâne ca plasă de siguranță.)
     """
     if detected in {"it", "es", "pt", "fr"} and looks_like_romanian(user_input):
         return "ro"
@@ -218,6 +221,82 @@ def is_question_about_books(text: str) -> bool:
 
 # ---------------- Main chat flow ----------------
 
+OFFENSIVE_MSG = "Your message contains inappropriate language. Please rephrase politely."
+OFF_TOPIC_MSG = "Please ask something related to books or stories."
+FALLBACK_MSG = "Sorry, I don't have information about that..."
+
+CHAT_MODEL = "gpt-4o-mini"
+
+
+def _rag_messages(english_input: str, summary: str, detected_lang: str) -> list[dict]:
+    """Prompt-urile pentru recomandarea conversațională (RAG)."""
+    lang_directive = {
+        "ro": "Respond in Romanian.",
+        "en": "Respond in English."
+    }.get(detected_lang, f"Respond in {detected_lang}.")
+
+    system_prompt = (
+        "You are an intelligent assistant that recommends books based on user interests. "
+        "Use the provided context to give a helpful and natural recommendation. "
+        + lang_directive
+    )
+    user_prompt = f'''User asked: "{english_input}"
+
+Context: "{summary}"
+
+Respond with a friendly book suggestion. Mention the book title if relevant.'''
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _summary_block(title: str, full_summary: Optional[str], localized_summary: Optional[str], detected_lang: str) -> str:
+    if not full_summary:
+        return ""
+    if detected_lang != "en":
+        return f"\n\nIată un rezumat detaliat al *{title}*:\n{localized_summary}"
+    return f"\n\nHere's a detailed summary of *{title}*:\n{full_summary}"
+
+
+def _answer_cache_text(english_input: str) -> str:
+    # același text ca varianta „originală” din expand_thematic_query -> embedding-ul vine din cache
+    return (english_input or "").lower().strip()
+
+
+def _answer_cache_embedding(retriever, english_input: str) -> Optional[list[float]]:
+    """Embedding-ul întrebării pentru cache-ul de răspunsuri; None (= miss) dacă API-ul eșuează."""
+    try:
+        return retriever.embed(_answer_cache_text(english_input))
+    except Exception as e:
+        # cache-ul e best-effort: fără embedding e doar un miss, nu o cerere eșuată
+        print(f"[Answer Cache] Embedding failed, skipping cache: {e}")
+        return None
+
+
+def _best_candidate(matches, retriever) -> Optional[tuple[float, str, str]]:
+    """
+    (distance, title, summary) pentru primul rezultat cu distanță, dacă trece pragul de pe
+    scara lui (retriever.max_distance_for: BM25 vs furnizorul de embeddings), altfel None.
+    Retriever-ul întoarce lista deja ordonată (distanță crescătoare; în modul hybrid, scor
+    RRF, iar titlurile găsite doar lexical au distanța inf: fără dovadă vectorială nu trec).
+    """
+    for m in matches:
+        if math.isfinite(m.distance):
+            if m.distance <= retriever.max_distance_for(m):
+                return float(m.distance), m.title, m.summary
+            return None
+    return None
+
+
+def _localize(text: Optional[str], lang: str) -> Optional[str]:
+    """Traducerea înapoi în limba utilizatorului (no-op pentru EN / text gol)."""
+    if lang == "en" or not text:
+        return text
+    with span("translate_back"):
+        return translate(text, target_lang=lang, source_lang="en")
+
+
 def chat_with_llm(user_input: str) -> Tuple[str, str, Optional[str]]:
     """
     Flow:
@@ -231,116 +310,300 @@ def chat_with_llm(user_input: str) -> Tuple[str, str, Optional[str]]:
     """
     # 1) Limba + ofensiv
         # 1) Detectăm limba și filtrăm limbaj nepotrivit
-    raw_lang = detect_language(user_input)
-    detected_lang = enforce_detected_lang(user_input, raw_lang)
+    with span("detect"):
+        raw_lang = detect_language(user_input)
+        detected_lang = enforce_detected_lang(user_input, raw_lang)
+
+    # verdict local (lexicon / cache / întrebare evident benignă); dacă trebuie
+    # Moderation API, rulează într-un thread în paralel cu traducerea în EN
+    with span("moderation"):
+        offensive = precheck_offensive(user_input)
+    # copy_context: span-urile / latența apelului de moderare ajung în trace-ul request-ului
+    pending = (
+        _moderation_pool.submit(contextvars.copy_context().run, is_offensive_remote, user_input)
+        if offensive is None else None
+    )
 
-    if is_offensive(user_input):
-        msg = "Your message contains inappropriate language. Please rephrase politely."
-        out = translate(msg, target_lang=detected_lang) if detected_lang != "en" else msg
+    english_input = None
+    if not offensive and detected_lang != "en" and pending is not None:
+        with span("translate"):
+            english_input = translate(user_input, target_lang="en", source_lang=detected_lang)
+
+    if pending is not None:
+        with span("moderation"):
+            offensive = pending.result()
+    if offensive:
         # >>> return cu 4 valori:
-        return out, detected_lang, None, None
+        return _localize(OFFENSIVE_MSG, detected_lang), detected_lang, None, None
 
 
     # 2) Normalizare la EN (pentru lookup/RAG)
-    english_input = user_input if detected_lang == "en" else translate(
-        user_input, target_lang="en", source_lang=detected_lang
-    )
+    if english_input is None:
+        if detected_lang == "en":
+            english_input = user_input
+        else:
+            with span("translate"):
+                english_input = translate(user_input, target_lang="en", source_lang=detected_lang)
 
     # 3) LOOKUP STRICT (folosește utilitarul din book_summary_tool)
-    exact_title = resolve_title_from_any_text(user_input, english_input)
+    with span("title"):
+        exact_title = resolve_title_from_any_text(user_input, english_input)
     if exact_title:
         full_summary = get_summary_by_title(exact_title)
         if full_summary:
             full_text_en = f"{exact_title}\n\n{full_summary}"
-            if detected_lang != "en":
-                localized_text = translate(full_text_en, target_lang=detected_lang)
-                localized_summary = translate(full_summary, target_lang=detected_lang)
-                return localized_text, detected_lang, localized_summary, exact_title
-            return full_text_en, detected_lang, full_summary, exact_title
+            localized_text = _localize(full_text_en, detected_lang)
+            localized_summary = _localize(full_summary, detected_lang)
+            return localized_text, detected_lang, localized_summary, exact_title
         # dacă nu avem summary, continuăm cu RAG
 
 
     # 4) RAG tematic (extindem ușor interogarea)
     expanded = expand_thematic_query(english_input)
-    candidates: list[tuple[float, str, str]] = []  # (distance, title, summary)
-
-    for q in expanded:
-        ms = retriever.query(q, top_k=3)
-        for m in ms:
-            candidates.append((float(m.distance), m.title, m.summary))
-
-    candidates.sort(key=lambda x: x[0])
-
-    if candidates:
-        best_dist, title, summary = candidates[0]
-        # prag puțin relaxat pentru teme (ajustează dacă vrei mai strict)
-        if best_dist <= 1.6:
-            # LLM – răspuns conversațional în limba utilizatorului
-            lang_directive = {
-                "ro": "Respond in Romanian.",
-                "en": "Respond in English."
-            }.get(detected_lang, f"Respond in {detected_lang}.")
-
-            system_prompt = (
-                "You are an intelligent assistant that recommends books based on user interests. "
-                "Use the provided context to give a helpful and natural recommendation. "
-                + lang_directive
-            )
-            user_prompt = f'''User asked: "{english_input}"
-
-Context: "{summary}"
-
-Respond with a friendly book suggestion. Mention the book title if relevant.'''
-
+    retriever = get_retriever()
+    best = _best_candidate(retriever.query_many(expanded, top_k=3), retriever)
+    # pragul depinde de furnizorul de embeddings / de scara BM25 (RAG_MAX_DISTANCE îl suprascrie)
+    if best:
+        _, title, summary = best
+
+        # LLM – răspuns conversațional în limba utilizatorului
+        # (cache semantic: o întrebare aproape identică pentru aceeași carte refolosește răspunsul)
+        answer_cache = get_answer_cache()
+        # în modul lexical nu plătim un embedding doar pentru cache
+        use_cache = answer_cache.enabled and retriever.uses_embeddings
+        query_emb = _answer_cache_embedding(retriever, english_input) if use_cache else None
+        model_answer = answer_cache.lookup(detected_lang, title, query_emb) if query_emb else None
+        if model_answer is None:
             client = _get_client()
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7
-            )
+            with span("completion"):
+                response = client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=_rag_messages(english_input, summary, detected_lang),
+                    temperature=0.7
+                )
             model_answer = (response.choices[0].message.content or "").strip()
+            if query_emb:
+                answer_cache.store(detected_lang, title, query_emb, model_answer)
 
-            # Rezumat complet din sursa locală (pt. afișare + TTS)
-            full_summary = get_summary_by_title(title)
-            localized_summary = (
-                translate(full_summary, target_lang=detected_lang)
-                if (detected_lang != "en" and full_summary)
-                else full_summary
-            )
-
-            summary_block = ""
-            if full_summary:
-                if detected_lang != "en":
-                    summary_block = f"\n\nIată un rezumat detaliat al *{title}*:\n{localized_summary}"
-                else:
-                    summary_block = f"\n\nHere's a detailed summary of *{title}*:\n{full_summary}"
+        # Rezumat complet din sursa locală (pt. afișare + TTS)
+        full_summary = get_summary_by_title(title)
+        localized_summary = _localize(full_summary, detected_lang)
 
-            final_out = f"{model_answer}{summary_block}"
-            return final_out, detected_lang, localized_summary, title
+        final_out = f"{model_answer}{_summary_block(title, full_summary, localized_summary, detected_lang)}"
+        return final_out, detected_lang, localized_summary, title
 
 
     # Dacă întrebarea NU pare despre cărți/povești, ghidăm utilizatorul
     if not is_question_about_books(english_input):
-        msg = "Please ask something related to books or stories."
-        return (
-            translate(msg, target_lang=detected_lang) if detected_lang != "en" else msg,
-            detected_lang,
-            None,
-            None
+        return _localize(OFF_TOPIC_MSG, detected_lang), detected_lang, None, None
+    # 5) Fallback clar, fără „ghicit”
+    return _localize(FALLBACK_MSG, detected_lang), detected_lang, None, None
+
+
+ChatResult = Tuple[str, str, Optional[str], Optional[str]]
+
+
+@dataclass
+class _RagTurn:
+    """O tură care a ajuns la RAG: mai rămâne doar răspunsul LLM (+ rezumatul localizat)."""
+    lang: str
+    english_input: str
+    title: str
+    summary: str                  # contextul din index
+    full_summary: Optional[str]   # rezumatul din catalog (afișare + TTS)
+
+
+async def _localize_async(text: Optional[str], lang: str) -> Optional[str]:
+    if lang == "en" or not text:
+        return text
+    with span("translate_back"):
+        return await translate_async(text, target_lang=lang, source_lang="en")
+
+
+async def _route_turn_async(user_input: str) -> Union[ChatResult, _RagTurn]:
+    """
+    Pașii 1-4 din chat_with_llm, pe AsyncOpenAI. Întoarce fie rezultatul final
+    (ofensiv / lookup exact / off-topic / fallback), fie un _RagTurn.
+    """
+    with span("detect"):
+        raw_lang = detect_language(user_input)
+        detected_lang = enforce_detected_lang(user_input, raw_lang)
+
+    async def _moderate() -> bool:
+        with span("moderation"):
+            return await is_offensive_async(user_input)
+
+    async def _to_english() -> str:
+        if detected_lang == "en":
+            return user_input
+        with span("translate"):
+            return await translate_async(user_input, target_lang="en", source_lang=detected_lang)
+
+    # 1+2) moderare și normalizare la EN în paralel
+    moderation = asyncio.create_task(_moderate())
+    to_english = asyncio.create_task(_to_english())
+    try:
+        offensive = await moderation
+    except BaseException:
+        # moderarea a eșuat (sau tura a fost anulată): nu lăsăm traducerea orfană
+        to_english.cancel()
+        raise
+    if offensive:
+        to_english.cancel()
+        return await _localize_async(OFFENSIVE_MSG, detected_lang), detected_lang, None, None
+    english_input = await to_english
+
+    # 3) LOOKUP STRICT
+    with span("title"):
+        exact_title = resolve_title_from_any_text(user_input, english_input)
+    if exact_title:
+        full_summary = get_summary_by_title(exact_title)
+        if full_summary:
+            full_text_en = f"{exact_title}\n\n{full_summary}"
+            localized_text, localized_summary = await asyncio.gather(
+                _localize_async(full_text_en, detected_lang), _localize_async(full_summary, detected_lang)
+            )
+            return localized_text, detected_lang, localized_summary, exact_title
+
+    # 4) RAG tematic: toate variantele într-un singur embeddings.create + collection.query
+    expanded = expand_thematic_query(english_input)
+    retriever = get_retriever()
+    best = _best_candidate(await retriever.query_many_async(expanded, top_k=3), retriever)
+
+    if best:
+        _, title, summary = best
+        return _RagTurn(
+            lang=detected_lang,
+            english_input=english_input,
+            title=title,
+            summary=summary,
+            full_summary=get_summary_by_title(title),
         )
+
+    if not is_question_about_books(english_input):
+        return await _localize_async(OFF_TOPIC_MSG, detected_lang), detected_lang, None, None
+
     # 5) Fallback clar, fără „ghicit”
-    msg = "Sorry, I don't have information about that..."
-    out = translate(msg, target_lang=detected_lang) if detected_lang != "en" else msg
-    return out, detected_lang, None, None
+    return await _localize_async(FALLBACK_MSG, detected_lang), detected_lang, None, None
+
+
+async def _cached_answer_async(turn: _RagTurn) -> tuple[Optional[str], Optional[list[float]]]:
+    """(răspuns_din_cache_sau_None, embedding_întrebare_sau_None)."""
+    answer_cache = get_answer_cache()
+    retriever = get_retriever()
+    if not answer_cache.enabled or not retriever.uses_embeddings:
+        return None, None
+    try:
+        query_emb = await retriever.embed_async(_answer_cache_text(turn.english_input))
+    except Exception as e:
+        # cache-ul e best-effort: fără embedding e doar un miss, nu o cerere eșuată
+        print(f"[Answer Cache] Embedding failed, skipping cache: {e}")
+        return None, None
+    return answer_cache.lookup(turn.lang, turn.title, query_emb), query_emb
+
+
+async def _complete_async(turn: _RagTurn) -> str:
+    cached, query_emb = await _cached_answer_async(turn)
+    if cached is not None:
+        return cached
+    client = _get_async_client()
+    with span("completion"):
+        response = await client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=_rag_messages(turn.english_input, turn.summary, turn.lang),
+            temperature=0.7
+        )
+    answer = (response.choices[0].message.content or "").strip()
+    if query_emb:
+        get_answer_cache().store(turn.lang, turn.title, query_emb, answer)
+    return answer
+
+
+async def chat_with_llm_async(user_input: str) -> ChatResult:
+    """
+    Același flow ca chat_with_llm, pe AsyncOpenAI. Pașii independenți rulează
+    în paralel:
+      - moderarea împreună cu traducerea în EN
+      - toate variantele din expand_thematic_query (un singur drum, vezi query_many)
+      - completion-ul (sau hit-ul din cache-ul semantic) împreună cu traducerea rezumatului
+      - textul localizat împreună cu rezumatul localizat (lookup exact)
+
+    Returnează: (text_de_afisat, limba_detectata, summary_pentru_TTS_ou_None, titlu_ou_None)
+    """
+    routed = await _route_turn_async(user_input)
+    if not isinstance(routed, _RagTurn):
+        return routed
+    turn = routed
+
+    model_answer, localized_summary = await asyncio.gather(
+        _complete_async(turn), _localize_async(turn.full_summary, turn.lang)
+    )
+    final_out = f"{model_answer}{_summary_block(turn.title, turn.full_summary, localized_summary, turn.lang)}"
+    return final_out, turn.lang, localized_summary, turn.title
+
+
+async def chat_with_llm_stream(user_input: str) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Varianta streaming a chat_with_llm_async. Produce evenimente (nume, date):
+      ("token",   {"text": ...})                    bucăți din răspuns, pe măsură ce vin
+      ("summary", {"title", "summary", "text"})     blocul de rezumat (doar pe ramura RAG)
+      ("meta",    {"lang", "title", "summary", "tts_available"})   la final
+    Pe ramurile fără LLM răspunsul complet vine într-un singur "token".
+    """
+    routed = await _route_turn_async(user_input)
+    if not isinstance(routed, _RagTurn):
+        answer, lang, summary, title = routed
+        yield "token", {"text": answer}
+        yield "meta", {"lang": lang, "title": title, "summary": summary,
+                       "tts_available": bool(summary and summary.strip())}
+        return
+    turn = routed
+
+    # traducerea rezumatului rulează cât timp curg token-urile
+    summary_task = asyncio.create_task(_localize_async(turn.full_summary, turn.lang))
+    try:
+        cached, query_emb = await _cached_answer_async(turn)
+        if cached is not None:
+            yield "token", {"text": cached}
+        else:
+            client = _get_async_client()
+            # span = time-to-first-byte; token-urile curg după ce header-ele SSE au plecat deja
+            with span("completion"):
+                stream = await client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=_rag_messages(turn.english_input, turn.summary, turn.lang),
+                    temperature=0.7,
+                    stream=True,
+                )
+            parts: list[str] = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield "token", {"text": delta}
+            answer = "".join(parts).strip()
+            if query_emb and answer:
+                get_answer_cache().store(turn.lang, turn.title, query_emb, answer)
+        localized_summary = await summary_task
+    finally:
+        if not summary_task.done():
+            summary_task.cancel()
+
+    block = _summary_block(turn.title, turn.full_summary, localized_summary, turn.lang)
+    if block:
+        yield "summary", {"title": turn.title, "summary": localized_summary, "text": block}
+    yield "meta", {"lang": turn.lang, "title": turn.title, "summary": localized_summary,
+                   "tts_available": bool(localized_summary and localized_summary.strip())}
 
 
 
 # ---------------- CLI util (opțional) ----------------
 
 if __name__ == "__main__":
+    # doar CLI-ul are nevoie de microfon / redare locală
+    from backend.tools.stt_tool import capture_and_transcribe_vad
+    from backend.tools.tts_tool import speak
+
     print("=== Smart Book Recommender (LLM + RAG) ===")
     print("Type 'voice' to dictate your question (auto-stops on silence).")
     print()
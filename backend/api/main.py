@@ -17,8 +17,10 @@ if key:
     os.environ["OPENAI_API_KEY"] = key
 print(f"[DEBUG] OPENAI_API_KEY: {repr(key)} (length: {len(key) if key else 0})")
 
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
@@ -27,9 +29,34 @@ from .routes_chat import router as chat_router
 from .routes_voice import voice_router
 from .routes_tts import tts_router
 from .routes_image import router as image_router  
+from .routes_metrics import metrics_router
+from backend.tools.translation_tool import enable_catalog_pretranslation
+from backend.tools.tts_tool import enable_tts_cache_maintenance
+from backend.services.openai_client import aclose_async_client, close_clients
+from backend.services.tracing import TimingMiddleware
+from backend.services.warmup import WarmupState, run_warmup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # încălzire în fundal: serverul acceptă conexiuni imediat, /api/health spune când e gata
+    app.state.warmup = WarmupState()
+    warmup = asyncio.create_task(run_warmup(app.state.warmup))
+    # rezumatele catalogului traduse în fundal (PRETRANSLATE_LANGS, implicit "ro")
+    enable_catalog_pretranslation()
+    # evicție periodică + rezumatele primelor TTS_PREWARM_TOP_N cărți, în fundal
+    enable_tts_cache_maintenance()
+    try:
+        yield
+    finally:
+        if not warmup.done():
+            warmup.cancel()
+        # pool-urile httpx partajate (vezi services/openai_client.py)
+        await aclose_async_client()
+        close_clients()
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="LLMHW API", version="0.1.0")
+    app = FastAPI(title="LLMHW API", version="0.1.0", lifespan=lifespan)
+    app.state.warmup = WarmupState()
 
     # CORS pentru frontend local (vite / live server / file:// via simple server)
     default_origins = [
@@ -49,7 +76,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
+    # durate per rută + header Server-Timing (TRACING_ENABLED=0 îl face pass-through)
+    app.add_middleware(TimingMiddleware)
 
     # Static pentru audio & images
     static_dir = Path("backend/static")
@@ -62,10 +92,15 @@ def create_app() -> FastAPI:
     app.include_router(voice_router)
     app.include_router(tts_router)
     app.include_router(image_router)  # <-- NEW
+    app.include_router(metrics_router)
 
     @app.get("/api/health")
-    def health():
-        return {"ok": True}
+    def health(response: Response):
+        # ok = procesul răspunde; ready = încălzirea s-a terminat (503 până atunci)
+        state: WarmupState = app.state.warmup
+        if not state.ready:
+            response.status_code = 503
+        return {"ok": True, **state.as_dict()}
 
     return app
 
@@ -1,21 +1,24 @@
 # backend/api/routes_chat.py
+import json
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from .schemas import ChatRequest, ChatResponse
 
 # Refolosim logica de chat (nu duplicăm):
-from ..LLMHW import chat_with_llm
+from ..LLMHW import chat_with_llm_async, chat_with_llm_stream
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
 @router.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
+async def chat(req: ChatRequest) -> ChatResponse:
     user_text = (req.text or "").strip()
     if not user_text:
         raise HTTPException(status_code=422, detail="Empty text")
 
     # IMPORTANT: chat_with_llm trebuie să întoarcă acum 4 valori:
     # (answer: str, lang: str, summary: Optional[str], title: Optional[str])
-    answer, lang, summary, title = chat_with_llm(user_text)
+    answer, lang, summary, title = await chat_with_llm_async(user_text)
 
     return ChatResponse(
         answer=answer,
@@ -24,3 +27,32 @@ def chat(req: ChatRequest) -> ChatResponse:
         tts_available=bool(summary and summary.strip()),
         title=title
     )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(req: ChatRequest) -> StreamingResponse:
+    """
+    Server-Sent Events: "token" (bucăți din răspuns), "summary" (blocul de rezumat),
+    "meta" (lang, title, summary, tts_available), apoi "done".
+    """
+    user_text = (req.text or "").strip()
+    if not user_text:
+        raise HTTPException(status_code=422, detail="Empty text")
+
+    async def _events():
+        try:
+            async for event, data in chat_with_llm_stream(user_text):
+                yield _sse(event, data)
+        except Exception as e:
+            print(f"[Chat stream error] {e}")
+            yield _sse("error", {"detail": "Chat failed"})
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
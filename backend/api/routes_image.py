@@ -1,14 +1,23 @@
 # backend/api/routes_image.py
 from __future__ import annotations
-import os, base64, uuid
-from pathlib import Path
+import asyncio, base64, os, time, uuid
+from dataclasses import dataclass, field
 from typing import Optional
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from backend.services.image_cache import cache_key, get_image_cache
+from backend.services.openai_client import get_async_openai_client
 
 router = APIRouter(prefix="/api/image", tags=["image"])
 
+IMAGE_MODEL = "dall-e-2"
+ALLOWED_SIZES = ["1024x1024", "1024x1792", "1792x1024"]
+IMAGE_MAX_CONCURRENCY = int(os.getenv("IMAGE_MAX_CONCURRENCY", "2"))
+JOB_TTL_S = 600.0          # cât păstrăm job-urile terminate (pentru GET / SSE)
+
 class ImageGenRequest(BaseModel):
     prompt: str = Field(..., min_length=1, max_length=1000)
     style: Optional[str] = Field(default="vivid")
@@ -19,34 +28,145 @@ class ImageResponse(BaseModel):
     images: list[dict]
     success: bool
 
-def _get_client() -> OpenAI:
-    key = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
-    if not key:
-        raise RuntimeError("OPENAI_API_KEY missing.")
-    return OpenAI(api_key=key)
+class ImageJobResponse(BaseModel):
+    job_id: str
+    status: str                     # pending | running | done | error
+    images: list[dict] = []
+    cached: bool = False
+    error: Optional[str] = None
 
-@router.post("/generate", response_model=ImageResponse)
-def generate_image(req: ImageGenRequest):
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_openai_client("images")
+
+# ---------------- job-uri ----------------
+
+@dataclass
+class _ImageJob:
+    id: str
+    key: str
+    prompt: str
+    size: str
+    n: int
+    status: str = "pending"
+    images: list = field(default_factory=list)
+    cached: bool = False
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def view(self) -> ImageJobResponse:
+        return ImageJobResponse(job_id=self.id, status=self.status, images=self.images,
+                                cached=self.cached, error=self.error)
+
+_jobs: dict[str, _ImageJob] = {}
+_inflight_by_key: dict[str, str] = {}     # cheie cache -> job activ (același prompt = același job)
+_semaphore: Optional[asyncio.Semaphore] = None
+_tasks: set[asyncio.Task] = set()           # referințe tari la task-urile în curs
+
+def _limiter() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, IMAGE_MAX_CONCURRENCY))
+    return _semaphore
+
+def _prune_jobs() -> None:
+    cutoff = time.monotonic() - JOB_TTL_S
+    for jid in [j.id for j in _jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+        _jobs.pop(jid, None)
+
+def _finish(job: _ImageJob, status: str, images: Optional[list] = None, error: Optional[str] = None) -> None:
+    job.status = status
+    job.images = images or []
+    job.error = error
+    job.finished_at = time.monotonic()
+    _inflight_by_key.pop(job.key, None)
+    job.done.set()
+
+def _decode_and_store(key: str, b64_images: list[str]) -> list[dict]:
+    return get_image_cache().put(key, [base64.b64decode(b) for b in b64_images])
+
+async def _run_job(job: _ImageJob) -> None:
+    try:
+        async with _limiter():
+            job.status = "running"
+            client = _get_async_client()
+            resp = await client.images.generate(
+                model=IMAGE_MODEL, prompt=job.prompt, size=job.size, n=job.n, response_format="b64_json"
+            )
+        b64 = [d.b64_json for d in resp.data if getattr(d, "b64_json", None)]
+        if b64:
+            # decodare + scriere PNG în afara event loop-ului
+            images = await asyncio.to_thread(_decode_and_store, job.key, b64)
+        else:
+            images = [{"url": d.url, "filename": f"gen_{uuid.uuid4().hex}.png"} for d in resp.data if getattr(d, "url", None)]
+        _finish(job, "done", images)
+    except Exception as e:
+        print("Image gen error:", e)
+        _finish(job, "error", error="Image generation failed")
+    except BaseException:
+        # anulare (shutdown) etc.: jobul nu rămâne "running", iar cei care îl așteaptă se deblochează
+        _finish(job, "error", error="Image generation cancelled")
+        raise
+
+def _submit(req: ImageGenRequest) -> _ImageJob:
     prompt = req.prompt.strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="Empty prompt.")
-    size = req.size if req.size in ["1024x1024","1024x1792","1792x1024"] else "1024x1024"
+    size = req.size if req.size in ALLOWED_SIZES else "1024x1024"
     n = max(1, min(4, req.n or 1))
-    client = _get_client()
-    try:
-        resp = client.images.generate(model="dall-e-2", prompt=prompt, size=size, n=n)
-        images = []
-        out_dir = Path("backend/static/images"); out_dir.mkdir(parents=True, exist_ok=True)
-        for d in resp.data:
-            if getattr(d, "b64_json", None):
-                img_bytes = base64.b64decode(d.b64_json)
-                fn = f"{uuid.uuid4().hex}.png"
-                (out_dir / fn).write_bytes(img_bytes)
-                images.append({"url": f"/static/images/{fn}", "filename": fn})
-            elif getattr(d, "url", None):
-                images.append({"url": d.url, "filename": f"gen_{uuid.uuid4().hex}.png"})
-        return ImageResponse(images=images, success=True)
-    except Exception as e:
-        print("Image gen error:", e)
-        # Returnează mereu un JSON valid, nu doar HTTPException
-        return ImageResponse(images=[], success=False)
+    key = cache_key(IMAGE_MODEL, prompt, size, n)
+    _prune_jobs()
+
+    active = _inflight_by_key.get(key)
+    if active in _jobs:
+        return _jobs[active]
+
+    job = _ImageJob(id=uuid.uuid4().hex, key=key, prompt=prompt, size=size, n=n)
+    _jobs[job.id] = job
+    cached = get_image_cache().get(key)
+    if cached is not None:
+        job.cached = True
+        _finish(job, "done", cached)
+        return job
+
+    _inflight_by_key[key] = job.id
+    task = asyncio.create_task(_run_job(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+def _get_job(job_id: str) -> _ImageJob:
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown image job.")
+    return job
+
+@router.post("/jobs", response_model=ImageJobResponse, status_code=202)
+async def create_image_job(req: ImageGenRequest):
+    """Pornește generarea și întoarce imediat job_id (sau rezultatul, dacă e în cache)."""
+    return _submit(req).view()
+
+@router.get("/jobs/{job_id}", response_model=ImageJobResponse)
+async def get_image_job(job_id: str):
+    return _get_job(job_id).view()
+
+@router.get("/jobs/{job_id}/events")
+async def image_job_events(job_id: str):
+    """SSE: un eveniment "status" la pornire, apoi "done" (sau "error") la final."""
+    job = _get_job(job_id)
+
+    async def _events():
+        yield f"event: status\ndata: {job.view().model_dump_json()}\n\n"
+        await job.done.wait()
+        yield f"event: {'done' if job.status == 'done' else 'error'}\ndata: {job.view().model_dump_json()}\n\n"
+
+    return StreamingResponse(_events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/generate", response_model=ImageResponse)
+async def generate_image(req: ImageGenRequest):
+    """Varianta sincronă pentru clienți vechi: așteaptă job-ul și întoarce imaginile."""
+    job = _submit(req)
+    await job.done.wait()
+    # Returnează mereu un JSON valid, nu doar HTTPException
+    return ImageResponse(images=job.images, success=job.status == "done")
@@ -0,0 +1,64 @@
+# backend/api/routes_metrics.py
+from typing import Callable, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.services.answer_cache import get_answer_cache
+from backend.services.embedding_cache import get_embedding_cache
+from backend.services.image_cache import get_image_cache
+from backend.services.language_detection import get_language_detector
+from backend.services.openai_client import latency_stats
+from backend.services.singleflight import singleflight_stats
+from backend.services.tracing import render_gauges, render_prometheus, render_summary
+from backend.services.transcription_cache import get_transcription_cache
+from backend.services.translation_cache import get_translation_cache
+from backend.services.tts_cache import get_tts_cache
+from backend.tools.language_filter_tool import moderation_stats
+
+metrics_router = APIRouter(prefix="/api", tags=["metrics"])
+
+# nume -> funcție care întoarce {stat: valoare}
+CACHE_STATS: Dict[str, Callable[[], dict]] = {
+    "embedding": lambda: get_embedding_cache().stats(),
+    "translation": lambda: get_translation_cache().stats(),
+    "answer": lambda: get_answer_cache().stats(),
+    "language_detection": lambda: get_language_detector().stats(),
+    "moderation": moderation_stats,
+    "tts": lambda: get_tts_cache().stats(),
+    "transcription": lambda: get_transcription_cache().stats(),
+    "image": lambda: get_image_cache().stats(),
+}
+
+
+def _cache_stats() -> Dict[str, dict]:
+    out = {}
+    for name, fn in CACHE_STATS.items():
+        try:
+            out[name] = fn()
+        except Exception as e:
+            print(f"[Metrics] {name} stats unavailable: {e}")
+    return out
+
+
+def _split_endpoint(key: str) -> Dict[str, str]:
+    method, _, path = key.partition(" ")
+    return {"method": method, "endpoint": path}
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """
+    Format text Prometheus: latențe per rută / etapă / endpoint OpenAI, contoarele
+    cache-urilor și ale grupurilor single-flight (apeluri executate vs. coalescate).
+    """
+    extra = render_summary(
+        "llmhw_openai_request_duration_seconds", "OpenAI HTTP request duration per endpoint",
+        latency_stats(), _split_endpoint,
+    )
+    extra += render_gauges("llmhw_cache", "Cache counters", _cache_stats(), label="cache")
+    extra += render_gauges(
+        "llmhw_singleflight", "Identical concurrent upstream calls: executed vs coalesced",
+        singleflight_stats(), label="group",
+    )
+    return PlainTextResponse(render_prometheus(extra), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,9 @@
 # backend/api/routes_tts.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from backend.tools.tts_tool import synthesize_to_file
+from backend.tools.tts_tool import stream_synthesis, synthesize_to_file
 
 tts_router = APIRouter(prefix="/api", tags=["tts"])
 
@@ -20,3 +20,23 @@ def tts(req: TTSRequest):
     if not url:
         raise HTTPException(status_code=500, detail="TTS synthesis failed")
     return JSONResponse({"url": url})
+
+
+def _stream_response(text: str, lang: str) -> StreamingResponse:
+    if not text.strip():
+        raise HTTPException(status_code=422, detail="Empty text")
+    return StreamingResponse(
+        stream_synthesis(text, lang=lang),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@tts_router.post("/tts/stream")
+async def tts_stream(req: TTSRequest):
+    """mp3 livrat pe bucăți (frază cu frază), redarea poate începe după prima."""
+    return _stream_response(req.text, req.lang)
+
+@tts_router.get("/tts/stream")
+async def tts_stream_get(text: str = Query(..., min_length=1), lang: str = "en"):
+    """Aceeași, dar utilizabilă direct ca <audio src=...>."""
+    return _stream_response(text, lang)
@@ -1,10 +1,15 @@
 # backend/api/routes_voice.py
+import asyncio
+import hashlib
 import os
-import tempfile
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, File, UploadFile, HTTPException, Request
 from fastapi.responses import JSONResponse
 
-from backend.tools.stt_tool import transcribe_file
+from backend.services.transcription_cache import get_transcription_cache
+from backend.tools.audio_preprocess import preprocess_upload
+from backend.tools.stt_tool import transcribe_buffer_async
 
 voice_router = APIRouter(prefix="/api/voice", tags=["voice"])
 
@@ -13,30 +18,61 @@ ALLOWED_MIME = {
     "audio/webm", "audio/ogg", "audio/m4a", "audio/x-m4a"
 }
 MAX_SIZE_BYTES = 25 * 1024 * 1024  # 25MB
+READ_CHUNK_BYTES = 256 * 1024
+# overhead-ul multipart (boundary, header-e) peste mărimea fișierului
+MULTIPART_SLACK_BYTES = 64 * 1024
+
+async def _hash_upload(audio: UploadFile, limit: Optional[int] = None) -> tuple[str, int]:
+    """
+    Citește upload-ul pe bucăți doar ca să calculeze sha256 și să verifice limita
+    la fiecare bucată, apoi îl repune la poziția 0 (fără copie în memorie:
+    preprocesarea / Whisper citesc direct din audio.file). Întoarce (hash, mărime).
+    """
+    limit = MAX_SIZE_BYTES if limit is None else limit
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await audio.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail="File too large (>25MB)")
+        digest.update(chunk)
+    await audio.seek(0)
+    return digest.hexdigest(), size
 
 @voice_router.post("/transcribe")
-async def transcribe(audio: UploadFile = File(...)):
+async def transcribe(request: Request, audio: UploadFile = File(...), language: Optional[str] = None):
     if audio.content_type not in ALLOWED_MIME:
         raise HTTPException(status_code=415, detail=f"Unsupported audio type: {audio.content_type}")
 
-    # Limită de mărime (best-effort; pentru fișiere mari, folosește streaming sau un reverse proxy limit)
-    data = await audio.read()
-    if len(data) > MAX_SIZE_BYTES:
+    # respingem devreme când clientul declară deja un body prea mare
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_SIZE_BYTES + MULTIPART_SLACK_BYTES:
         raise HTTPException(status_code=413, detail="File too large (>25MB)")
 
-    # Salvăm temporar și transcriem
-    fd, path = tempfile.mkstemp(prefix="llmhw_upl_", suffix=os.path.splitext(audio.filename or '')[-1] or ".wav")
-    os.close(fd)
-    try:
-        with open(path, "wb") as f:
-            f.write(data)
-
-        text = transcribe_file(path, language_hint=None)  # poți pune "ro" dacă vrei hint
-        if not text or text == "YOU_SAID_NOTHING":
-            return JSONResponse({"text": ""})
-        return JSONResponse({"text": text})
-    finally:
-        try:
-            os.remove(path)
-        except Exception:
-            pass
+    audio_hash, size = await _hash_upload(audio)
+
+    cache = get_transcription_cache()
+    cached = cache.get(audio_hash, language)
+    if cached is not None:
+        return JSONResponse({"text": cached})
+
+    filename = f"upload{os.path.splitext(audio.filename or '')[-1] or '.wav'}"
+    # decode + mono + 16 kHz + trim liniște (numpy, în afara event loop-ului)
+    prepared = await asyncio.to_thread(preprocess_upload, audio.file, filename, size)
+    if prepared.silent:
+        print(f"[Voice] Upload rejected locally: {prepared.reason}.")
+        cache.put(audio_hash, language, "")
+        return JSONResponse({"text": ""})
+
+    text = await transcribe_buffer_async(prepared.audio, filename=prepared.filename, language_hint=language)
+    if not text or text == "YOU_SAID_NOTHING":
+        text = ""
+    elif prepared.duration_s is not None and len(text.split()) == 1 and prepared.duration_s < 1.0:
+        # același gard ca la captura live: un cuvânt din sub o secundă de audio
+        print("[Voice] Whisper result not reliable.")
+        text = ""
+    cache.put(audio_hash, language, text)
+    return JSONResponse({"text": text})
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_coldstart.py
+"""
+Cold start al API-ului, măsurat în procese Python noi (fără module deja încărcate):
+
+    python -m backend.benchmarks.bench_coldstart [--runs 5] [--out results.json]
+
+Pentru fiecare rulare:
+  import_ms         from backend.api.main import app
+  startup_ms        până la finalul lifespan-ului (serverul acceptă conexiuni)
+  ready_ms          până când /api/health răspunde 200 cu ready=true
+  first_chat_ms     până la finalul primului POST /api/chat (OpenAI = serverul fals, latență 0)
+  first_request_ms  durata acelui prim request (ce simte primul utilizator după ready)
+  heavy_modules     care dintre modulele grele au fost încărcate la import
+
+Toate momentele sunt relative la pornirea procesului copil (după interpretor).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+import numpy as np
+
+from backend.benchmarks.fake_openai import FakeOpenAIServer
+from backend.benchmarks.results import save
+
+HEAVY_MODULES = ["sounddevice", "gtts", "playsound", "scipy", "langdetect", "chromadb", "numpy", "openai"]
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from backend.api.main import app
+t_import = time.perf_counter()
+heavy = [m for m in HEAVY if m in sys.modules]
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t_started = time.perf_counter()
+    while True:
+        r = client.get("/api/health")
+        if r.status_code == 200 and r.json().get("ready", True):
+            break
+        time.sleep(0.005)
+    t_ready = time.perf_counter()
+    r = client.post("/api/chat", json={"text": "Recommend a book about friendship and magic"})
+    t_first = time.perf_counter()
+ms = lambda t: (t - t0) * 1000.0
+print("RESULT " + json.dumps({
+    "import_ms": ms(t_import), "startup_ms": ms(t_started), "ready_ms": ms(t_ready),
+    "first_chat_ms": ms(t_first), "first_request_ms": (t_first - t_ready) * 1000.0, "first_chat_status": r.status_code, "heavy_modules": heavy,
+}))
+"""
+
+
+def _child_env(base_url: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": base_url,
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY") or "sk-fake-benchmark",
+        "EMBED_CACHE_PATH": "", "TRANSLATION_CACHE_PATH": "", "TRANSCRIPTION_CACHE_PATH": "",
+        "TTS_PREWARM_TOP_N": "0", "PRETRANSLATE_LANGS": "", "ANONYMIZED_TELEMETRY": "False",
+    })
+    return env
+
+
+def run_once(base_url: str) -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\n{_CHILD}"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=_child_env(base_url), timeout=300)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"cold start run failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+
+def run(runs: int = 5) -> dict:
+    with FakeOpenAIServer(latency={k: 0.0 for k in ("embeddings", "chat", "moderations")}) as fake:
+        samples: List[dict] = [run_once(fake.base_url) for _ in range(runs)]
+    out: dict = {"heavy_modules_at_import": samples[-1]["heavy_modules"]}
+    for key in ("import_ms", "startup_ms", "ready_ms", "first_chat_ms", "first_request_ms"):
+        values = np.asarray([s[key] for s in samples])
+        out[key] = {"median": float(np.median(values)), "min": float(values.min()), "max": float(values.max())}
+    return out
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Measure API cold-start time in fresh processes.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", default=None, help="JSON output path (default: backend/benchmarks/results/)")
+    args = parser.parse_args(argv)
+    results = run(args.runs)
+    print(json.dumps(results, indent=2))
+    print(f"saved: {save('coldstart', results, args.out, {'runs': args.runs})}")
+
+
+if __name__ == "__main__":
+    main()
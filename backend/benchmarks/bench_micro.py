@@ -0,0 +1,190 @@
+# backend/benchmarks/bench_micro.py
+"""
+Micro-benchmark-uri pentru etapele locale ale pipeline-ului, fără credite API
+(embeddings-urile vin de la serverul fals din fake_openai):
+
+    python -m backend.benchmarks.bench_micro [--repeat 200] [--embed-latency-ms 40] [--out results.json]
+
+  title_resolution   resolve_title_from_any_text pe un amestec de întrebări (cu / fără titlu, typo-uri)
+  expansion          expand_thematic_query
+  retrieval          query_many: cu cache de embeddings rece / cald, doar interogarea indexului
+                     vectorial și modul lexical (BM25, fără embeddings)
+  tts_cache          TTSCache cu un sintetizor fals: miss, hit și cereri concurente pentru același text
+
+Cache-urile pe disc sunt dezactivate pe durata rulării, ca să nu fie poluate.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+import numpy as np
+
+# izolare: fără tier-uri SQLite, fără prewarm; cheia e falsă (serverul local o ignoră)
+os.environ["EMBED_CACHE_PATH"] = ""
+os.environ["TRANSLATION_CACHE_PATH"] = ""
+os.environ["TRANSCRIPTION_CACHE_PATH"] = ""
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake-benchmark")
+
+from backend.benchmarks.fake_openai import FakeOpenAIServer  # noqa: E402
+from backend.benchmarks.results import save  # noqa: E402
+
+QUERIES: List[str] = [
+    "Tell me about The Hobbit",
+    "What is 1984 about?",
+    "I want a book about friendship and magic",
+    "Recommend something about war and survival",
+    "Is To Kill a Mockingbird good for teenagers?",
+    "mockin bird summary please",
+    "Vreau o carte despre prietenie si magie",
+    "books about dystopian societies and freedom",
+    "Give me a story with dragons and adventure",
+    "What should I read after The Great Gatsby?",
+    "A novel about love, class and pride",
+    "something cozy for a rainy weekend",
+]
+
+# sintetizorul TTS fals: latența unei sinteze + câte cereri concurente pentru același text
+TTS_SYNTH_LATENCY_S = 0.05
+TTS_THREADS = 8
+
+
+def _stats_us(samples: Iterable[float]) -> dict:
+    arr = np.asarray(list(samples), dtype=np.float64) * 1e6
+    if arr.size == 0:
+        return {"calls": 0}
+    return {
+        "calls": int(arr.size),
+        "mean_us": float(arr.mean()),
+        "p50_us": float(np.percentile(arr, 50)),
+        "p95_us": float(np.percentile(arr, 95)),
+        "p99_us": float(np.percentile(arr, 99)),
+    }
+
+
+def _time_calls(fn: Callable, args: List, repeat: int, before: Callable[[], None] = lambda: None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        for a in args:
+            before()
+            t0 = time.perf_counter()
+            fn(a)
+            samples.append(time.perf_counter() - t0)
+    return _stats_us(samples)
+
+
+# ---------------- benchmark-uri ----------------
+
+def bench_title_resolution(repeat: int) -> dict:
+    from backend.tools.book_summary_tool import resolve_title_from_any_text
+    resolve_title_from_any_text("warm up")      # construiește matcher-ul o singură dată
+    return _time_calls(resolve_title_from_any_text, QUERIES, repeat)
+
+
+def bench_expansion(repeat: int) -> dict:
+    from backend.LLMHW import expand_thematic_query
+    return _time_calls(expand_thematic_query, QUERIES, repeat)
+
+
+def bench_retrieval(repeat: int) -> dict:
+    from backend.LLMHW import expand_thematic_query
+    from backend.services.embedding_cache import get_embedding_cache
+    from backend.vector_store.retriever import BookRetriever, _embed_texts, get_retriever
+
+    retriever = get_retriever()
+    expanded = [expand_thematic_query(q) for q in QUERIES]
+    cache = get_embedding_cache()
+    query_many = lambda texts: retriever.query_many(texts, top_k=3)  # noqa: E731
+
+    out = {
+        "variants_per_query": float(np.mean([len(e) for e in expanded])),
+        "cold_embedding_cache": _time_calls(query_many, expanded, max(1, repeat // 10), before=cache.memory.clear),
+    }
+    for texts in expanded:
+        query_many(texts)
+    out["warm_embedding_cache"] = _time_calls(query_many, expanded, repeat)
+    embs = [_embed_texts(e) for e in expanded]
+    out["index_query_only"] = _time_calls(lambda e: retriever._collection_query(e, 3), embs, repeat)
+    lexical = BookRetriever(mode="lexical")
+    out["lexical_only"] = _time_calls(lambda texts: lexical.query_many(texts, top_k=3), expanded, repeat)
+    return out
+
+
+def bench_tts_cache(repeat: int, synth_latency_s: float = TTS_SYNTH_LATENCY_S, threads: int = TTS_THREADS) -> dict:
+    from backend.services.tts_cache import TTSCache
+
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def fake_synth(text: str, lang: str, out_path: str) -> None:
+        with lock:
+            calls["n"] += 1
+        time.sleep(synth_latency_s)
+        Path(out_path).write_bytes(b"ID3" + text.encode("utf-8")[:64])
+
+    texts = [f"Summary number {i}. " * 20 for i in range(max(1, repeat // 10))]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(tmp, max_age_s=0, synthesize=fake_synth)
+        miss = _time_calls(lambda t: cache.get_or_create(t, "en"), texts, 1)
+        hit = _time_calls(lambda t: cache.get_or_create(t, "en"), texts, 10)
+
+        # cereri concurente pentru același text nou: o singură sinteză
+        before = calls["n"]
+        barrier = threading.Barrier(threads)
+
+        def worker() -> None:
+            barrier.wait()
+            cache.get_or_create("A brand new summary for concurrent requests.", "en")
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        t0 = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        concurrent_ms = (time.perf_counter() - t0) * 1000.0
+        return {
+            "miss": miss,
+            "hit": hit,
+            "concurrent_same_text": {
+                "syntheses": calls["n"] - before,
+                "wall_ms": concurrent_ms,
+            },
+            "stats": cache.stats(),
+        }
+
+
+def run(repeat: int = 200, embed_latency_s: float = 0.04) -> dict:
+    with FakeOpenAIServer(latency={"embeddings": embed_latency_s}) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        results = {
+            "title_resolution": bench_title_resolution(repeat),
+            "expansion": bench_expansion(repeat),
+            "retrieval": bench_retrieval(repeat),
+            "tts_cache": bench_tts_cache(repeat),
+            "fake_openai_requests": dict(server.counts),
+        }
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the chat pipeline stages.")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--embed-latency-ms", type=float, default=40.0)
+    parser.add_argument("--out", default=None, help="JSON output path (default: backend/benchmarks/results/)")
+    args = parser.parse_args(argv)
+    results = run(args.repeat, args.embed_latency_ms / 1000.0)
+    print(json.dumps(results, indent=2))
+    config = {"repeat": args.repeat, "embed_latency_ms": args.embed_latency_ms,
+              "tts_synth_latency_ms": TTS_SYNTH_LATENCY_S * 1000.0, "tts_concurrent_threads": TTS_THREADS}
+    print(f"saved: {save('micro', results, args.out, config)}")
+
+
+if __name__ == "__main__":
+    main()
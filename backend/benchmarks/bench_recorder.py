@@ -0,0 +1,147 @@
+# backend/benchmarks/bench_recorder.py
+"""
+Benchmark pentru record_until_silence: recorder-ul vechi (queue + mono.copy()
++ listă + np.concatenate) vs RecordingBuffer (buffer prealocat, scriere directă).
+Callback-ul e alimentat cu cadre sintetice, fără placă de sunet:
+
+    python -m backend.benchmarks.bench_recorder [--seconds 30] [--repeat 5]
+
+Raportează timp per callback, alocări în callback (tracemalloc), memoria de vârf
+și timpul până la array-ul final.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import time
+import tracemalloc
+
+import numpy as np
+
+# stt_tool încarcă sounddevice doar la captură, deci benchmark-ul merge fără device
+from backend.tools.stt_tool import BLOCK_SIZE, DEFAULT_SR, RecordingBuffer, _rms_dbfs
+
+
+def synthetic_frames(seconds: float, sr: int = DEFAULT_SR, block: int = BLOCK_SIZE, seed: int = 0) -> list[np.ndarray]:
+    """Blocuri (block, 1) float32: vorbire (ton + zgomot) apoi liniște pe ultima treime."""
+    rng = np.random.default_rng(seed)
+    n_blocks = int(seconds * sr / block)
+    frames = []
+    for i in range(n_blocks):
+        t = (np.arange(block) + i * block) / sr
+        loud = i < n_blocks * 2 // 3
+        sig = (0.3 * np.sin(2 * np.pi * 220 * t) if loud else 0.0) + rng.normal(0, 1e-4, block)
+        frames.append(sig.astype(np.float32).reshape(block, 1))
+    return frames
+
+
+# ---------------- implementarea veche (referință) ----------------
+
+class LegacyRecorder:
+    def __init__(self) -> None:
+        self.q: queue.Queue = queue.Queue()
+        self.collected: list = []
+        self.total_blocks = 0
+        self.silence_counter = 0
+
+    def callback(self, indata, frames, time_, status) -> None:
+        mono = indata[:, 0].astype(np.float32, copy=False)
+        self.q.put(mono.copy())
+        self.total_blocks += 1
+
+    def consume(self, silence_dbfs: float) -> None:
+        while True:
+            try:
+                block = self.q.get_nowait()
+            except queue.Empty:
+                return
+            self.collected.append(block)
+            if _rms_dbfs(block) < silence_dbfs:
+                self.silence_counter += 1
+            else:
+                self.silence_counter = 0
+
+    def audio(self) -> np.ndarray:
+        return np.concatenate(self.collected, axis=0)
+
+
+class RingRecorder:
+    def __init__(self, seconds: float) -> None:
+        self.rec = RecordingBuffer(capacity=int(seconds * DEFAULT_SR / BLOCK_SIZE) * BLOCK_SIZE)
+        self.callback = self.rec.callback
+
+    def consume(self, silence_dbfs: float) -> None:
+        self.rec.consume(silence_dbfs)
+
+    def audio(self) -> np.ndarray:
+        return self.rec.audio()
+
+
+# ---------------- măsurători ----------------
+
+def _bench_once(make, frames: list[np.ndarray], consume_every: int = 4) -> dict:
+    rec = make()
+    # 1) timp per callback (fără tracemalloc, care încetinește)
+    t0 = time.perf_counter()
+    for i, f in enumerate(frames):
+        rec.callback(f, BLOCK_SIZE, None, None)
+        if i % consume_every == consume_every - 1:
+            rec.consume(-40.0)
+    rec.consume(-40.0)
+    t1 = time.perf_counter()
+    out = rec.audio()
+    t2 = time.perf_counter()
+    return {
+        "callback_loop_ms": (t1 - t0) * 1000.0,
+        "per_block_us": (t1 - t0) * 1e6 / len(frames),
+        "finalize_ms": (t2 - t1) * 1000.0,
+        "samples": int(out.size),
+    }
+
+
+def _alloc_profile(make, frames: list[np.ndarray]) -> dict:
+    tracemalloc.start()
+    rec = make()                      # vârful include și prealocarea buffer-ului
+    base = tracemalloc.take_snapshot()
+    for f in frames:
+        rec.callback(f, BLOCK_SIZE, None, None)
+    after_cb = tracemalloc.take_snapshot()
+    rec.consume(-40.0)
+    rec.audio()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after_cb.compare_to(base, "filename")
+    return {
+        "callback_alloc_bytes": sum(max(0, d.size_diff) for d in diff),
+        "callback_alloc_count": sum(max(0, d.count_diff) for d in diff),
+        "peak_traced_bytes": peak,
+    }
+
+
+def run(seconds: float = 30.0, repeat: int = 5) -> dict:
+    frames = synthetic_frames(seconds)
+    impls = {
+        "legacy_queue_concat": LegacyRecorder,
+        "ring_buffer": lambda: RingRecorder(seconds),
+    }
+    results: dict = {"seconds": seconds, "blocks": len(frames), "block_size": BLOCK_SIZE}
+    for name, make in impls.items():
+        runs = [_bench_once(make, frames) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r["callback_loop_ms"])
+        results[name] = {**best, **_alloc_profile(make, frames)}
+    legacy, ring = results["legacy_queue_concat"], results["ring_buffer"]
+    results["speedup_callback_loop"] = legacy["callback_loop_ms"] / max(ring["callback_loop_ms"], 1e-9)
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark record_until_silence buffering.")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.seconds, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+# backend/benchmarks/fake_openai.py
+"""
+Server HTTP local care imită endpoint-urile OpenAI folosite de aplicație, cu
+răspunsuri deterministe și latență configurabilă. Nu consumă credite:
+
+    python -m backend.benchmarks.fake_openai --port 8765 --latency chat=300,embeddings=40
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=sk-fake uvicorn backend.api.main:app
+
+SDK-ul openai citește OPENAI_BASE_URL singur, deci codul aplicației rămâne neschimbat.
+
+  /v1/embeddings             vectori deterministici (sumă de vectori per cuvânt, normalizată;
+                             texte cu cuvinte comune sunt apropiate), float sau base64
+  /v1/chat/completions       traducere = ecoul textului, JSON {"translations": [...]} pentru
+                             loturi, altfel un răspuns fix; stream=True -> SSE pe cuvinte
+  /v1/moderations            flagged doar dacă textul conține FLAG_MARKER
+  /v1/audio/transcriptions   text fix
+  /v1/audio/speech           bytes mp3 fictivi
+  /v1/images/generations     PNG 1x1 (b64_json) sau un URL
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import numpy as np
+
+EMBED_DIM = 1536
+FLAG_MARKER = "FLAGME"
+CHAT_ANSWER = (
+    "Based on your interests, I recommend this book. It combines an engaging plot "
+    "with memorable characters and themes that match what you asked for."
+)
+TRANSCRIPTION_TEXT = "Recommend a book about friendship and magic"
+# PNG 1x1 transparent
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+# endpoint -> latență implicită (secunde)
+DEFAULT_LATENCY_S: Dict[str, float] = {
+    "embeddings": 0.04,
+    "chat": 0.30,
+    "moderations": 0.08,
+    "transcriptions": 0.50,
+    "speech": 0.30,
+    "images": 1.00,
+}
+DEFAULT_TOKEN_DELAY_S = 0.015
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _word_vector(word: str) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha1(word.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(EMBED_DIM).astype(np.float32)
+
+
+def fake_embedding(text: str) -> np.ndarray:
+    """Vector unitar determinist: aceleași cuvinte -> același vector, cuvinte comune -> vectori apropiați."""
+    words = _WORD_RE.findall((text or "").lower()) or [text or ""]
+    vec = np.zeros(EMBED_DIM, dtype=np.float32)
+    for w in words:
+        vec += _word_vector(w)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def fake_chat_reply(messages: list, json_mode: bool) -> str:
+    last = (messages[-1].get("content") if messages else "") or ""
+    if json_mode:
+        # traducere în lot: {"segments": [...]} -> {"translations": [...]} (ecou)
+        try:
+            segments = json.loads(last).get("segments", [])
+        except (ValueError, AttributeError):
+            segments = []
+        return json.dumps({"translations": list(segments)}, ensure_ascii=False)
+    if last.startswith("Translate the following text"):
+        return last.split("\n\n", 1)[-1]
+    return CHAT_ANSWER
+
+
+class FakeOpenAIServer:
+    """
+    ThreadingHTTPServer într-un thread daemon. latency: {endpoint: secunde},
+    jitter: fracție (0.2 = ±20%), token_delay_s: pauza dintre chunk-urile SSE.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[Dict[str, float]] = None,
+        jitter: float = 0.0,
+        token_delay_s: float = DEFAULT_TOKEN_DELAY_S,
+        seed: int = 0,
+    ) -> None:
+        self.latency = {**DEFAULT_LATENCY_S, **(latency or {})}
+        self.jitter = max(0.0, jitter)
+        self.token_delay_s = token_delay_s
+        self.counts: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _delay(self, endpoint: str) -> None:
+        base = self.latency.get(endpoint, 0.0)
+        with self._lock:
+            self.counts[endpoint] += 1
+            factor = 1.0 + self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 1.0
+        if base > 0:
+            time.sleep(base * factor)
+
+    # ---------------- handler ----------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive, ca la API-ul real
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _json(self, payload: dict, status: int = 200) -> None:
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_GET(self) -> None:
+                # /v1/models: folosit de preconnect-ul din lifespan
+                if self.path.split("?", 1)[0].rstrip("/").endswith("/models"):
+                    return self._json({"object": "list", "data": [{"id": "fake", "object": "model", "created": 0, "owned_by": "fake"}]})
+                return self._json({"error": {"message": f"unknown endpoint {self.path}"}}, 404)
+
+            def do_POST(self) -> None:
+                path = self.path.split("?", 1)[0].rstrip("/")
+                raw = self._body()
+                if path.endswith("/audio/transcriptions"):
+                    server._delay("transcriptions")
+                    return self._json({"text": TRANSCRIPTION_TEXT})
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    return self._json({"error": {"message": "invalid JSON"}}, 400)
+
+                if path.endswith("/embeddings"):
+                    return self._embeddings(body)
+                if path.endswith("/chat/completions"):
+                    return self._chat(body)
+                if path.endswith("/moderations"):
+                    return self._moderations(body)
+                if path.endswith("/audio/speech"):
+                    server._delay("speech")
+                    data = b"ID3" + hashlib.sha256(str(body.get("input")).encode()).digest()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "audio/mpeg")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return None
+                if path.endswith("/images/generations"):
+                    return self._images(body)
+                return self._json({"error": {"message": f"unknown endpoint {path}"}}, 404)
+
+            def _embeddings(self, body: dict) -> None:
+                server._delay("embeddings")
+                inputs = body.get("input")
+                inputs = inputs if isinstance(inputs, list) else [inputs]
+                b64 = body.get("encoding_format") == "base64"
+                data = []
+                for i, text in enumerate(inputs):
+                    vec = fake_embedding(str(text))
+                    emb = base64.b64encode(vec.astype("<f4").tobytes()).decode("ascii") if b64 else vec.tolist()
+                    data.append({"object": "embedding", "index": i, "embedding": emb})
+                tokens = sum(len(str(t).split()) for t in inputs)
+                self._json({
+                    "object": "list", "data": data, "model": body.get("model", "fake"),
+                    "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+                })
+
+            def _chat(self, body: dict) -> None:
+                server._delay("chat")
+                json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+                text = fake_chat_reply(body.get("messages") or [], json_mode)
+                model = body.get("model", "fake")
+                created = int(time.time())
+                if not body.get("stream"):
+                    return self._json({
+                        "id": "chatcmpl-fake", "object": "chat.completion", "created": created, "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": text}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()), "total_tokens": 0},
+                    })
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def _chunk(delta: dict, finish: Optional[str] = None) -> None:
+                    payload = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": created,
+                               "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+                    self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+                _chunk({"role": "assistant", "content": ""})
+                for word in re.findall(r"\S+\s*", text):
+                    if server.token_delay_s > 0:
+                        time.sleep(server.token_delay_s)
+                    _chunk({"content": word})
+                _chunk({}, "stop")
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _moderations(self, body: dict) -> None:
+                server._delay("moderations")
+                inputs = body.get("input")
+                inputs = inputs if isinstance(inputs, list) else [inputs]
+                results = []
+                for text in inputs:
+                    flagged = FLAG_MARKER in str(text)
+                    results.append({"flagged": flagged, "categories": {"harassment": flagged},
+                                    "category_scores": {"harassment": 0.99 if flagged else 0.001}})
+                self._json({"id": "modr-fake", "model": "omni-moderation-latest", "results": results})
+
+            def _images(self, body: dict) -> None:
+                server._delay("images")
+                n = int(body.get("n") or 1)
+                if body.get("response_format") == "b64_json":
+                    item = {"b64_json": base64.b64encode(TINY_PNG).decode("ascii")}
+                else:
+                    item = {"url": "http://127.0.0.1/fake-image.png"}
+                self._json({"created": int(time.time()), "data": [dict(item) for _ in range(n)]})
+
+        return Handler
+
+
+def parse_latency(spec: str) -> Dict[str, float]:
+    """"chat=300,embeddings=40" (milisecunde) -> {"chat": 0.3, "embeddings": 0.04}"""
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            name, ms = part.split("=", 1)
+            out[name.strip()] = float(ms) / 1000.0
+    return out
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI stand-in for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="", help="per-endpoint latency in ms, e.g. chat=300,embeddings=40")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--token-delay-ms", type=float, default=DEFAULT_TOKEN_DELAY_S * 1000.0)
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(args.host, args.port, parse_latency(args.latency), args.jitter, args.token_delay_ms / 1000.0)
+    print(f"Fake OpenAI listening; export OPENAI_BASE_URL={server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
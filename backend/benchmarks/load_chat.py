@@ -0,0 +1,190 @@
+# backend/benchmarks/load_chat.py
+"""
+Generator de încărcare pentru /api/chat la un RPS țintă (buclă deschisă):
+
+    # aplicația + serverul OpenAI fals pornite în proces, fără credite:
+    python -m backend.benchmarks.load_chat --self-contained --rps 20 --duration 30
+
+    # sau împotriva unei instanțe existente (pornită cu OPENAI_BASE_URL spre fake_openai):
+    python -m backend.benchmarks.load_chat --url http://127.0.0.1:8000 --rps 20 --duration 30
+
+Request-urile pleacă la momente fixe (i / rps), indiferent dacă cele anterioare
+s-au terminat; latența e măsurată de la momentul programat, deci un server care
+rămâne în urmă apare în p95/p99 (fără „coordinated omission”).
+Raportează p50/p95/p99/max, erori, RPS realizat și media pe etape din Server-Timing.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from backend.benchmarks.results import save
+
+QUERIES: List[str] = [
+    "Recommend a book about friendship and magic",
+    "Tell me about The Hobbit",
+    "I want a story about war and survival",
+    "What is 1984 about?",
+    "Vreau o carte despre prietenie si magie",
+    "books about dystopian societies and freedom",
+    "Give me a novel with dragons and adventure",
+    "Recomandă-mi o carte despre dragoste",
+]
+
+
+def _parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for p in params.split(";"):
+            if p.strip().startswith("dur="):
+                try:
+                    out[name] = float(p.strip()[4:])
+                except ValueError:
+                    pass
+    return out
+
+
+def _summary_ms(latencies_s: List[float]) -> dict:
+    if not latencies_s:
+        return {}
+    arr = np.asarray(latencies_s) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "mean_ms": float(arr.mean()),
+        "max_ms": float(arr.max()),
+    }
+
+
+async def run_load(base_url: str, rps: float, duration_s: float, endpoint: str = "/api/chat",
+                   queries: List[str] = QUERIES, timeout_s: float = 60.0) -> dict:
+    total = max(1, int(rps * duration_s))
+    latencies: List[float] = []
+    errors: Dict[str, int] = defaultdict(int)
+    stages: Dict[str, List[float]] = defaultdict(list)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout_s, limits=limits) as client:
+        t0 = time.perf_counter()
+
+        async def one(i: int) -> None:
+            scheduled = t0 + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                resp = await client.post(endpoint, json={"text": queries[i % len(queries)]})
+                if resp.status_code >= 400:
+                    errors[f"http_{resp.status_code}"] += 1
+                    return
+                for name, ms in _parse_server_timing(resp.headers.get("server-timing")).items():
+                    stages[name].append(ms)
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                return
+            latencies.append(time.perf_counter() - scheduled)
+
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - t0
+
+    n_errors = sum(errors.values())
+    return {
+        "requests": total,
+        "ok": len(latencies),
+        "errors": n_errors,
+        "error_rate": n_errors / total,
+        "errors_by_type": dict(errors),
+        "achieved_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": _summary_ms(latencies),
+        "server_timing_mean_ms": {k: float(np.mean(v)) for k, v in sorted(stages.items())},
+    }
+
+
+# ---------------- mod self-contained ----------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _AppServer:
+    """Aplicația FastAPI într-un thread uvicorn, configurată spre serverul OpenAI fals."""
+
+    def __init__(self, port: int) -> None:
+        import uvicorn
+        from backend.api.main import create_app
+        config = uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, name="bench-app", daemon=True)
+        self.url = f"http://127.0.0.1:{port}"
+
+    def __enter__(self) -> "_AppServer":
+        self.thread.start()
+        deadline = time.monotonic() + 60
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("benchmark app failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def run_self_contained(rps: float, duration_s: float, endpoint: str, latency: Dict[str, float]) -> dict:
+    from backend.benchmarks.fake_openai import FakeOpenAIServer
+
+    # izolare: fără cache-uri pe disc și fără joburi de fundal care să concureze cu load-ul
+    os.environ.update({
+        "EMBED_CACHE_PATH": "", "TRANSLATION_CACHE_PATH": "", "TRANSCRIPTION_CACHE_PATH": "",
+        "TTS_PREWARM_TOP_N": "0", "PRETRANSLATE_LANGS": "", "ANONYMIZED_TELEMETRY": "False",
+    })
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake-benchmark")
+    with FakeOpenAIServer(latency=latency, jitter=0.1) as fake:
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        with _AppServer(_free_port()) as app:
+            results = asyncio.run(run_load(app.url, rps, duration_s, endpoint))
+        results["fake_openai_requests"] = dict(fake.counts)
+    return results
+
+
+def main(argv=None) -> None:
+    from backend.benchmarks.fake_openai import parse_latency
+
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /api/chat.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="/api/chat")
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--self-contained", action="store_true",
+                        help="start the app and a fake OpenAI server in-process")
+    parser.add_argument("--latency", default="", help="fake OpenAI latency in ms (self-contained), e.g. chat=300")
+    parser.add_argument("--out", default=None, help="JSON output path (default: backend/benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    if args.self_contained:
+        results = run_self_contained(args.rps, args.duration, args.endpoint, parse_latency(args.latency))
+    else:
+        results = asyncio.run(run_load(args.url, args.rps, args.duration, args.endpoint))
+    config = {"endpoint": args.endpoint, "target_rps": args.rps, "duration_s": args.duration,
+              "self_contained": args.self_contained, "fake_openai_latency": args.latency}
+    print(json.dumps(results, indent=2))
+    print(f"saved: {save('load_chat', results, args.out, config)}")
+
+
+if __name__ == "__main__":
+    main()
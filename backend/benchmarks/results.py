@@ -0,0 +1,119 @@
+# backend/benchmarks/results.py
+"""
+Rezultatele benchmark-urilor ca JSON (cu metadate: commit, python, platformă),
+plus comparația între două rulări:
+
+    python -m backend.benchmarks.results old.json new.json [--threshold 0.10]
+
+Se compară toate valorile numerice din "results" cu aceeași cale; pentru chei de
+latență (*_ms, *_us, *_s) o creștere peste prag e raportată ca regresie, pentru
+chei de throughput (*rps*, *speedup*, *hit_rate*) o scădere peste prag.
+Parametrii rulării (rps țintă, durată, latențe simulate etc.) nu sunt rezultate:
+stau în meta.config și nu intră în comparație.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+RESULTS_DIR = "backend/benchmarks/results"
+
+_LOWER_IS_BETTER_SUFFIXES = ("_ms", "_us", "_s")
+_LOWER_IS_BETTER = ("errors", "error_rate", "bytes", "alloc")
+_HIGHER_IS_BETTER = ("rps", "speedup", "hit_rate", "throughput")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata() -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save(name: str, results: dict, out: Optional[str] = None, config: Optional[dict] = None) -> str:
+    """
+    Scrie {"benchmark", "meta", "results"}; implicit în RESULTS_DIR/<name>-<timestamp>.json.
+    `config` (parametrii rulării) ajunge în meta.config, nu în results.
+    """
+    path = Path(out) if out else Path(RESULTS_DIR) / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {**metadata(), "config": config or {}}
+    path.write_text(json.dumps({"benchmark": name, "meta": meta, "results": results}, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def _flatten(data, prefix: str = "") -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for k, v in data.items():
+            out.update(_flatten(v, f"{prefix}.{k}" if prefix else str(k)))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        out[prefix] = float(data)
+    return out
+
+
+def _direction(key: str) -> int:
+    """+1 = mai mare e mai bine, -1 = mai mic e mai bine, 0 = neutru."""
+    leaf = key.rsplit(".", 1)[-1].lower()
+    if any(tag in leaf for tag in _HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(_LOWER_IS_BETTER_SUFFIXES) or any(tag in leaf for tag in _LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(old: dict, new: dict, threshold: float = 0.10) -> list[dict]:
+    """Diferențele pe chei comune; "regression" = înrăutățire peste prag."""
+    a, b = _flatten(old.get("results", old)), _flatten(new.get("results", new))
+    rows = []
+    for key in sorted(a.keys() & b.keys()):
+        before, after = a[key], b[key]
+        change = (after - before) / abs(before) if before else (0.0 if after == before else float("inf"))
+        direction = _direction(key)
+        rows.append({
+            "key": key,
+            "old": before,
+            "new": after,
+            "change": change,
+            "regression": direction != 0 and -direction * change > threshold,
+        })
+    return rows
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    rows = compare(old, new, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['key']:<60} {row['old']:>12.3f} -> {row['new']:>12.3f}  {row['change']:+8.1%}  {flag}")
+    if any(r["regression"] for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# backend/services/answer_cache.py
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import List, Optional
+
+# distanța cosinus maximă (1 - cos) la care o întrebare nouă refolosește un răspuns; <= 0 dezactivează cache-ul
+ANSWER_CACHE_RADIUS = float(os.getenv("ANSWER_CACHE_RADIUS", "0.1"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2048"))
+ANSWER_CACHE_TTL_S = float(os.getenv("ANSWER_CACHE_TTL_S", "3600"))
+# câte răspunsuri păstrăm per (limbă, titlu): mărginește costul unui lookup
+ANSWER_CACHE_BUCKET_SIZE = 32
+
+
+def _unit(vec: List[float]) -> List[float]:
+    n = math.sqrt(sum(x * x for x in vec))
+    return [x / n for x in vec] if n > 0 else list(vec)
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return math.fsum(x * y for x, y in zip(a, b))
+
+
+@dataclass
+class _Entry:
+    key: tuple[str, str]
+    vector: List[float]
+    answer: str
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """
+    Cache de răspunsuri RAG, cheie = (limbă, titlul cel mai bun, embedding-ul întrebării).
+    Un lookup compară embedding-ul nou doar cu intrările din bucket-ul
+    (limbă, titlu) și întoarce răspunsul celei mai apropiate, dacă e în rază.
+    LRU global peste toate intrările + TTL.
+    """
+
+    def __init__(
+        self,
+        radius: float = ANSWER_CACHE_RADIUS,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_s: float = ANSWER_CACHE_TTL_S,
+        bucket_size: int = ANSWER_CACHE_BUCKET_SIZE,
+    ) -> None:
+        self.radius = radius
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = ttl_s
+        self.bucket_size = max(1, int(bucket_size))
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: dict[tuple[str, str], list[int]] = {}
+        self._ids = count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.radius > 0
+
+    def _drop_locked(self, eid: int) -> None:
+        entry = self._entries.pop(eid, None)
+        if entry is None:
+            return
+        bucket = self._buckets.get(entry.key)
+        if bucket is not None:
+            bucket.remove(eid)
+            if not bucket:
+                del self._buckets[entry.key]
+
+    def lookup(self, lang: str, title: str, embedding: List[float]) -> Optional[str]:
+        if not self.enabled:
+            return None
+        key = (lang, title)
+        q = _unit(embedding)
+        now = time.monotonic()
+        with self._lock:
+            best_id, best_sim = None, 1.0 - self.radius
+            for eid in list(self._buckets.get(key, ())):
+                entry = self._entries[eid]
+                if now - entry.created_at > self.ttl_s:
+                    self._drop_locked(eid)
+                    self.expired += 1
+                    continue
+                sim = _dot(q, entry.vector)
+                if sim >= best_sim:
+                    best_id, best_sim = eid, sim
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id].answer
+
+    def store(self, lang: str, title: str, embedding: List[float], answer: str) -> None:
+        if not self.enabled or not answer:
+            return
+        key = (lang, title)
+        with self._lock:
+            eid = next(self._ids)
+            self._entries[eid] = _Entry(key=key, vector=_unit(embedding), answer=answer, created_at=time.monotonic())
+            bucket = self._buckets.setdefault(key, [])
+            bucket.append(eid)
+            if len(bucket) > self.bucket_size:
+                self._drop_locked(bucket[0])
+                self.evictions += 1
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+            "expired": self.expired,
+        }
+
+
+_cache: Optional[SemanticAnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticAnswerCache()
+    return _cache
@@ -0,0 +1,260 @@
+# backend/services/book_catalog.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+BOOKS_PATH = "backend/data/book_summaries.json"
+
+# cât de des ne uităm la mtime-ul fișierului (stat e ieftin, dar nu la fiecare apel)
+MTIME_CHECK_INTERVAL_S = float(os.getenv("CATALOG_MTIME_CHECK_S", "2.0"))
+
+
+def normalize_title(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", (s or "").lower())
+
+
+# alias (lower) -> titlu canonic exact (cheia din JSON).
+# Recordurile din JSON pot aduce alias-uri proprii prin câmpul opțional "aliases".
+BUILTIN_ALIASES: dict[str, str] = {
+    # Harry Potter
+    "harry potter": "Harry Potter and the Philosopher's Stone",
+    "harry potter si piatra filosofala": "Harry Potter and the Philosopher's Stone",
+    "harry potter și piatra filosofală": "Harry Potter and the Philosopher's Stone",
+
+    # The Hobbit
+    "the hobbit": "The Hobbit",
+    "hobbitul": "The Hobbit",
+
+    # 1984
+    "1984": "1984",
+
+    # The Great Gatsby
+    "the great gatsby": "The Great Gatsby",
+    "marele gatsby": "The Great Gatsby",
+
+    # Narnia
+    "narnia": "The Chronicles of Narnia",
+    "the chronicles of narnia": "The Chronicles of Narnia",
+
+    # To Kill a Mockingbird (variantes + typos)
+    "to kill a mockingbird": "To Kill a Mockingbird",
+    "mockingbird": "To Kill a Mockingbird",
+    "mocking bird": "To Kill a Mockingbird",
+    "mockin bird": "To Kill a Mockingbird",     # typo frecvent
+    "mockinbird": "To Kill a Mockingbird",
+    "sa ucizi o pasare cantatoare": "To Kill a Mockingbird",   # RO
+    "să ucizi o pasăre cântătoare": "To Kill a Mockingbird",
+}
+
+
+@dataclass(frozen=True)
+class BookRecord:
+    title: str
+    summary: str
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Vedere imutabilă a catalogului la un moment dat. Un reload construiește un
+    snapshot nou și îl înlocuiește atomic, deci cititorii nu văd stări parțiale.
+    """
+    version: int
+    mtime_ns: int
+    records: tuple[BookRecord, ...]
+    by_key: dict[str, BookRecord]       # normalize_title(titlu) -> record
+    titles: tuple[str, ...]             # ordinea din JSON
+    aliases: dict[str, str]             # alias normalizat -> titlu canonic
+
+
+def _build_snapshot(books: list, version: int, mtime_ns: int) -> CatalogSnapshot:
+    records: list[BookRecord] = []
+    by_key: dict[str, BookRecord] = {}
+
+    for book in books:
+        title = (book.get("title") or "").strip()
+        summary = (book.get("summary") or "").strip()
+        if not title:
+            continue
+        key = normalize_title(title)
+        if key in by_key:
+            # primul record câștigă (la fel ca scanarea liniară de dinainte)
+            continue
+        rec = BookRecord(
+            title=title,
+            summary=summary,
+            aliases=tuple(a for a in (book.get("aliases") or []) if isinstance(a, str) and a.strip()),
+        )
+        records.append(rec)
+        by_key[key] = rec
+
+    aliases: dict[str, str] = {}
+    for alias, canonical in BUILTIN_ALIASES.items():
+        aliases.setdefault(normalize_title(alias), canonical)
+    for rec in records:
+        for alias in rec.aliases:
+            ak = normalize_title(alias)
+            if ak:
+                aliases.setdefault(ak, rec.title)
+
+    return CatalogSnapshot(
+        version=version,
+        mtime_ns=mtime_ns,
+        records=tuple(records),
+        by_key=by_key,
+        titles=tuple(r.title for r in records),
+        aliases=aliases,
+    )
+
+
+class BookCatalog:
+    """
+    Catalog de cărți încărcat o singură dată per proces, cu index hash
+    titlu-normalizat -> record (lookup O(1)).
+    Dacă mtime-ul fișierului se schimbă, reîncărcăm în background și servim
+    între timp snapshot-ul vechi.
+    """
+
+    def __init__(self, path: str = BOOKS_PATH, check_interval_s: float = MTIME_CHECK_INTERVAL_S) -> None:
+        self.path = path
+        self.check_interval_s = check_interval_s
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._reloading = False
+        self._last_check = 0.0
+        self._listeners: list[Callable[[CatalogSnapshot], None]] = []
+
+    # ---------------- încărcare ----------------
+
+    def _stat_mtime_ns(self) -> int:
+        return os.stat(self.path).st_mtime_ns
+
+    def _load(self, version: int) -> CatalogSnapshot:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Book summaries file not found at {self.path}")
+        mtime_ns = self._stat_mtime_ns()
+        with open(self.path, "r", encoding="utf-8") as f:
+            books = json.load(f)
+        if not isinstance(books, list):
+            raise ValueError(f"{self.path} must be a JSON list")
+        return _build_snapshot(books, version=version, mtime_ns=mtime_ns)
+
+    def add_listener(self, fn: Callable[[CatalogSnapshot], None]) -> None:
+        """
+        fn(snapshot) e apelat după fiecare (re)încărcare. Dacă avem deja un
+        snapshot, e apelat imediat cu acesta.
+        """
+        with self._lock:
+            self._listeners.append(fn)
+            snap = self._snapshot
+        if snap is not None:
+            self._notify(snap, [fn])
+
+    def _notify(self, snap: CatalogSnapshot, listeners: Optional[list] = None) -> None:
+        for fn in listeners if listeners is not None else list(self._listeners):
+            try:
+                fn(snap)
+            except Exception as e:
+                print(f"[Catalog] Listener error: {e}")
+
+    def _reload_in_background(self, current: CatalogSnapshot) -> None:
+        def _run() -> None:
+            try:
+                fresh = self._load(version=current.version + 1)
+                with self._lock:
+                    self._snapshot = fresh
+                self._notify(fresh)
+            except Exception as e:
+                # fișier scris pe jumătate / JSON invalid: păstrăm snapshot-ul vechi
+                print(f"[Catalog] Reload failed, keeping version {current.version}: {e}")
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=_run, name="book-catalog-reload", daemon=True).start()
+
+    def _maybe_reload(self, snap: CatalogSnapshot) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval_s:
+            return
+        self._last_check = now
+        try:
+            mtime_ns = self._stat_mtime_ns()
+        except OSError:
+            return
+        if mtime_ns == snap.mtime_ns:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        self._reload_in_background(snap)
+
+    def snapshot(self) -> CatalogSnapshot:
+        snap = self._snapshot
+        if snap is None:
+            loaded = False
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load(version=1)
+                    self._last_check = time.monotonic()
+                    loaded = True
+                snap = self._snapshot
+            if loaded:
+                self._notify(snap)
+            return snap
+        self._maybe_reload(snap)
+        return snap
+
+    def reload(self) -> CatalogSnapshot:
+        """Reload sincron (util pentru CLI / după rescrierea fișierului)."""
+        with self._lock:
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            self._snapshot = self._load(version=version)
+            self._last_check = time.monotonic()
+            snap = self._snapshot
+        self._notify(snap)
+        return snap
+
+    # ---------------- API ----------------
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def get(self, title: str) -> Optional[BookRecord]:
+        return self.snapshot().by_key.get(normalize_title(title))
+
+    def get_summary(self, title: str) -> Optional[str]:
+        rec = self.get(title)
+        return rec.summary if rec else None
+
+    def titles(self) -> list[str]:
+        return list(self.snapshot().titles)
+
+    def alias_map(self) -> dict[str, str]:
+        return self.snapshot().aliases
+
+    def __len__(self) -> int:
+        return len(self.snapshot().records)
+
+
+_catalog: Optional[BookCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> BookCatalog:
+    """Instanța de catalog partajată de tot procesul."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = BookCatalog()
+    return _catalog
@@ -0,0 +1,245 @@
+# backend/services/cache.py
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    LRU în memorie, thread-safe, cu TTL opțional și contoare hit/miss.
+    TTL-ul e verificat leneș, la citire.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_s: Optional[float] = None) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            stored_at, value = item
+            if self.ttl_s is not None and time.monotonic() - stored_at > self.ttl_s:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+            return default if item is _MISSING else item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class SQLiteStore:
+    """
+    Tier pe disc cheie -> blob (SQLite, WAL). Mărginit ca număr de intrări:
+    când depășim max_entries ștergem ~10% din cele mai vechi accesate.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "kv",
+        max_entries: int = 100_000,
+        ttl_s: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        self.table = table
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = ttl_s
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed_at)")
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, bytes]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        out: dict[str, bytes] = {}
+        with self._lock:
+            # SQLite limitează numărul de parametri; lucrăm pe bucăți
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({marks})", chunk
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl_s is not None and now - created_at > self.ttl_s:
+                        continue
+                    out[key] = value
+            if out:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                    [(now, k) for k in out],
+                )
+        return out
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Iterable[tuple[str, bytes]]) -> None:
+        now = time.time()
+        rows = [(k, v, now, now) for k, v in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._writes_since_check += len(rows)
+            # COUNT(*) nu e gratis; verificăm doar din când în când
+            if self._writes_since_check >= max(1, self.max_entries // 100):
+                self._writes_since_check = 0
+                self._evict_locked()
+
+    def set(self, key: str, value: bytes) -> None:
+        self.set_many([(key, value)])
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict_locked(self) -> None:
+        if self.ttl_s is not None:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_s,)
+            )
+            self.evictions += max(0, cur.rowcount)
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - self.max_entries + max(1, self.max_entries // 10)
+        cur = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f" SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += max(0, cur.rowcount)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TwoTierCache:
+    """
+    Cache de text în două trepte: LRU cu TTL în memorie + tier SQLite opțional
+    (path gol îl dezactivează). Erorile de disc doar se loghează: cache-ul
+    nu trebuie să strice request-ul. Folosit de translation / transcription cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        table: str,
+        memory_size: int,
+        disk_max_entries: int,
+        ttl_s: Optional[float],
+        label: str,
+    ) -> None:
+        self.label = label
+        self.memory = LRUCache(maxsize=memory_size, ttl_s=ttl_s)
+        self.disk: Optional[SQLiteStore] = None
+        if path:
+            try:
+                self.disk = SQLiteStore(path, table=table, max_entries=disk_max_entries, ttl_s=ttl_s)
+            except Exception as e:
+                print(f"[{label}] Disk tier disabled: {e}")
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[str]:
+        hit = self.memory.get(key)
+        if hit is not None or self.disk is None:
+            return hit
+        try:
+            blob = self.disk.get(key)
+        except Exception as e:
+            print(f"[{self.label}] Disk read error: {e}")
+            return None
+        if blob is None:
+            return None
+        value = blob.decode("utf-8")
+        self.memory.set(key, value)
+        self.disk_hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value.encode("utf-8"))
+            except Exception as e:
+                print(f"[{self.label}] Disk write error: {e}")
+
+    def stats(self) -> dict[str, int]:
+        mem = self.memory.stats()
+        return {
+            "memory_hits": mem["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": mem["misses"] - self.disk_hits,
+            "memory_size": mem["size"],
+            "memory_evictions": mem["evictions"],
+        }
@@ -0,0 +1,157 @@
+# backend/services/embedding_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import unicodedata
+from array import array
+from typing import Awaitable, Callable, List, Optional
+
+from backend.services.cache import LRUCache, SQLiteStore
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "backend/vector_store/cache/embeddings.sqlite3")
+EMBED_CACHE_MEMORY_SIZE = int(os.getenv("EMBED_CACHE_MEMORY_SIZE", "4096"))
+EMBED_CACHE_DISK_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_DISK_MAX_ENTRIES", "200000"))
+
+Vector = List[float]
+
+
+def normalize_text(text: str) -> str:
+    """NFC + spații colapsate: aceeași cheie pentru același conținut."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def _pack(vec: Vector) -> bytes:
+    return array("f", vec).tobytes()
+
+
+def _unpack(blob: bytes) -> Vector:
+    a = array("f")
+    a.frombytes(blob)
+    return a.tolist()
+
+
+class EmbeddingCache:
+    """
+    Cache content-addressed pentru embeddings, cheie = (model, text normalizat).
+    Două niveluri: LRU în proces + SQLite pe disc (vectori float32), ambele mărginite.
+    Folosit atât de retriever (interogări) cât și de vector_store_builder (documente).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        memory_size: int = EMBED_CACHE_MEMORY_SIZE,
+        disk_max_entries: int = EMBED_CACHE_DISK_MAX_ENTRIES,
+    ) -> None:
+        self.memory = LRUCache(maxsize=memory_size)
+        self.disk: Optional[SQLiteStore] = None
+        if path:
+            try:
+                self.disk = SQLiteStore(path, table="embeddings", max_entries=disk_max_entries)
+            except Exception as e:
+                # fără disc (read-only FS etc.) mergem doar cu tier-ul din memorie
+                print(f"[Embedding Cache] Disk tier disabled: {e}")
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ---------------- lookup / store ----------------
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[Vector]]:
+        keys = [cache_key(model, t) for t in texts]
+        out: List[Optional[Vector]] = [self.memory.get(k) for k in keys]
+
+        missing = [k for k, v in zip(keys, out) if v is None]
+        from_disk: dict[str, bytes] = {}
+        if missing and self.disk is not None:
+            try:
+                from_disk = self.disk.get_many(missing)
+            except Exception as e:
+                print(f"[Embedding Cache] Disk read error: {e}")
+
+        for i, k in enumerate(keys):
+            if out[i] is not None:
+                continue
+            blob = from_disk.get(k)
+            if blob is not None:
+                vec = _unpack(blob)
+                self.memory.set(k, vec)
+                out[i] = vec
+
+        with self._lock:
+            self.disk_hits += len(from_disk)
+            self.misses += sum(1 for v in out if v is None)
+        return out
+
+    def put_many(self, model: str, texts: List[str], vectors: List[Vector]) -> None:
+        rows = []
+        for t, vec in zip(texts, vectors):
+            k = cache_key(model, t)
+            self.memory.set(k, list(vec))
+            rows.append((k, _pack(vec)))
+        if self.disk is not None and rows:
+            try:
+                self.disk.set_many(rows)
+            except Exception as e:
+                print(f"[Embedding Cache] Disk write error: {e}")
+
+    # ---------------- read-through ----------------
+
+    def _plan(self, model: str, texts: List[str]) -> tuple[List[Optional[Vector]], List[str]]:
+        cached = self.get_many(model, texts)
+        # textele lipsă, unice (după cheie), în ordinea apariției
+        todo: dict[str, str] = {}
+        for t, v in zip(texts, cached):
+            if v is None:
+                todo.setdefault(cache_key(model, t), t)
+        return cached, list(todo.values())
+
+    def _fill(self, model: str, texts: List[str], cached: List[Optional[Vector]], todo: List[str], fresh: List[Vector]) -> List[Vector]:
+        self.put_many(model, todo, fresh)
+        by_key = {cache_key(model, t): v for t, v in zip(todo, fresh)}
+        return [v if v is not None else by_key[cache_key(model, t)] for t, v in zip(texts, cached)]
+
+    def embed(self, model: str, texts: List[str], embed_fn: Callable[[List[str]], List[Vector]]) -> List[Vector]:
+        """Întoarce embeddings în ordinea input-ului; embed_fn e apelat doar pentru miss-uri."""
+        cached, todo = self._plan(model, texts)
+        if not todo:
+            return cached  # type: ignore[return-value]
+        return self._fill(model, texts, cached, todo, embed_fn(todo))
+
+    async def embed_async(
+        self, model: str, texts: List[str], embed_fn: Callable[[List[str]], Awaitable[List[Vector]]]
+    ) -> List[Vector]:
+        cached, todo = self._plan(model, texts)
+        if not todo:
+            return cached  # type: ignore[return-value]
+        return self._fill(model, texts, cached, todo, await embed_fn(todo))
+
+    def stats(self) -> dict[str, int]:
+        mem = self.memory.stats()
+        return {
+            "memory_hits": mem["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_size": mem["size"],
+            "memory_evictions": mem["evictions"],
+            "disk_evictions": self.disk.evictions if self.disk is not None else 0,
+        }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
@@ -0,0 +1,110 @@
+# backend/services/image_cache.py
+"""
+Cache pe disc pentru imaginile generate, cheie = hash(model, prompt, size, n).
+O intrare = un manifest JSON (img-<cheie>.json) + fișierele PNG (img-<cheie>-<i>.png)
+în backend/static/images, servite direct prin /static/images.
+LRU după mtime-ul manifestului (atins la fiecare hit), mărginit la IMAGE_CACHE_MAX_ENTRIES.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+IMAGES_DIR = "backend/static/images"
+IMAGES_URL_PREFIX = "/static/images"
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "200"))
+
+FILE_PREFIX = "img-"
+
+
+def cache_key(model: str, prompt: str, size: str, n: int) -> str:
+    raw = json.dumps([model, " ".join(prompt.split()), size, int(n)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+class ImageCache:
+    def __init__(
+        self,
+        directory: str = IMAGES_DIR,
+        url_prefix: str = IMAGES_URL_PREFIX,
+        max_entries: int = IMAGE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _manifest(self, key: str) -> Path:
+        return self.directory / f"{FILE_PREFIX}{key}.json"
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """Lista de imagini ({url, filename}) sau None; un hit reîmprospătează poziția LRU."""
+        path = self._manifest(key)
+        try:
+            files = json.loads(path.read_text(encoding="utf-8"))["files"]
+            if not all((self.directory / fn).exists() for fn in files):
+                raise FileNotFoundError(key)
+            now = time.time()
+            os.utime(path, (now, now))
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return [{"url": f"{self.url_prefix}/{fn}", "filename": fn} for fn in files]
+
+    def put(self, key: str, images: List[bytes]) -> List[dict]:
+        """Scrie PNG-urile (atomic) și manifestul; întoarce lista de imagini."""
+        files = []
+        for i, data in enumerate(images):
+            fn = f"{FILE_PREFIX}{key}-{i}.png"
+            tmp = self.directory / f"{fn}.part"
+            tmp.write_bytes(data)
+            os.replace(tmp, self.directory / fn)
+            files.append(fn)
+        manifest = self._manifest(key)
+        tmp = manifest.with_suffix(".json.part")
+        tmp.write_text(json.dumps({"files": files, "created_at": time.time()}), encoding="utf-8")
+        os.replace(tmp, manifest)
+        self.evict()
+        return [{"url": f"{self.url_prefix}/{fn}", "filename": fn} for fn in files]
+
+    def evict(self) -> int:
+        """Șterge cele mai vechi accesate intrări peste max_entries."""
+        with self._lock:
+            manifests = sorted(self.directory.glob(f"{FILE_PREFIX}*.json"), key=lambda p: p.stat().st_mtime)
+            victims = manifests[:max(0, len(manifests) - self.max_entries)]
+            for path in victims:
+                key = path.stem[len(FILE_PREFIX):]
+                for png in self.directory.glob(f"{FILE_PREFIX}{key}-*.png"):
+                    png.unlink(missing_ok=True)
+                path.unlink(missing_ok=True)
+            self.evictions += len(victims)
+            return len(victims)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache: Optional[ImageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ImageCache()
+    return _cache
@@ -0,0 +1,218 @@
+# backend/services/language_detection.py
+"""
+Detectare de limbă în două trepte:
+
+  1) scorer local (sub-milisecundă): caractere specifice + cuvinte de legătură
+     pentru limbile pe care le vedem în practică (en, ro, fr, es, it, de, pt)
+  2) doar dacă treapta 1 e ambiguă: langdetect (modelul n-gram se încarcă o singură
+     dată, la primul apel), cu override-ul RO de care aveam nevoie înainte în LLMHW
+
+Rezultatele sunt memorate per hash de text normalizat, deci același text nu e
+detectat de două ori (chat turn, translate, pre-traducere).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from backend.services.cache import LRUCache
+
+DETECT_CACHE_SIZE = int(os.getenv("LANG_DETECT_CACHE_SIZE", "4096"))
+
+# treapta 1 decide singură dacă scorul câștigător e >= MIN_SCORE și de cel puțin
+# MIN_RATIO ori scorul de pe locul doi, sau dacă e singura limbă cu vreun semnal ("hi", "mulțumesc")
+MIN_SCORE = 2.0
+MIN_RATIO = 1.5
+
+CHAR_WEIGHT = 2.0     # per caracter specific (plafonat la CHAR_CAP)
+CHAR_CAP = 3
+
+# caractere care indică (aproape) sigur o limbă
+_CHARS: Dict[str, str] = {
+    "ro": "ășțşţ",
+    "de": "ßäöü",
+    "fr": "èêëçœàùû",
+    "es": "ñ¿¡",
+    "pt": "ãõ",
+    "it": "ìò",
+}
+
+# cuvinte de legătură / frecvente în întrebările despre cărți (lowercase, cu și fără diacritice)
+_STOPWORDS: Dict[str, frozenset] = {
+    "en": frozenset("""
+        the an and or of to in on is are was were be what who which how why about with for from
+        that this these those it its me my i you your we they can could would should do does
+        some any like want give tell recommend please book books story novel read hello hi thanks
+        thank yes no not but if there here have has
+    """.split()),
+    "ro": frozenset("""
+        și si sau este sunt care ce cine cum despre pentru cu din într intr în in pe la nu da
+        îmi imi mi ți ti vreau poți poti poate te rog mulțumesc multumesc carte cărți carti
+        povestea poveste recomanzi recomandă recomanda spune spune-mi spunemi știi stii
+        bună buna salut ceva un o unei unui de mai foarte am ai are
+    """.split()),
+    "fr": frozenset("""
+        le la les de des du un une et est sont qui que quoi comment pourquoi avec pour dans sur pas
+        je tu vous nous il elle veux livre livres parle moi bonjour merci
+    """.split()),
+    "es": frozenset("""
+        el los las de del un una y es son que qué quien como cómo por para con en sobre no
+        yo tú usted quiero libro libros habla hola gracias muy
+    """.split()),
+    "it": frozenset("""
+        il lo gli di della delle del sulla sul un una e è sono che chi come perché con per nel non
+        io tu libro libri parla parlami consigli ciao grazie molto
+    """.split()),
+    "de": frozenset("""
+        der die das und ist sind wer wie warum mit für von nicht ich du sie ein eine
+        buch bücher über hallo danke
+    """.split()),
+    "pt": frozenset("""
+        os as de do da dos das um uma e é são que quem como por para com em sobre não
+        eu você livro livros fala olá obrigado
+    """.split()),
+}
+
+# limbi cu care langdetect confundă româna fără diacritice
+_RO_CONFUSABLE = {"it", "es", "pt", "fr", "ca"}
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)?", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    lang: str            # cod ISO-639-1 sau "unknown"
+    score: float         # scorul câștigător din treapta 1 (0 dacă n-a avut semnal)
+    stage: str           # "local" | "langdetect" | "empty"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def score_languages(text: str) -> Dict[str, float]:
+    """Scorurile treptei 1 (text deja normalizat sau nu)."""
+    t = _normalize(text)
+    scores: Dict[str, float] = {lang: 0.0 for lang in _STOPWORDS}
+    for lang, chars in _CHARS.items():
+        hits = sum(t.count(ch) for ch in chars)
+        if hits:
+            scores[lang] += CHAR_WEIGHT * min(hits, CHAR_CAP)
+    for word in _WORD_RE.findall(t):
+        for lang, words in _STOPWORDS.items():
+            if word in words:
+                scores[lang] += 1.0
+    return scores
+
+
+def looks_like(text: str, lang: str) -> bool:
+    """Semnal local pentru `lang` (generalizarea vechiului looks_like_romanian)."""
+    scores = score_languages(text)
+    if lang == "ro" and any(ch in _normalize(text) for ch in "ăâîșțşţ"):
+        return True
+    # strict: la egalitate (un singur cuvânt comun, ex. "un" / "de") nu decidem noi
+    own = scores.get(lang, 0.0)
+    return own > 0 and all(own > v for other, v in scores.items() if other != lang)
+
+
+def _local_guess(text: str) -> Optional[LanguageGuess]:
+    scores = score_languages(text)
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    (best_lang, best), (_, second) = ranked[0], ranked[1]
+    if (best >= MIN_SCORE and best >= MIN_RATIO * second) or (best > 0 and second == 0):
+        return LanguageGuess(best_lang, best, "local")
+    return None
+
+
+# ---------------- treapta 2: langdetect (încărcat lazy, o singură dată) ----------------
+
+_detector_lock = threading.Lock()
+_detect_fn = None
+
+
+def _langdetect(text: str) -> str:
+    global _detect_fn
+    if _detect_fn is None:
+        with _detector_lock:
+            if _detect_fn is None:
+                from langdetect import DetectorFactory, detect
+                DetectorFactory.seed = 0
+                _detect_fn = detect
+    try:
+        return _detect_fn(text)
+    except Exception:
+        return "unknown"
+
+
+def warm_up() -> None:
+    """Încarcă profilurile langdetect (~50 de fișiere JSON) înainte de primul text ambiguu."""
+    _langdetect("This sentence only loads the language profiles.")
+
+
+def _fallback_guess(text: str) -> LanguageGuess:
+    lang = _langdetect(text)
+    # langdetect vede româna fără diacritice ca it/es/pt/fr
+    if lang in _RO_CONFUSABLE and looks_like(text, "ro"):
+        lang = "ro"
+    return LanguageGuess(lang, 0.0, "langdetect")
+
+
+# ---------------- API ----------------
+
+class LanguageDetector:
+    def __init__(self, cache_size: int = DETECT_CACHE_SIZE) -> None:
+        self._cache = LRUCache(maxsize=cache_size)
+        self.local_hits = 0
+        self.fallbacks = 0
+
+    def guess(self, text: str) -> LanguageGuess:
+        norm = _normalize(text)
+        if not norm:
+            return LanguageGuess("unknown", 0.0, "empty")
+        key = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+        result = _local_guess(norm)
+        if result is not None:
+            self.local_hits += 1
+        else:
+            self.fallbacks += 1
+            result = _fallback_guess(text)
+        self._cache.set(key, result)
+        return result
+
+    def detect(self, text: str) -> str:
+        return self.guess(text).lang
+
+    def stats(self) -> dict[str, int]:
+        mem = self._cache.stats()
+        return {
+            "cache_hits": mem["hits"],
+            "local": self.local_hits,
+            "langdetect": self.fallbacks,
+            "cache_size": mem["size"],
+        }
+
+
+_detector: Optional[LanguageDetector] = None
+_detector_singleton_lock = threading.Lock()
+
+
+def get_language_detector() -> LanguageDetector:
+    global _detector
+    if _detector is None:
+        with _detector_singleton_lock:
+            if _detector is None:
+                _detector = LanguageDetector()
+    return _detector
+
+
+def detect_language(text: str) -> str:
+    """Cod ISO-639-1 sau "unknown"."""
+    return get_language_detector().detect(text)
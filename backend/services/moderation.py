@@ -0,0 +1,208 @@
+# backend/services/moderation.py
+"""
+Motor de moderare în trepte, ca să nu plătim un round-trip la Moderation API
+pentru fiecare mesaj:
+
+  1) lexicon: o singură expresie regulată combinată (toate cuvintele, o trecere)
+     -> match = ofensiv, fără API
+  2) cache de verdicte pe textul normalizat (doar verdicte de la API, reușite)
+  3) allow-list local: doar un titlu din catalog și/sau o întrebare-șablon
+     ("tell me about X", "who wrote X", "recomandă-mi o carte") -> benign, fără API.
+     Orice cuvânt din afara șablonului trimite textul la API: nu încercăm să
+     ghicim local dacă un conținut liber e sigur.
+  4) altfel: Moderation API (funcția remote e dată de apelant)
+
+Fail-open ca înainte: o eroare la API înseamnă "nu e ofensiv" (și nu se cachează).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from typing import Awaitable, Callable, Iterable, Optional
+
+from backend.services.cache import LRUCache
+from backend.services.singleflight import get_singleflight
+
+MODERATION_CACHE_SIZE = int(os.getenv("MODERATION_CACHE_SIZE", "4096"))
+MODERATION_CACHE_TTL_S = float(os.getenv("MODERATION_CACHE_TTL_S", str(24 * 3600)))
+# MODERATION_LOCAL_PASS=0 trimite tot ce trece de lexicon la API (comportamentul vechi)
+MODERATION_LOCAL_PASS = os.getenv("MODERATION_LOCAL_PASS", "1").strip() not in {"0", "false", "no"}
+
+# peste lungimea asta nu mai ghicim local; textele lungi merg la API
+LOCAL_PASS_MAX_CHARS = 300
+
+# tot vocabularul permis în afara titlurilor pentru treapta locală (EN + RO).
+# Doar cuvinte de șablon: fără substantive / verbe de conținut, ca "a book on how
+# to make X" sau "carte despre cum să Y" să ajungă mereu la API.
+TEMPLATE_WORDS: frozenset[str] = frozenset("""
+a about an and another any are author book books by can character characters could do does
+give good hello hi i in is it like main me more novel novels of ok okay please plot published read
+recommend recommendation recommendations should similar some something story suggest summary
+summarize tell thank thanks that the this to want was what who would wrote written you
+alta altă autor autorul bun bună carte cartea carti cărți ce cine citesc citit cu de despre e este
+gen genul imi îmi mai mi multumesc mulțumesc o personaje personajele poti poți poveste povestea
+pentru recomanda recomandă recomanzi rezumat rezumatul rog salut scris si similar și te un vreau
+""".split())
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # cele mai lungi primele, ca alternanța să nu se oprească pe un prefix
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+def compile_lexicon(words: Iterable[str]) -> re.Pattern:
+    """Toate cuvintele într-o singură expresie, cu word boundaries."""
+    return re.compile(rf"\b(?:{_alternation(words)})\b", re.IGNORECASE)
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _mask_titles(t_low: str) -> tuple[str, bool]:
+    """Înlocuiește titlurile din catalog cu spații; (text_mascat, am_găsit_titlu)."""
+    try:
+        from backend.services.title_matcher import get_title_matcher
+        spans = get_title_matcher().title_spans(t_low)
+    except Exception:
+        return t_low, False
+    if not spans:
+        return t_low, False
+    chars = list(t_low)
+    for start, end in spans:
+        chars[start:end] = " " * (end - start)
+    return "".join(chars), True
+
+
+class ModerationEngine:
+    def __init__(
+        self,
+        lexicon: Iterable[str],
+        cache_size: int = MODERATION_CACHE_SIZE,
+        cache_ttl_s: Optional[float] = MODERATION_CACHE_TTL_S,
+        local_pass: bool = MODERATION_LOCAL_PASS,
+    ) -> None:
+        self.lexicon_re = compile_lexicon(lexicon)
+        self.local_pass = local_pass
+        self._verdicts = LRUCache(maxsize=cache_size, ttl_s=cache_ttl_s)
+        self._flight = get_singleflight("moderation")
+        self._lock = threading.Lock()
+        self._counts = {
+            "checks": 0,
+            "lexicon_hits": 0,
+            "local_pass": 0,
+            "cache_hits": 0,
+            "api_calls": 0,
+            "api_flagged": 0,
+            "api_errors": 0,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    # ---------------- trepte locale ----------------
+
+    def contains_lexicon(self, text: str) -> bool:
+        return bool(self.lexicon_re.search(text or ""))
+
+    def is_clearly_benign(self, text: str) -> bool:
+        """
+        Allow-list: după mascarea titlurilor din catalog, toate cuvintele rămase
+        trebuie să fie din TEMPLATE_WORDS (un titlu singur e benign).
+        """
+        t = _normalize(text)
+        if not t or len(t) > LOCAL_PASS_MAX_CHARS:
+            return False
+        masked, _ = _mask_titles(t)
+        return all(w in TEMPLATE_WORDS for w in _WORD_RE.findall(masked))
+
+    def precheck(self, text: str) -> Optional[bool]:
+        """
+        Verdictul fără rețea: True (ofensiv), False (benign / din cache),
+        sau None dacă e nevoie de Moderation API.
+        """
+        t = (text or "").strip()
+        if not t:
+            return False
+        self._count("checks")
+        if self.contains_lexicon(t):
+            self._count("lexicon_hits")
+            return True
+        cached = self._verdicts.get(self._key(t))
+        if cached is not None:
+            self._count("cache_hits")
+            return cached
+        if self.local_pass and self.is_clearly_benign(t):
+            self._count("local_pass")
+            return False
+        return None
+
+    # ---------------- treapta remote ----------------
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha1(_normalize(text).encode("utf-8")).hexdigest()
+
+    def _record_remote(self, text: str, flagged: bool) -> bool:
+        with self._lock:
+            self._counts["api_calls"] += 1
+            if flagged:
+                self._counts["api_flagged"] += 1
+        self._verdicts.set(self._key(text), flagged)
+        return flagged
+
+    def _record_error(self, e: Exception) -> bool:
+        with self._lock:
+            self._counts["api_calls"] += 1
+            self._counts["api_errors"] += 1
+        print(f"[Offensive Filter Error] {e}")
+        return False
+
+    def check_remote(self, text: str, remote: Callable[[str], bool]) -> bool:
+        """
+        Doar treapta remote (după un precheck care a întors None). Același text
+        verificat simultan de mai multe request-uri -> un singur apel (single-flight).
+        """
+        t = (text or "").strip()
+
+        def _call() -> bool:
+            try:
+                return self._record_remote(t, bool(remote(t)))
+            except Exception as e:
+                return self._record_error(e)
+
+        return self._flight.do(self._key(t), _call)
+
+    def check(self, text: str, remote: Callable[[str], bool]) -> bool:
+        verdict = self.precheck(text)
+        if verdict is not None:
+            return verdict
+        return self.check_remote(text, remote)
+
+    async def check_async(self, text: str, remote: Callable[[str], Awaitable[bool]]) -> bool:
+        verdict = self.precheck(text)
+        if verdict is not None:
+            return verdict
+        t = text.strip()
+
+        async def _call() -> bool:
+            try:
+                return self._record_remote(t, bool(await remote(t)))
+            except Exception as e:
+                return self._record_error(e)
+
+        return await self._flight.do_async(self._key(t), _call)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+        avoided = counts["lexicon_hits"] + counts["local_pass"] + counts["cache_hits"]
+        counts["api_avoided"] = avoided
+        counts["api_avoided_ratio"] = avoided / counts["checks"] if counts["checks"] else 0.0
+        return counts
@@ -0,0 +1,215 @@
+# backend/services/openai_client.py
+"""
+Clienți OpenAI partajați de tot procesul.
+
+Până acum fiecare apel construia un OpenAI(...) nou, deci și un pool httpx nou:
+fiecare request făcea handshake TLS de la zero. Aici ținem:
+  - un singur OpenAI sync (httpx.Client thread-safe, partajat de toate thread-urile)
+  - un AsyncOpenAI per event loop (conexiunile async nu pot trece dintr-un loop în altul;
+    în afara unui loop get_async_openai_client ridică RuntimeError)
+ambele peste un pool httpx cu keep-alive. Fiecare operație ("chat", "embeddings",
+"moderations", "audio", "images") primește o copie cu timeout / max_retries proprii
+(with_options refolosește același httpx client). Retry-urile sunt cele din SDK:
+backoff exponențial cu jitter, mărginit de max_retries.
+Latența fiecărui request HTTP e înregistrată per endpoint (vezi latency_stats()).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from backend.services.tracing import LatencyRecorder, record_span
+
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+OPENAI_KEEPALIVE_EXPIRY_S = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_S", "60"))
+OPENAI_CONNECT_TIMEOUT_S = float(os.getenv("OPENAI_CONNECT_TIMEOUT_S", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+# la pornire: un GET /models pe pool-ul async, ca primul request să nu plătească DNS + TLS
+OPENAI_PRECONNECT = os.getenv("OPENAI_PRECONNECT", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# operație -> (timeout total de citire în secunde, max_retries)
+OPERATION_POLICIES: Dict[str, tuple[float, int]] = {
+    "chat": (60.0, OPENAI_MAX_RETRIES),
+    "embeddings": (20.0, OPENAI_MAX_RETRIES),
+    "moderations": (10.0, OPENAI_MAX_RETRIES),
+    "audio": (90.0, 1),
+    "images": (120.0, 1),
+}
+DEFAULT_POLICY = (60.0, OPENAI_MAX_RETRIES)
+
+
+def _api_key() -> str:
+    raw = os.getenv("OPENAI_API_KEY", "")
+    api_key = raw.strip().strip('"').strip("'")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY missing. Set it in .env or environment.")
+    return api_key
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_S,
+    )
+
+
+def _timeout(read_s: float) -> httpx.Timeout:
+    return httpx.Timeout(read_s, connect=OPENAI_CONNECT_TIMEOUT_S)
+
+
+# ---------------- latență per endpoint ----------------
+# Latență per "METODĂ /cale" (ex. "POST /v1/embeddings"), măsurată până la
+# primirea header-elor de răspuns (pentru streaming = time-to-first-byte).
+# Fiecare retry din SDK e un request separat, deci apare separat. Fiecare request
+# e și un span "openai.<endpoint>" în trace-ul request-ului curent.
+
+_latency = LatencyRecorder()
+
+
+def latency_stats() -> Dict[str, dict]:
+    """{endpoint: {count, errors, total_ms, avg_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+    return _latency.snapshot()
+
+
+def _endpoint(request: httpx.Request) -> str:
+    return f"{request.method} {request.url.path}"
+
+
+def _record(request: httpx.Request, seconds: float, ok: bool) -> None:
+    _latency.record(_endpoint(request), seconds, ok=ok)
+    # "/v1/chat/completions" -> "openai.chat.completions"
+    path = request.url.path.strip("/")
+    record_span("openai." + (path[3:] if path.startswith("v1/") else path).replace("/", "."), seconds, ok)
+
+
+class _TimedTransport(httpx.HTTPTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            _record(request, time.perf_counter() - t0, ok=False)
+            raise
+        _record(request, time.perf_counter() - t0, ok=response.status_code < 400)
+        return response
+
+
+class _TimedAsyncTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            _record(request, time.perf_counter() - t0, ok=False)
+            raise
+        _record(request, time.perf_counter() - t0, ok=response.status_code < 400)
+        return response
+
+
+# ---------------- clienți ----------------
+
+_lock = threading.Lock()
+_sync: Optional[tuple[str, OpenAI]] = None                         # (cheie, client)
+_async_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+_closing: set[asyncio.Task] = set()                               # închideri de pool-uri înlocuite
+
+
+def _base_sync_client() -> OpenAI:
+    global _sync
+    key = _api_key()
+    replaced = None
+    with _lock:
+        if _sync is None or _sync[0] != key:
+            http_client = httpx.Client(
+                timeout=_timeout(DEFAULT_POLICY[0]),
+                transport=_TimedTransport(limits=_limits()),
+            )
+            replaced = _sync
+            _sync = (key, OpenAI(api_key=key, http_client=http_client, max_retries=DEFAULT_POLICY[1]))
+        client = _sync[1]
+    if replaced is not None:
+        # cheia s-a schimbat: pool-ul vechi nu mai e folosit de nimeni nou
+        replaced[1].close()
+    return client
+
+
+def _base_async_client() -> AsyncOpenAI:
+    key = _api_key()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # fără loop nu avem pool-ul cui să-l legăm; un client ad-hoc n-ar avea nici
+        # timeout-uri, nici statistici de latență și n-ar fi închis de nimeni
+        raise RuntimeError(
+            "get_async_openai_client() needs a running event loop; use get_openai_client() outside asyncio"
+        ) from None
+    replaced = None
+    with _lock:
+        entry = _async_by_loop.get(loop)
+        if entry is None or entry[0] != key:
+            http_client = httpx.AsyncClient(
+                timeout=_timeout(DEFAULT_POLICY[0]),
+                transport=_TimedAsyncTransport(limits=_limits()),
+            )
+            replaced = entry
+            entry = (key, AsyncOpenAI(api_key=key, http_client=http_client, max_retries=DEFAULT_POLICY[1]))
+            _async_by_loop[loop] = entry
+    if replaced is not None:
+        # cheia s-a schimbat: închidem pool-ul vechi al loop-ului (request-urile deja
+        # pornite pe el își păstrează conexiunile până termină)
+        task = loop.create_task(replaced[1].close())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    return entry[1]
+
+
+def get_openai_client(operation: Optional[str] = None) -> OpenAI:
+    """Clientul sync partajat, cu timeout-ul / retry-urile operației."""
+    read_s, retries = OPERATION_POLICIES.get(operation or "", DEFAULT_POLICY)
+    return _base_sync_client().with_options(timeout=_timeout(read_s), max_retries=retries)
+
+
+def get_async_openai_client(operation: Optional[str] = None) -> AsyncOpenAI:
+    """Clientul async al loop-ului curent, cu timeout-ul / retry-urile operației."""
+    read_s, retries = OPERATION_POLICIES.get(operation or "", DEFAULT_POLICY)
+    return _base_async_client().with_options(timeout=_timeout(read_s), max_retries=retries)
+
+
+async def warm_up_clients() -> None:
+    """Creează clienții (sync + async pentru loop-ul curent) și deschide o conexiune keep-alive."""
+    # construcția (context SSL, certifi) e CPU; clientul sync se face în thread, ca loop-ul să rămână liber
+    await asyncio.to_thread(_base_sync_client)
+    client = _base_async_client()
+    if OPENAI_PRECONNECT:
+        try:
+            await client.with_options(timeout=_timeout(5.0), max_retries=0).models.list()
+        except Exception as e:
+            # doar încălzire: cheia / rețeaua se verifică oricum la primul request real
+            print(f"[OpenAI] Preconnect failed: {e}")
+
+
+def close_clients() -> None:
+    """Închide pool-ul sync (shutdown). Clienții async se închid odată cu loop-ul lor."""
+    global _sync
+    with _lock:
+        entry, _sync = _sync, None
+    if entry is not None:
+        entry[1].close()
+
+
+async def aclose_async_client() -> None:
+    """Închide pool-ul async al loop-ului curent (shutdown-ul aplicației)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_by_loop.pop(loop, None)
+    if entry is not None:
+        await entry[1].close()
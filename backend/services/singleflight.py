@@ -0,0 +1,108 @@
+# backend/services/singleflight.py
+"""
+Single-flight: cereri identice aflate în zbor în același timp produc un singur
+apel upstream; toți cei care așteaptă primesc rezultatul (sau excepția) lui.
+
+    flight = get_singleflight("translate")
+    out = flight.do(key, lambda: call_api(...))                 # thread-uri
+    out = await flight.do_async(key, lambda: call_api_async())  # asyncio
+
+Grupurile sunt partajate în proces, iar cele două variante se văd între ele:
+un apel async poate aștepta unul pornit dintr-un thread și invers (starea e un
+concurrent.futures.Future). Apelul upstream async rulează ca task separat,
+deci anularea celui care l-a pornit nu-i lasă fără rezultat pe ceilalți.
+Nu e cache: cheia dispare imediat ce apelul se termină.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.calls = 0          # apeluri upstream efective
+        self.coalesced = 0      # cereri servite de apelul altcuiva
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """(future-ul cheii, True dacă apelantul e cel care trebuie să facă apelul)."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = self._inflight[key] = Future()
+            self.calls += 1
+            return fut, True
+
+    def _settle(self, key: Hashable, fut: Future, result=None, error: BaseException = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._inflight
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        fut, leader = self._join(key)
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._settle(key, fut, error=e)
+            raise
+        self._settle(key, fut, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        fut, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(fn())
+
+            def _done(t: asyncio.Future) -> None:
+                if t.cancelled():
+                    self._settle(key, fut, error=asyncio.CancelledError())
+                elif t.exception() is not None:
+                    self._settle(key, fut, error=t.exception())
+                else:
+                    self._settle(key, fut, t.result())
+
+            task.add_done_callback(_done)
+        # shield: anularea unui apelant nu anulează future-ul comun
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Grupul partajat cu numele dat (translate, embeddings, tts, moderation)."""
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.setdefault(name, SingleFlight(name))
+    return group
+
+
+def singleflight_stats() -> Dict[str, dict]:
+    """{grup: {calls, coalesced, in_flight}} pentru /api/metrics."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: g.stats() for name, g in groups.items()}
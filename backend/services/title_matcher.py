@@ -0,0 +1,214 @@
+# backend/services/title_matcher.py
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from difflib import get_close_matches
+from math import ceil, floor
+from typing import Iterator, Optional
+
+from backend.services.book_catalog import CatalogSnapshot, get_catalog, normalize_title
+
+# praguri păstrate identice cu vechiul _resolve_in_single_text
+FUZZY_CUTOFF = 0.82
+
+# câte chei verificăm cu difflib când fereastra de lungime e prea mare;
+# sub acest număr verificăm toată fereastra (rezultat identic cu scanarea completă)
+MAX_FUZZY_CANDIDATES = 64
+
+
+def _is_word_char(ch: str) -> bool:
+    # echivalentul lui \w din `re` (unicode)
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """
+    Automat multi-pattern: o singură trecere prin text găsește toate aparițiile
+    tuturor pattern-urilor. Indexul pattern-ului e folosit ca prioritate.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.lengths = [len(p) for p in patterns]
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for pid, pat in enumerate(patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (pid,)
+
+        # BFS pentru fail links; output-urile se moștenesc de pe lanțul de fail
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Produce (start, pattern_id) pentru fiecare apariție."""
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self.lengths
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i - lengths[pid] + 1, pid
+
+
+def _trigrams(s: str) -> set[str]:
+    if len(s) < 3:
+        return {s} if s else set()
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Index pe trigrame + bucket-uri de lungime pentru get_close_matches.
+
+    ratio() <= 2*min(la, lb)/(la + lb), deci doar cheile dintr-o fereastră de
+    lungime pot trece de cutoff. Dacă fereastra e mică o verificăm complet
+    (identic cu difflib pe toată lista); altfel verificăm doar top-K chei după
+    numărul de trigrame comune.
+    """
+
+    def __init__(self, keys: list[str]) -> None:
+        self.keys = keys
+        order = sorted(range(len(keys)), key=lambda i: len(keys[i]))
+        self._by_len = [keys[i] for i in order]
+        self._lens = [len(keys[i]) for i in order]
+        self._postings: dict[str, list[int]] = {}
+        for kid, key in enumerate(keys):
+            for g in _trigrams(key):
+                self._postings.setdefault(g, []).append(kid)
+
+    def close_match(self, word: str, cutoff: float = FUZZY_CUTOFF) -> Optional[str]:
+        if not self.keys:
+            return None
+        n = len(word)
+        lo = ceil(n * cutoff / (2.0 - cutoff))
+        hi = floor(n * (2.0 - cutoff) / cutoff)
+        i, j = bisect_left(self._lens, lo), bisect_right(self._lens, hi)
+        if i >= j:
+            return None
+
+        if j - i <= MAX_FUZZY_CANDIDATES:
+            candidates = self._by_len[i:j]
+        else:
+            counts: dict[int, int] = {}
+            for g in _trigrams(word):
+                for kid in self._postings.get(g, ()):
+                    if lo <= len(self.keys[kid]) <= hi:
+                        counts[kid] = counts.get(kid, 0) + 1
+            best = sorted(counts, key=counts.__getitem__, reverse=True)[:MAX_FUZZY_CANDIDATES]
+            candidates = [self.keys[kid] for kid in best]
+
+        close = get_close_matches(word, candidates, n=1, cutoff=cutoff)
+        return close[0] if close else None
+
+
+class TitleMatcher:
+    """
+    Motor de rezolvare a titlurilor, construit o dată per versiune de catalog.
+      1) word-boundary pe titluri canonice (automat pe textul lower)
+      2) alias-uri normalizate
+      3) normalized title substrings (2+3 într-un singur automat, alias-urile au prioritate)
+      4) fuzzy pe alias-uri, apoi pe titluri (pentru typos: 'mockin bird')
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        self.version = snapshot.version
+        self.titles = list(snapshot.titles)
+        self._title_ac = AhoCorasick([t.lower() for t in self.titles])
+
+        self._alias_map = dict(snapshot.aliases)
+        alias_keys = list(self._alias_map.keys())
+        self._norm_titles = {normalize_title(t): t for t in self.titles}
+        norm_keys = list(self._norm_titles.keys())
+
+        # prioritate = index: întâi alias-urile, apoi titlurile normalizate
+        self._norm_targets = [self._alias_map[k] for k in alias_keys] + [self._norm_titles[k] for k in norm_keys]
+        self._norm_ac = AhoCorasick(alias_keys + norm_keys)
+
+        self._alias_fuzzy = FuzzyIndex(alias_keys)
+        self._title_fuzzy = FuzzyIndex(norm_keys)
+
+    def _word_boundary_matches(self, t_low: str) -> Iterator[tuple[int, int, int]]:
+        """(start, end, pid) pentru fiecare titlu canonic găsit cu word boundaries."""
+        n = len(t_low)
+        for start, pid in self._title_ac.iter_matches(t_low):
+            end = start + self._title_ac.lengths[pid]
+            # \b la început și la sfârșit, exact ca r"\b" + re.escape(title) + r"\b"
+            left_ok = _is_word_char(t_low[start]) != (start > 0 and _is_word_char(t_low[start - 1]))
+            right_ok = _is_word_char(t_low[end - 1]) != (end < n and _is_word_char(t_low[end]))
+            if left_ok and right_ok:
+                yield start, end, pid
+
+    def title_spans(self, raw_text: str) -> list[tuple[int, int]]:
+        """Intervalele [start, end) din text ocupate de titluri (pe textul lower, aceeași lungime)."""
+        return [(s, e) for s, e, _ in self._word_boundary_matches((raw_text or "").lower())]
+
+    def _word_boundary_hit(self, t_low: str) -> Optional[str]:
+        best = min((pid for _, _, pid in self._word_boundary_matches(t_low)), default=None)
+        return self.titles[best] if best is not None else None
+
+    def resolve(self, raw_text: str) -> Optional[str]:
+        if not raw_text:
+            return None
+
+        t_low = raw_text.lower()
+
+        hit = self._word_boundary_hit(t_low)
+        if hit:
+            return hit
+
+        norm_text = normalize_title(t_low)
+        best = min((pid for _, pid in self._norm_ac.iter_matches(norm_text)), default=None)
+        if best is not None:
+            return self._norm_targets[best]
+
+        close = self._alias_fuzzy.close_match(norm_text)
+        if close:
+            return self._alias_map[close]
+
+        close = self._title_fuzzy.close_match(norm_text)
+        if close:
+            return self._norm_titles[close]
+
+        return None
+
+
+_matcher: Optional[TitleMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_title_matcher() -> TitleMatcher:
+    """Matcher-ul pentru versiunea curentă a catalogului (reconstruit doar la reload)."""
+    global _matcher
+    snap = get_catalog().snapshot()
+    m = _matcher
+    if m is None or m.version != snap.version:
+        with _matcher_lock:
+            if _matcher is None or _matcher.version != snap.version:
+                _matcher = TitleMatcher(snap)
+            m = _matcher
+    return m
@@ -0,0 +1,286 @@
+# backend/services/tracing.py
+"""
+Tracing ușor, în proces, pentru pipeline-ul de chat.
+
+  - span("nume") / @traced("nume"): cronometrează o etapă (detecție, moderare,
+    traducere, titlu, embedding, interogare index, completion, ...)
+  - fiecare request HTTP spre OpenAI e un span "openai.<endpoint>" (din transportul
+    httpx, vezi services/openai_client.py)
+  - TimingMiddleware: durata per rută + lista de span-uri a request-ului curent
+    (ContextVar), trimisă înapoi ca header Server-Timing
+  - render_prometheus(): percentile p50/p95/p99 + count/sum în format text Prometheus
+
+TRACING_ENABLED=0 le transformă în no-op (un test de flag + nullcontext).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+LATENCY_SAMPLES = int(os.getenv("TRACING_SAMPLES", "1024"))   # ultimele N durate per cheie (pentru percentile)
+QUANTILES = (0.50, 0.95, 0.99)
+
+
+# ---------------- statistici de latență ----------------
+
+class _Stats:
+    __slots__ = ("count", "errors", "total_s", "max_s", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+
+def _percentile(sorted_samples: list, q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[idx]
+
+
+class LatencyRecorder:
+    """
+    Durate per cheie (rută, etapă, endpoint OpenAI). Count / sum / max sunt
+    cumulative; percentilele se calculează pe ultimele LATENCY_SAMPLES valori.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _Stats] = {}
+
+    def record(self, key: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = _Stats()
+            st.count += 1
+            if not ok:
+                st.errors += 1
+            st.total_s += seconds
+            st.max_s = max(st.max_s, seconds)
+            st.samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            items = [(k, st.count, st.errors, st.total_s, st.max_s, sorted(st.samples)) for k, st in self._stats.items()]
+        out: Dict[str, dict] = {}
+        for key, n, errors, total, mx, samples in items:
+            out[key] = {
+                "count": n,
+                "errors": errors,
+                "total_ms": 1000.0 * total,
+                "avg_ms": 1000.0 * total / n if n else 0.0,
+                "p50_ms": 1000.0 * _percentile(samples, 0.50),
+                "p95_ms": 1000.0 * _percentile(samples, 0.95),
+                "p99_ms": 1000.0 * _percentile(samples, 0.99),
+                "max_ms": 1000.0 * mx,
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_spans = LatencyRecorder()      # etapă -> durate
+_routes = LatencyRecorder()     # "METODĂ /rută" -> durate
+
+# span-urile request-ului curent: [(nume, secunde)]; None în afara unui request
+_trace: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("llmhw_trace", default=None)
+
+
+def span_stats() -> Dict[str, dict]:
+    return _spans.snapshot()
+
+
+def route_stats() -> Dict[str, dict]:
+    return _routes.snapshot()
+
+
+# ---------------- span-uri ----------------
+
+def record_span(name: str, seconds: float, ok: bool = True) -> None:
+    """Înregistrează o durată deja măsurată (ex. din transportul httpx)."""
+    if not TRACING_ENABLED:
+        return
+    _spans.record(name, seconds, ok)
+    trace = _trace.get()
+    if trace is not None:
+        trace.append((name, seconds))
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        record_span(self.name, time.perf_counter() - self.t0, ok=exc_type is None)
+        return False
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def span(name: str):
+    """with span("translate"): ...  — no-op când tracing-ul e dezactivat."""
+    return _Span(name) if TRACING_ENABLED else _NOOP
+
+
+def traced(name: str) -> Callable:
+    """Decorator: tot apelul funcției (sync sau async) devine un span."""
+    def deco(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not TRACING_ENABLED:
+                    return await fn(*args, **kwargs)
+                with _Span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not TRACING_ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ---------------- Server-Timing + middleware ----------------
+
+def server_timing(trace: Iterable[Tuple[str, float]], total_s: Optional[float] = None) -> str:
+    """
+    Valoarea header-ului Server-Timing: span-urile cu același nume sunt adunate
+    (ex. mai multe traduceri), în ordinea primei apariții.
+    """
+    agg: Dict[str, list] = {}
+    for name, seconds in trace:
+        entry = agg.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = []
+    for name, (seconds, n) in agg.items():
+        part = f"{name};dur={seconds * 1000.0:.1f}"
+        parts.append(part if n == 1 else f'{part};desc="x{n}"')
+    if total_s is not None:
+        parts.append(f"total;dur={total_s * 1000.0:.1f}")
+    return ", ".join(parts)
+
+
+def _route_label(scope: dict) -> str:
+    # șablonul rutei (ex. /api/image/jobs/{job_id}), ca să nu explodeze cardinalitatea
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    # fără rută potrivită (404, static montat): o singură etichetă, indiferent de cale
+    return path or "unmatched"
+
+
+class TimingMiddleware:
+    """
+    Middleware ASGI: durata fiecărui request per (metodă, rută) și header-ul
+    Server-Timing pe răspunsurile care au span-uri înainte de trimiterea header-elor
+    (la /api/chat: toate etapele; la răspunsurile streaming: doar ce a rulat până la primul byte).
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        t0 = time.perf_counter()
+        trace: List[Tuple[str, float]] = []
+        token = _trace.set(trace)
+        status = 500
+
+        async def _send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace:
+                    value = server_timing(trace, time.perf_counter() - t0)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", value.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _trace.reset(token)
+            _routes.record(f"{scope['method']} {_route_label(scope)}", time.perf_counter() - t0, ok=status < 500)
+
+
+# ---------------- Prometheus ----------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+
+
+def render_summary(metric: str, help_text: str, stats: Dict[str, dict], label_fn: Callable[[str], Dict[str, str]]) -> List[str]:
+    """Un summary Prometheus (secunde) din snapshot-ul unui LatencyRecorder."""
+    lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+    for key in sorted(stats):
+        st = stats[key]
+        labels = label_fn(key)
+        for q in QUANTILES:
+            ms = st.get(f"p{int(q * 100)}_ms", 0.0)
+            lines.append(f"{metric}{{{_labels(**labels, quantile=str(q))}}} {ms / 1000.0:.6f}")
+        base = _labels(**labels)
+        lines.append(f"{metric}_sum{{{base}}} {st.get('total_ms', st['avg_ms'] * st['count']) / 1000.0:.6f}")
+        lines.append(f"{metric}_count{{{base}}} {st['count']}")
+    errors = f"{metric.removesuffix('_duration_seconds')}_errors_total"
+    lines += [f"# HELP {errors} Failed calls counted in {metric}", f"# TYPE {errors} counter"]
+    for key in sorted(stats):
+        lines.append(f"{errors}{{{_labels(**label_fn(key))}}} {stats[key]['errors']}")
+    return lines
+
+
+def render_gauges(metric: str, help_text: str, values: Dict[str, Dict[str, float]], label: str) -> List[str]:
+    """{nume: {stat: valoare}} -> metric{<label>="nume",stat="..."} valoare"""
+    lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+    for name in sorted(values):
+        for stat, value in sorted(values[name].items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f"{metric}{{{_labels(**{label: name, 'stat': stat})}}} {value}")
+    return lines
+
+
+def _split_route(key: str) -> Dict[str, str]:
+    method, _, route = key.partition(" ")
+    return {"method": method, "route": route}
+
+
+def render_prometheus(extra: Iterable[str] = ()) -> str:
+    lines = render_summary(
+        "llmhw_http_request_duration_seconds", "HTTP request duration per route", route_stats(), _split_route
+    )
+    lines += render_summary(
+        "llmhw_span_duration_seconds", "Pipeline stage duration", span_stats(), lambda k: {"span": k}
+    )
+    lines += list(extra)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,56 @@
+# backend/services/transcription_cache.py
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional
+
+from backend.services.cache import TwoTierCache
+
+TRANSCRIPTION_CACHE_PATH = os.getenv("TRANSCRIPTION_CACHE_PATH", "backend/cache/transcriptions.sqlite3")
+TRANSCRIPTION_CACHE_MEMORY_SIZE = int(os.getenv("TRANSCRIPTION_CACHE_MEMORY_SIZE", "512"))
+TRANSCRIPTION_CACHE_DISK_MAX_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_DISK_MAX_ENTRIES", "10000"))
+TRANSCRIPTION_CACHE_TTL_S = float(os.getenv("TRANSCRIPTION_CACHE_TTL_S", str(7 * 24 * 3600)))
+
+
+def cache_key(audio_sha256: str, language_hint: Optional[str]) -> str:
+    return f"{(language_hint or 'auto').lower()}:{audio_sha256}"
+
+
+class TranscriptionCache:
+    """
+    Cache pentru transcrieri, cheie = (hint de limbă, sha256(bytes audio)).
+    Același upload (re-trimis din browser, retry) nu mai ajunge la Whisper.
+    LRU cu TTL în memorie + tier SQLite opțional (TRANSCRIPTION_CACHE_PATH gol îl dezactivează).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = TRANSCRIPTION_CACHE_PATH,
+        memory_size: int = TRANSCRIPTION_CACHE_MEMORY_SIZE,
+        disk_max_entries: int = TRANSCRIPTION_CACHE_DISK_MAX_ENTRIES,
+        ttl_s: Optional[float] = TRANSCRIPTION_CACHE_TTL_S,
+    ) -> None:
+        self._store = TwoTierCache(path, "transcriptions", memory_size, disk_max_entries, ttl_s, label="Transcription Cache")
+
+    def get(self, audio_sha256: str, language_hint: Optional[str] = None) -> Optional[str]:
+        return self._store.get(cache_key(audio_sha256, language_hint))
+
+    def put(self, audio_sha256: str, language_hint: Optional[str], text: str) -> None:
+        self._store.set(cache_key(audio_sha256, language_hint), text)
+
+    def stats(self) -> dict[str, int]:
+        return self._store.stats()
+
+
+_cache: Optional[TranscriptionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranscriptionCache()
+    return _cache
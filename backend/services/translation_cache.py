@@ -0,0 +1,58 @@
+# backend/services/translation_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from backend.services.cache import TwoTierCache
+
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "backend/cache/translations.sqlite3")
+TRANSLATION_CACHE_MEMORY_SIZE = int(os.getenv("TRANSLATION_CACHE_MEMORY_SIZE", "2048"))
+TRANSLATION_CACHE_DISK_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_DISK_MAX_ENTRIES", "50000"))
+TRANSLATION_CACHE_TTL_S = float(os.getenv("TRANSLATION_CACHE_TTL_S", str(7 * 24 * 3600)))
+
+
+def cache_key(source_lang: str, target_lang: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{source_lang.lower()}:{target_lang.lower()}:{digest}"
+
+
+class TranslationCache:
+    """
+    Cache pentru traduceri, cheie = (source_lang, target_lang, hash(text)).
+    LRU cu TTL în memorie + tier SQLite opțional (TRANSLATION_CACHE_PATH gol îl dezactivează).
+    Cachem doar traducerile reușite; la eroare translate() întoarce textul original.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = TRANSLATION_CACHE_PATH,
+        memory_size: int = TRANSLATION_CACHE_MEMORY_SIZE,
+        disk_max_entries: int = TRANSLATION_CACHE_DISK_MAX_ENTRIES,
+        ttl_s: Optional[float] = TRANSLATION_CACHE_TTL_S,
+    ) -> None:
+        self._store = TwoTierCache(path, "translations", memory_size, disk_max_entries, ttl_s, label="Translation Cache")
+
+    def get(self, source_lang: str, target_lang: str, text: str) -> Optional[str]:
+        return self._store.get(cache_key(source_lang, target_lang, text))
+
+    def put(self, source_lang: str, target_lang: str, text: str, translated: str) -> None:
+        self._store.set(cache_key(source_lang, target_lang, text), translated)
+
+    def stats(self) -> dict[str, int]:
+        return self._store.stats()
+
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache()
+    return _cache
@@ -0,0 +1,271 @@
+# backend/services/tts_cache.py
+"""
+Cache de fișiere audio TTS, adresat după conținut: numele fișierului este
+hash(lang, text), deci același rezumat în aceeași limbă e sintetizat o singură dată.
+
+  - index în memorie (cheie -> mărime, creat, ultimul acces), reconstruit la pornire
+    din directorul de audio; ultimul acces e persistat prin mtime (os.utime la hit)
+  - cereri concurente pentru aceeași cheie așteaptă aceeași sinteză (o singură dată gTTS;
+    grupul single-flight "tts", vezi services/singleflight.py)
+  - evicție după vârstă (TTS_CACHE_MAX_AGE_S) și mărime totală (TTS_CACHE_MAX_BYTES),
+    cele mai vechi accesate primele; gestionăm doar fișierele tts-*.mp3 (ignorate de
+    git), restul directorului (ex. fișierele uuid4().mp3 din repo) nu e atins
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from backend.services.singleflight import get_singleflight
+
+AUDIO_DIR = "backend/static/audio"
+AUDIO_URL_PREFIX = "/static/audio"      # main.py montează /static -> backend/static
+
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+TTS_CACHE_MAX_AGE_S = float(os.getenv("TTS_CACHE_MAX_AGE_S", str(30 * 24 * 3600)))
+TTS_CACHE_EVICT_INTERVAL_S = float(os.getenv("TTS_CACHE_EVICT_INTERVAL_S", "600"))
+# câte rezumate din catalog sintetizăm la pornire (0 = dezactivat)
+TTS_PREWARM_TOP_N = int(os.getenv("TTS_PREWARM_TOP_N", "10"))
+
+FILE_PREFIX = "tts-"
+
+Synthesizer = Callable[[str, str, str], None]    # (text, lang, out_path)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(text: str, lang: str) -> str:
+    digest = hashlib.sha256(f"{(lang or 'en').lower()}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+    return digest[:40]
+
+
+def gtts_synthesize(text: str, lang: str, out_path: str) -> None:
+    from gtts import gTTS
+    gTTS(text=text, lang=lang).save(out_path)
+
+
+@dataclass
+class _Entry:
+    size: int
+    created_at: float
+    last_access: float
+
+
+class TTSCache:
+    def __init__(
+        self,
+        directory: str = AUDIO_DIR,
+        url_prefix: str = AUDIO_URL_PREFIX,
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+        max_age_s: float = TTS_CACHE_MAX_AGE_S,
+        synthesize: Synthesizer = gtts_synthesize,
+    ) -> None:
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.synthesize = synthesize
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, _Entry] = OrderedDict()   # ordonat după ultimul acces
+        self._total_bytes = 0
+        self._flight = get_singleflight("tts")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    # ---------------- index ----------------
+
+    def _scan(self) -> None:
+        found = []
+        for path in self.directory.glob(f"{FILE_PREFIX}*.mp3"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime, path.stem, st.st_size, st.st_ctime))
+        with self._lock:
+            self._index.clear()
+            self._total_bytes = 0
+            for mtime, stem, size, ctime in sorted(found):
+                self._index[stem] = _Entry(size=size, created_at=min(ctime, mtime), last_access=mtime)
+                self._total_bytes += size
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.mp3"
+
+    def url_for(self, name: str) -> str:
+        return f"{self.url_prefix}/{name}.mp3"
+
+    def _touch(self, name: str) -> bool:
+        """Hit: actualizează indexul și mtime-ul fișierului. False dacă fișierul a dispărut."""
+        path = self._path(name)
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            with self._lock:
+                entry = self._index.pop(name, None)
+                if entry is not None:
+                    self._total_bytes -= entry.size
+            return False
+        with self._lock:
+            entry = self._index.get(name)
+            if entry is None:
+                size = path.stat().st_size
+                entry = self._index[name] = _Entry(size=size, created_at=now, last_access=now)
+                self._total_bytes += size
+            entry.last_access = now
+            self._index.move_to_end(name)
+        return True
+
+    def _add(self, name: str) -> None:
+        size = self._path(name).stat().st_size
+        now = time.time()
+        with self._lock:
+            old = self._index.pop(name, None)
+            if old is not None:
+                self._total_bytes -= old.size
+            self._index[name] = _Entry(size=size, created_at=now, last_access=now)
+            self._total_bytes += size
+
+    # ---------------- API ----------------
+
+    def lookup(self, text: str, lang: str) -> Optional[str]:
+        """Path-ul fișierului din cache sau None (fără sinteză)."""
+        name = FILE_PREFIX + cache_key(text, lang)
+        with self._lock:
+            known = name in self._index
+        if known and self._touch(name):
+            return str(self._path(name))
+        return None
+
+    def get_or_create(self, text: str, lang: str = "en") -> str:
+        """
+        Path-ul fișierului mp3 pentru (text, lang); sintetizează doar la miss.
+        Cererile concurente pentru aceeași cheie așteaptă prima sinteză.
+        """
+        name = FILE_PREFIX + cache_key(text, lang)
+        with self._lock:
+            known = name in self._index
+        if known and self._touch(name):
+            with self._lock:
+                self.hits += 1
+            return str(self._path(name))
+
+        path = self._flight.do(self._flight_key(name), lambda: self._create(name, text, lang))
+        self.evict()
+        return path
+
+    def _flight_key(self, name: str) -> str:
+        # grupul "tts" e partajat: cheia include directorul, ca două cache-uri să nu se amestece
+        return f"{self.directory}/{name}"
+
+    def _create(self, name: str, text: str, lang: str) -> str:
+        with self._lock:
+            self.misses += 1
+        path = self._path(name)
+        tmp = path.with_name(f"{path.stem}.{threading.get_ident()}.part")
+        try:
+            self.synthesize(text, lang, str(tmp))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        self._add(name)
+        return str(path)
+
+    def url(self, text: str, lang: str = "en") -> str:
+        return self.url_for(Path(self.get_or_create(text, lang)).stem)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Șterge intrările expirate, apoi cele mai vechi accesate până sub max_bytes."""
+        now = time.time() if now is None else now
+        victims = []
+        with self._lock:
+            for name, entry in list(self._index.items()):
+                expired = self.max_age_s > 0 and now - entry.last_access > self.max_age_s
+                over = self.max_bytes > 0 and self._total_bytes > self.max_bytes
+                if not (expired or over):
+                    # indexul e ordonat după ultimul acces: restul sunt mai noi
+                    break
+                if self._flight.in_flight(self._flight_key(name)):
+                    continue
+                del self._index[name]
+                self._total_bytes -= entry.size
+                victims.append(name)
+            self.evictions += len(victims)
+        for name in victims:
+            try:
+                self._path(name).unlink()
+            except OSError:
+                pass
+        return len(victims)
+
+    def entries(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                name: {"size": e.size, "created_at": e.created_at, "last_access": e.last_access}
+                for name, e in self._index.items()
+            }
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self._flight.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+            }
+
+
+# ---------------- singleton + joburi de fundal ----------------
+
+_caches: Dict[str, TTSCache] = {}
+_caches_lock = threading.Lock()
+_evict_thread: Optional[threading.Thread] = None
+
+
+def get_tts_cache(directory: str = AUDIO_DIR) -> TTSCache:
+    key = os.path.normpath(directory)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = TTSCache(directory)
+    return cache
+
+
+def start_eviction_job(interval_s: float = TTS_CACHE_EVICT_INTERVAL_S) -> None:
+    """Thread daemon care rulează evict() periodic pe toate cache-urile."""
+    global _evict_thread
+    if _evict_thread is not None or interval_s <= 0:
+        return
+
+    def _run() -> None:
+        while True:
+            for cache in list(_caches.values()):
+                try:
+                    cache.evict()
+                except Exception as e:
+                    print(f"[TTS Cache] Eviction error: {e}")
+            time.sleep(interval_s)
+
+    _evict_thread = threading.Thread(target=_run, name="tts-cache-evict", daemon=True)
+    _evict_thread.start()
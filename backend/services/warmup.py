@@ -0,0 +1,83 @@
+# backend/services/warmup.py
+"""
+Încălzirea componentelor lente, rulată de lifespan-ul API-ului în paralel
+(thread-uri pentru pașii sincroni, direct pe loop pentru pool-ul async):
+
+  vector_index   colecția Chroma + segmentul HNSW și/sau indexul BM25, după
+                 RETRIEVAL_MODE, plus modelul local de embeddings dacă e selectat
+                 (get_retriever().warmup())
+  catalog        catalogul de cărți + TitleMatcher (Aho-Corasick, trigrame)
+  langdetect     profilurile de limbă
+  openai_pool    clienții OpenAI + o conexiune keep-alive (vezi OPENAI_PRECONNECT)
+
+/api/health raportează ready abia după ce toți pașii s-au terminat (cu succes sau nu;
+erorile apar în detalii, iar componenta respectivă se inițializează la primul request).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+
+from backend.services.language_detection import warm_up as warm_up_langdetect
+from backend.services.openai_client import warm_up_clients
+from backend.services.title_matcher import get_title_matcher
+
+
+def _warm_vector_index() -> None:
+    from backend.vector_store.retriever import get_retriever
+    get_retriever().warmup()
+
+
+def _warm_catalog() -> None:
+    get_title_matcher().resolve("warm up the title matcher")
+
+
+# nume -> pas sincron (rulat în thread)
+SYNC_STEPS: Dict[str, Callable[[], None]] = {
+    "vector_index": _warm_vector_index,
+    "catalog": _warm_catalog,
+    "langdetect": warm_up_langdetect,
+}
+# nume -> corutină (rulată pe loop-ul aplicației: pool-ul async e per loop)
+ASYNC_STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "openai_pool": warm_up_clients,
+}
+
+
+@dataclass
+class WarmupState:
+    ready: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    total_ms: Optional[float] = None
+    steps_ms: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "total_ms": self.total_ms,
+            "steps_ms": dict(self.steps_ms),
+            "errors": dict(self.errors),
+        }
+
+
+async def run_warmup(state: WarmupState) -> WarmupState:
+    async def _timed(name: str, awaitable: Awaitable[None]) -> None:
+        t0 = time.perf_counter()
+        try:
+            await awaitable
+        except Exception as e:
+            state.errors[name] = str(e)
+            print(f"[Warmup] {name} failed: {e}")
+        state.steps_ms[name] = (time.perf_counter() - t0) * 1000.0
+
+    await asyncio.gather(
+        *(_timed(name, asyncio.to_thread(fn)) for name, fn in SYNC_STEPS.items()),
+        *(_timed(name, fn()) for name, fn in ASYNC_STEPS.items()),
+    )
+    state.total_ms = (time.monotonic() - state.started_at) * 1000.0
+    state.ready = True
+    print(f"[Warmup] ready in {state.total_ms:.0f} ms: " + ", ".join(f"{k}={v:.0f}ms" for k, v in state.steps_ms.items()))
+    return state
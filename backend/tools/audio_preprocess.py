@@ -0,0 +1,163 @@
+# backend/tools/audio_preprocess.py
+"""
+Pre-procesare pentru audio încărcat (/api/voice/transcribe), înainte de Whisper:
+
+  decode -> mono -> 16 kHz -> trim liniște (dBFS pe ferestre, o singură trecere
+  vectorizată) -> WAV PCM16 compact
+
+Aceleași garduri ca la captura live din stt_tool (capture_and_transcribe_vad):
+clipurile fără vorbire sunt respinse local, fără apel la API.
+Preprocesăm doar WAV (scipy) și, dacă soundfile e instalat, ogg/flac. Restul
+(webm/opus din MediaRecorder, mp3, m4a) și fișierele corupte trec neschimbate:
+Whisper le decodează oricum, doar fără trim-ul local.
+"""
+from __future__ import annotations
+
+import io
+import math
+import wave
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+TARGET_SR = 16000
+FRAME_S = 0.02           # fereastră RMS
+HOP_S = 0.01
+SILENCE_DBFS = -40.0     # același prag ca la captura live
+MIN_SPEECH_S = 0.5       # sub atât: YOU_SAID_NOTHING
+MIN_AVG_DBFS = -45.0
+PAD_S = 0.2              # păstrăm puțin context în jurul vorbirii
+
+
+@dataclass
+class PreparedAudio:
+    audio: BinaryIO              # ce trimitem la Whisper (poziția 0)
+    filename: str
+    silent: bool                 # True = nu trimitem nimic, răspunsul e "nimic"
+    duration_s: Optional[float]  # durata după trim (None dacă n-am decodat)
+    original_bytes: int
+    bytes: int
+    reason: str = ""
+
+
+# ---------------- decode ----------------
+
+def _to_float(data: np.ndarray) -> np.ndarray:
+    if data.dtype == np.uint8:
+        return (data.astype(np.float32) - 128.0) / 128.0
+    if np.issubdtype(data.dtype, np.integer):
+        return data.astype(np.float32) / float(np.iinfo(data.dtype).max)
+    return data.astype(np.float32, copy=False)
+
+
+def decode_audio(source: BinaryIO, filename: str = "") -> Optional[tuple[np.ndarray, int]]:
+    """
+    (samples float32 [n] sau [n, canale], sample_rate) sau None dacă formatul nu e suportat.
+    Citește direct din fișier (ex. SpooledTemporaryFile-ul upload-ului), de la poziția 0.
+    """
+    header = source.read(12)
+    source.seek(0)
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        from scipy.io import wavfile
+        try:
+            sr, data = wavfile.read(source)
+        except Exception as e:
+            # header RIFF dar conținut stricat / codec necunoscut: lăsăm Whisper să decidă
+            print(f"[Voice] WAV decode failed ({e.__class__.__name__}: {e}); sending upload as-is.")
+            return None
+        return _to_float(np.asarray(data)), int(sr)
+    try:
+        import soundfile  # opțional: ogg/flac
+    except ImportError:
+        return None
+    try:
+        data, sr = soundfile.read(source, dtype="float32", always_2d=False)
+    except Exception:
+        return None
+    return np.asarray(data, dtype=np.float32), int(sr)
+
+
+# ---------------- procesare ----------------
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    return samples.mean(axis=1, dtype=np.float32) if samples.ndim == 2 else samples
+
+
+def resample(samples: np.ndarray, sr: int, target_sr: int = TARGET_SR) -> np.ndarray:
+    if sr == target_sr or samples.size == 0:
+        return samples
+    from scipy.signal import resample_poly
+    g = math.gcd(sr, target_sr)
+    return resample_poly(samples, target_sr // g, sr // g).astype(np.float32, copy=False)
+
+
+def frame_dbfs(samples: np.ndarray, sr: int = TARGET_SR, frame_s: float = FRAME_S, hop_s: float = HOP_S) -> np.ndarray:
+    """dBFS pe ferestre suprapuse, calculat într-o singură trecere (view cu stride, fără copii)."""
+    frame = max(1, int(sr * frame_s))
+    hop = max(1, int(sr * hop_s))
+    if samples.size < frame:
+        samples = np.pad(samples, (0, frame - samples.size))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame)[::hop]
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+
+def trim_silence(samples: np.ndarray, sr: int = TARGET_SR, silence_dbfs: float = SILENCE_DBFS, pad_s: float = PAD_S) -> np.ndarray:
+    """Taie liniștea de la început și sfârșit; array gol dacă nu există vorbire."""
+    db = frame_dbfs(samples, sr)
+    voiced = np.flatnonzero(db >= silence_dbfs)
+    if voiced.size == 0:
+        return samples[:0]
+    hop = max(1, int(sr * HOP_S))
+    frame = max(1, int(sr * FRAME_S))
+    pad = int(sr * pad_s)
+    start = max(0, voiced[0] * hop - pad)
+    end = min(samples.size, voiced[-1] * hop + frame + pad)
+    return samples[start:end]
+
+
+def _rms_dbfs(samples: np.ndarray) -> float:
+    if samples.size == 0:
+        return -120.0
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    return -120.0 if rms <= 1e-10 else 20.0 * math.log10(rms)
+
+
+def encode_wav(samples: np.ndarray, sr: int = TARGET_SR) -> io.BytesIO:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+    out.seek(0)
+    return out
+
+
+def preprocess_upload(source: BinaryIO, filename: str = "audio.wav", size: int = 0) -> PreparedAudio:
+    """
+    Pregătește un upload pentru Whisper (`source` la poziția 0, `size` = mărimea lui).
+    Dacă formatul nu poate fi decodat, întoarce chiar `source`, repus la 0
+    (silent=False); dacă nu există vorbire, silent=True.
+    """
+    decoded = decode_audio(source, filename)
+    if decoded is None:
+        source.seek(0)
+        return PreparedAudio(source, filename, False, None, size, size, "passthrough")
+
+    samples, sr = decoded
+    mono = resample(to_mono(samples), sr)
+    speech = trim_silence(mono)
+    duration = speech.size / TARGET_SR
+
+    # garduri împotriva „phantom speech” (ca în capture_and_transcribe_vad)
+    if speech.size < TARGET_SR * MIN_SPEECH_S:
+        return PreparedAudio(io.BytesIO(), filename, True, duration, size, 0, "no speech")
+    avg_db = _rms_dbfs(speech)
+    if avg_db < MIN_AVG_DBFS:
+        return PreparedAudio(io.BytesIO(), filename, True, duration, size, 0, f"very low level ({avg_db:.1f} dBFS)")
+
+    wav = encode_wav(speech)
+    return PreparedAudio(wav, "audio.wav", False, duration, size, wav.getbuffer().nbytes, "trimmed")
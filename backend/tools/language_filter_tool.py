@@ -1,17 +1,19 @@
 # backend/tools/language_filter_tool.py
 from __future__ import annotations
-import os
 import re
-from typing import Iterable
-from openai import OpenAI
+from typing import Optional
+from openai import AsyncOpenAI, OpenAI
+
+from backend.services.moderation import ModerationEngine
+from backend.services.openai_client import get_async_openai_client, get_openai_client
 
 # --- Helpers ---
 
 def _get_client() -> OpenAI:
-    key = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
-    if not key:
-        raise RuntimeError("OPENAI_API_KEY missing. Set it in .env or environment.")
-    return OpenAI(api_key=key)
+    return get_openai_client("moderations")
+
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_openai_client("moderations")
 
 # set minim, extensibil ușor; păstrăm lower-case
 _BAD_WORDS_RO: tuple[str, ...] = (
@@ -25,17 +27,29 @@ _BAD_WORDS_EN: tuple[str, ...] = (
     "asshole", "bastard", "loser", "dickhead",
 )
 
-# le combinăm într-o singură expresie cu word boundaries
-_BAD_PATTERNS: list[re.Pattern] = [
-    re.compile(rf"\b{re.escape(w)}\b", re.IGNORECASE) for w in (*_BAD_WORDS_RO, *_BAD_WORDS_EN)
-]
+# toate cuvintele într-o singură expresie cu word boundaries (o trecere prin text)
+_engine = ModerationEngine(lexicon=(*_BAD_WORDS_RO, *_BAD_WORDS_EN))
 
 def _contains_blacklist(t: str) -> bool:
-    t = (t or "").lower()
-    for pat in _BAD_PATTERNS:
-        if pat.search(t):
-            return True
-    return False
+    return _engine.contains_lexicon(t)
+
+def _remote_flagged(t: str) -> bool:
+    client = _get_client()
+    resp = client.moderations.create(
+        model="omni-moderation-latest",
+        input=t,
+    )
+    result = resp.results[0]
+    return bool(getattr(result, "flagged", False))
+
+async def _remote_flagged_async(t: str) -> bool:
+    client = _get_async_client()
+    resp = await client.moderations.create(
+        model="omni-moderation-latest",
+        input=t,
+    )
+    result = resp.results[0]
+    return bool(getattr(result, "flagged", False))
 
 # --- Public API ---
 
@@ -43,27 +57,28 @@ def is_offensive(text: str) -> bool:
     """
     Returnează True dacă mesajul e ofensator.
     1) Heuristic lexical (rapid, fără API) -> dacă match, întoarce True
-    2) Moderation API (fallback/extra) -> dacă 'flagged', întoarce True
+    2) Verdict din cache / întrebare evident benignă despre cărți -> fără API
+    3) Moderation API -> dacă 'flagged', întoarce True
     În caz de eroare, fail-open (False) dar loghează.
     """
-    t = (text or "").strip()
-    if not t:
-        return False
-
-    # 1) blacklist rapid
-    if _contains_blacklist(t):
-        return True
-
-    # 2) Moderation API (dacă cheia e validă)
-    try:
-        client = _get_client()
-        resp = client.moderations.create(
-            model="omni-moderation-latest",
-            input=t,
-        )
-        result = resp.results[0]
-        flagged = bool(getattr(result, "flagged", False))
-        return flagged
-    except Exception as e:
-        print(f"[Offensive Filter Error] {e}")
-        return False
+    return _engine.check(text, _remote_flagged)
+
+async def is_offensive_async(text: str) -> bool:
+    """
+    Ca is_offensive(), dar apelul la Moderation API e non-blocant, ca să poată
+    rula în paralel cu traducerea. Treptele locale se rezolvă înainte de primul
+    await, deci un match lexical se rezolvă imediat.
+    """
+    return await _engine.check_async(text, _remote_flagged_async)
+
+def precheck_offensive(text: str) -> Optional[bool]:
+    """Verdictul fără rețea (True/False) sau None dacă trebuie întrebat Moderation API."""
+    return _engine.precheck(text)
+
+def is_offensive_remote(text: str) -> bool:
+    """Doar Moderation API (pentru când precheck_offensive a întors None)."""
+    return _engine.check_remote(text, _remote_flagged)
+
+def moderation_stats() -> dict[str, float]:
+    """Contoare: checks, lexicon_hits, local_pass, cache_hits, api_calls, api_avoided, ..."""
+    return _engine.stats()
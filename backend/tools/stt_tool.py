@@ -1,14 +1,16 @@
 import os
 import math
-import queue
+import threading
 import tempfile
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import numpy as np
-import sounddevice as sd
-from scipy.io.wavfile import write as wav_write
 # ...existing code...
-from openai import OpenAI
+# sounddevice (PortAudio) și scipy sunt încărcate doar de funcțiile de captură din CLI:
+# serverul importă modulul pentru transcriere și rulează și pe host-uri fără placă de sunet
+from openai import AsyncOpenAI, OpenAI
+
+from backend.services.openai_client import get_async_openai_client, get_openai_client
 # .env este încărcat o singură dată în main.py
 
 DEFAULT_SR = 16000
@@ -16,12 +18,10 @@ BLOCK_SIZE = 1024
 DTYPE = "float32"
 
 def _get_client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if api_key:
-        api_key = api_key.strip()
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY missing. Set it in .env or environment.")
-    return OpenAI(api_key=api_key)
+    return get_openai_client("audio")
+
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_openai_client("audio")
 
 def _rms_dbfs(frame: np.ndarray) -> float:
     if frame.size == 0:
@@ -31,6 +31,73 @@ def _rms_dbfs(frame: np.ndarray) -> float:
         return -120.0
     return float(20.0 * math.log10(rms + 1e-12))
 
+class RecordingBuffer:
+    """
+    Buffer NumPy prealocat pentru max_duration_s de audio, în care callback-ul
+    sounddevice scrie direct (np.copyto, fără alocări per bloc). Înregistrarea se
+    oprește când buffer-ul e plin, deci nu facem wrap-around și rezultatul e o
+    simplă felie (view), fără concatenare. Memoria e fixă: capacity * 4 bytes.
+
+    Un singur writer (callback-ul) avansează `written`; consumatorul doar citește
+    contorul și procesează incremental blocurile noi (energie per bloc -> dBFS).
+    """
+
+    def __init__(self, capacity: int, block_size: int = BLOCK_SIZE) -> None:
+        self.capacity = max(1, int(capacity))
+        self.block_size = max(1, int(block_size))
+        self.buf = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0            # doar callback-ul scrie
+        self.processed = 0          # doar consumatorul scrie
+        self.silence_run = 0        # eșantioane consecutive sub prag (la final)
+        self.dropped = 0            # eșantioane venite după ce buffer-ul s-a umplut
+        self.data_ready = threading.Event()
+
+    @property
+    def full(self) -> bool:
+        return self.written >= self.capacity
+
+    def callback(self, indata, frames, time, status) -> None:
+        pos = self.written
+        n = min(frames, self.capacity - pos)
+        if n > 0:
+            np.copyto(self.buf[pos:pos + n], indata[:n, 0])
+            self.written = pos + n
+        self.dropped += frames - max(n, 0)
+        self.data_ready.set()
+
+    def consume(self, silence_dbfs: float) -> int:
+        """
+        Procesează blocurile complete noi; întoarce lungimea curentă a liniștii
+        de la final (în eșantioane). Energia e calculată pe view-uri (np.dot).
+        """
+        end = self.written
+        bs = self.block_size
+        pos = self.processed
+        # pragul de energie per bloc echivalent cu silence_dbfs
+        threshold = bs * (10.0 ** (silence_dbfs / 10.0))
+        while pos + bs <= end:
+            block = self.buf[pos:pos + bs]
+            if float(np.dot(block, block)) < threshold:
+                self.silence_run += bs
+            else:
+                self.silence_run = 0
+            pos += bs
+        if self.full and pos < end:
+            # ultimul bloc parțial (buffer plin)
+            block = self.buf[pos:end]
+            energy = float(np.dot(block, block))
+            if energy < (end - pos) * (10.0 ** (silence_dbfs / 10.0)):
+                self.silence_run += end - pos
+            else:
+                self.silence_run = 0
+            pos = end
+        self.processed = pos
+        return self.silence_run
+
+    def audio(self) -> np.ndarray:
+        """Eșantioanele înregistrate (view, fără copie)."""
+        return self.buf[:self.written]
+
 def record_until_silence(
     max_duration_s: float = 30.0,
     silence_dbfs: float = -40.0,
@@ -39,56 +106,40 @@ def record_until_silence(
 ) -> np.ndarray:
     """
     Înregistrează până când detectează o perioadă de liniște.
+    Întoarce un view în buffer-ul prealocat (vezi RecordingBuffer).
     """
-    q_audio = queue.Queue()
-    collected = []
-
     blocks_per_second = sr / BLOCK_SIZE
     silence_blocks_needed = max(1, int(min_silence_s * blocks_per_second))
-    silence_counter = 0
+    silence_samples_needed = silence_blocks_needed * BLOCK_SIZE
 
     total_blocks_limit = int(max_duration_s * blocks_per_second)
-    total_blocks = 0
+    rec = RecordingBuffer(capacity=total_blocks_limit * BLOCK_SIZE, block_size=BLOCK_SIZE)
 
-    print("Start recording… Speak now (auto-stops on silence).")
+    import sounddevice as sd
 
-    def _callback(indata, frames, time, status):
-        nonlocal silence_counter, total_blocks
-        mono = indata[:, 0].astype(np.float32, copy=False)
-        q_audio.put(mono.copy())
-        total_blocks += 1
+    print("Start recording… Speak now (auto-stops on silence).")
 
     with sd.InputStream(
         samplerate=sr,
         channels=1,
         dtype=DTYPE,
         blocksize=BLOCK_SIZE,
-        callback=_callback,
+        callback=rec.callback,
     ):
         while True:
-            try:
-                block = q_audio.get(timeout=1.0)
-            except queue.Empty:
+            if not rec.data_ready.wait(timeout=1.0):
                 break
+            rec.data_ready.clear()
 
-            collected.append(block)
-
-            level_db = _rms_dbfs(block)
-            if level_db < silence_dbfs:
-                silence_counter += 1
-            else:
-                silence_counter = 0
-
-            if silence_counter >= silence_blocks_needed:
+            if rec.consume(silence_dbfs) >= silence_samples_needed:
                 break
-            if total_blocks >= total_blocks_limit:
+            if rec.full:
                 break
 
-    if not collected:
-        return np.zeros((0,), dtype=np.float32)
-    return np.concatenate(collected, axis=0)
+    return rec.audio()
 
 def _save_wav(buf: np.ndarray, sr: int = DEFAULT_SR) -> str:
+    from scipy.io.wavfile import write as wav_write
     fd, path = tempfile.mkstemp(prefix="llmhw_", suffix=".wav")
     os.close(fd)
     if buf.dtype != np.float32:
@@ -110,6 +161,25 @@ def transcribe_file(path: str, language_hint: Optional[str] = None) -> str:
         resp = client.audio.transcriptions.create(**kwargs)
     return (resp.text or "").strip()
 
+def _transcription_kwargs(audio: BinaryIO, filename: str, language_hint: Optional[str]) -> dict:
+    # tuple (nume, fișier): SDK-ul citește direct din buffer, fără fișier temporar
+    kwargs = {"model": "whisper-1", "file": (filename or "audio.wav", audio)}
+    if language_hint:
+        kwargs["language"] = language_hint
+    return kwargs
+
+def transcribe_buffer(audio: BinaryIO, filename: str = "audio.wav", language_hint: Optional[str] = None) -> str:
+    """Ca transcribe_file, dar dintr-un buffer în memorie (BytesIO / SpooledTemporaryFile)."""
+    client = _get_client()
+    resp = client.audio.transcriptions.create(**_transcription_kwargs(audio, filename, language_hint))
+    return (resp.text or "").strip()
+
+async def transcribe_buffer_async(audio: BinaryIO, filename: str = "audio.wav", language_hint: Optional[str] = None) -> str:
+    """Varianta non-blocantă (AsyncOpenAI), pentru rutele async."""
+    client = _get_async_client()
+    resp = await client.audio.transcriptions.create(**_transcription_kwargs(audio, filename, language_hint))
+    return (resp.text or "").strip()
+
 def capture_and_transcribe_vad(
     language_hint: Optional[str] = None,
     max_duration_s: float = 30.0,
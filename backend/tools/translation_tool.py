@@ -1,57 +1,240 @@
 # backend/tools/translation_tool.py
 from __future__ import annotations
 
+import json
 import os
+import threading
 from typing import Optional
 
 # ...existing code...
 
-from openai import OpenAI
-from langdetect import detect, DetectorFactory
-DetectorFactory.seed = 0
+from openai import AsyncOpenAI, OpenAI
+
+from backend.services.book_catalog import get_catalog
+# detect_language rămâne importabil de aici (LLMHW, scripturi)
+from backend.services.language_detection import detect_language
+from backend.services.openai_client import get_async_openai_client, get_openai_client
+from backend.services.singleflight import get_singleflight
+from backend.services.translation_cache import cache_key as translation_key
+from backend.services.translation_cache import get_translation_cache
 
 def _get_client() -> OpenAI:
-    raw = os.getenv("OPENAI_API_KEY", "")
-    api_key = raw.strip().strip('"').strip("'")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY missing. Set it in .env or environment.")
-    return OpenAI(api_key=api_key)
+    return get_openai_client("chat")
 
-def detect_language(text: str) -> str:
-    try:
-        return detect(text)
-    except Exception:
-        return "unknown"
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_openai_client("chat")
 
-def translate(text: str, target_lang: str = "en", source_lang: Optional[str] = None) -> str:
-    text = (text or "")
+TRANSLATION_MODEL = "gpt-4o-mini"
+
+# limbile în care pre-traducem rezumatele la încărcarea catalogului
+PRETRANSLATE_LANGS = [l.strip() for l in os.getenv("PRETRANSLATE_LANGS", "ro").split(",") if l.strip()]
+
+# traduceri identice în zbor simultan (ex. rezumatul unei cărți populare) -> un singur request
+_flight = get_singleflight("translate")
+
+# translate_many: câte segmente / caractere împachetăm într-un singur request
+BATCH_MAX_SEGMENTS = 20
+BATCH_MAX_CHARS = 8000
+
+def _resolve_source(text: str, target_lang: str, source_lang: Optional[str]) -> Optional[str]:
+    """
+    Limba sursă efectivă, sau None dacă nu e nevoie de traducere
+    (text gol, limbă necunoscută sau deja în limba țintă).
+    """
     if not text.strip():
-        return text
+        return None
 
     if source_lang is None:
         source_lang = detect_language(text)
 
     # dacă necunoscut, nu riscăm traducere aberantă
     if source_lang == "unknown":
-        return text
+        return None
 
     # dacă e deja în limba țintă, return direct
     if source_lang.lower().startswith(target_lang.lower()):
-        return text
+        return None
+
+    return source_lang
 
-    prompt = (
+def _translation_prompt(text: str, target_lang: str, source_lang: str) -> str:
+    return (
         f"Translate the following text from {source_lang} to {target_lang}. "
         f"Keep the meaning and tone as close as possible:\n\n{text}"
     )
 
-    try:
+def translate(text: str, target_lang: str = "en", source_lang: Optional[str] = None) -> str:
+    text = (text or "")
+    source = _resolve_source(text, target_lang, source_lang)
+    if source is None:
+        return text
+
+    cache = get_translation_cache()
+    hit = cache.get(source, target_lang, text)
+    if hit is not None:
+        return hit
+
+    def _call() -> str:
         client = _get_client()
         resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+            model=TRANSLATION_MODEL,
+            messages=[{"role": "user", "content": _translation_prompt(text, target_lang, source)}],
             temperature=0.0,
         )
-        return resp.choices[0].message.content.strip()
+        out = resp.choices[0].message.content.strip()
+        cache.put(source, target_lang, text, out)
+        return out
+
+    try:
+        return _flight.do(translation_key(source, target_lang, text), _call)
     except Exception as e:
         print(f"[Translation Error] {e}")
         return text
+
+async def translate_async(text: str, target_lang: str = "en", source_lang: Optional[str] = None) -> str:
+    """Ca translate(), dar non-blocant (AsyncOpenAI)."""
+    text = (text or "")
+    source = _resolve_source(text, target_lang, source_lang)
+    if source is None:
+        return text
+
+    cache = get_translation_cache()
+    hit = cache.get(source, target_lang, text)
+    if hit is not None:
+        return hit
+
+    async def _call() -> str:
+        client = _get_async_client()
+        resp = await client.chat.completions.create(
+            model=TRANSLATION_MODEL,
+            messages=[{"role": "user", "content": _translation_prompt(text, target_lang, source)}],
+            temperature=0.0,
+        )
+        out = resp.choices[0].message.content.strip()
+        cache.put(source, target_lang, text, out)
+        return out
+
+    try:
+        return await _flight.do_async(translation_key(source, target_lang, text), _call)
+    except Exception as e:
+        print(f"[Translation Error] {e}")
+        return text
+
+# ---------------- Traducere în bloc ----------------
+
+def _translate_batch(segments: list[str], target_lang: str, source_lang: str) -> Optional[list[str]]:
+    """
+    Un singur request pentru mai multe segmente. Cerem un obiect JSON cu o listă
+    de aceeași lungime; dacă răspunsul nu se potrivește, întoarcem None.
+    """
+    system_prompt = (
+        f"You translate text from {source_lang} to {target_lang}. "
+        "Keep the meaning and tone as close as possible. "
+        'You receive a JSON object {"segments": [...]} and must answer with a JSON object '
+        '{"translations": [...]} containing exactly one translation per segment, in the same order.'
+    )
+    try:
+        client = _get_client()
+        resp = client.chat.completions.create(
+            model=TRANSLATION_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps({"segments": segments}, ensure_ascii=False)},
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+        )
+        data = json.loads(resp.choices[0].message.content or "{}")
+    except Exception as e:
+        print(f"[Translation Error] batch: {e}")
+        return None
+
+    out = data.get("translations") if isinstance(data, dict) else None
+    if not isinstance(out, list) or len(out) != len(segments) or not all(isinstance(x, str) for x in out):
+        print("[Translation Error] batch: segment count mismatch, falling back to single calls")
+        return None
+    return [x.strip() for x in out]
+
+def _batches(items: list[str]) -> list[list[str]]:
+    batches: list[list[str]] = []
+    cur: list[str] = []
+    size = 0
+    for it in items:
+        if cur and (len(cur) >= BATCH_MAX_SEGMENTS or size + len(it) > BATCH_MAX_CHARS):
+            batches.append(cur)
+            cur, size = [], 0
+        cur.append(it)
+        size += len(it)
+    if cur:
+        batches.append(cur)
+    return batches
+
+def translate_many(texts: list[str], target_lang: str = "en", source_lang: Optional[str] = None) -> list[str]:
+    """
+    Traduce mai multe segmente, cu cât mai puține request-uri:
+    cache-ul e consultat întâi, miss-urile (unice) sunt grupate pe limba sursă
+    și trimise în loturi. Un lot care nu se desface corect cade pe translate().
+    Rezultatul păstrează ordinea input-ului.
+    """
+    texts = [t or "" for t in texts]
+    out = list(texts)
+    cache = get_translation_cache()
+
+    # (source_lang -> text -> indici)
+    pending: dict[str, dict[str, list[int]]] = {}
+    for i, text in enumerate(texts):
+        source = _resolve_source(text, target_lang, source_lang)
+        if source is None:
+            continue
+        hit = cache.get(source, target_lang, text)
+        if hit is not None:
+            out[i] = hit
+            continue
+        pending.setdefault(source, {}).setdefault(text, []).append(i)
+
+    for source, by_text in pending.items():
+        for batch in _batches(list(by_text.keys())):
+            translated = _translate_batch(batch, target_lang, source) if len(batch) > 1 else None
+            if translated is None:
+                translated = [translate(t, target_lang=target_lang, source_lang=source) for t in batch]
+            else:
+                for t, tr in zip(batch, translated):
+                    cache.put(source, target_lang, t, tr)
+            for t, tr in zip(batch, translated):
+                for i in by_text[t]:
+                    out[i] = tr
+    return out
+
+# ---------------- Pre-traducerea catalogului ----------------
+
+def pretranslate_summaries(snapshot, langs: Optional[list[str]] = None) -> None:
+    """
+    Umple cache-ul cu rezumatele catalogului (și blocul titlu + rezumat afișat la
+    lookup-ul exact) în limbile configurate, ca primul utilizator să nu plătească.
+    """
+    langs = PRETRANSLATE_LANGS if langs is None else langs
+    texts: list[str] = []
+    for rec in snapshot.records:
+        if rec.summary:
+            texts.append(rec.summary)
+            texts.append(f"{rec.title}\n\n{rec.summary}")
+    for lang in langs:
+        if lang.lower() == "en":
+            continue
+        translate_many(texts, target_lang=lang, source_lang="en")
+    print(f"[Translation] Pre-translated {len(texts)} catalog segments to {langs} (catalog v{snapshot.version}).")
+
+def enable_catalog_pretranslation(langs: Optional[list[str]] = None) -> None:
+    """
+    Pre-traduce rezumatele la fiecare (re)încărcare a catalogului, într-un thread
+    separat. Fără cheie OpenAI nu facem nimic.
+    """
+    if not (os.getenv("OPENAI_API_KEY") or "").strip():
+        return
+
+    def _on_load(snapshot) -> None:
+        threading.Thread(
+            target=pretranslate_summaries, args=(snapshot, langs), name="catalog-pretranslate", daemon=True
+        ).start()
+
+    get_catalog().add_listener(_on_load)
@@ -1,10 +1,13 @@
+import asyncio
 import os
-import uuid
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from gtts import gTTS
-from playsound import playsound
+from backend.services.tts_cache import TTS_PREWARM_TOP_N, get_tts_cache, start_eviction_job
 
 # ---- CLI: redare locală (la fel ca versiunea ta) ----
 
@@ -12,6 +15,10 @@ def speak(text: str, lang: str = "en"):
     if not text or not text.strip():
         return
     try:
+        # doar CLI-ul redă local; serverul nu încarcă playsound / gTTS la import
+        from gtts import gTTS
+        from playsound import playsound
+
         filename = "tts_output.mp3"
         tts = gTTS(text=text, lang=lang)
         tts.save(filename)
@@ -24,19 +31,140 @@ def speak(text: str, lang: str = "en"):
 
 def synthesize_to_file(text: str, lang: str = "en", static_audio_dir: str = "backend/static/audio") -> Optional[str]:
     """
-    Creează un fișier mp3 în static/audio și întoarce URL-ul relativ
-    (ex: /static/audio/<id>.mp3) pentru a fi redat în browser.
+    Întoarce URL-ul relativ (ex: /static/audio/tts-<hash>.mp3) al fișierului mp3
+    pentru (text, lang), pentru a fi redat în browser. Fișierul e adresat după
+    conținut: dacă există deja, nu mai apelăm gTTS.
     """
     try:
-        Path(static_audio_dir).mkdir(parents=True, exist_ok=True)
-        file_id = uuid.uuid4().hex
-        out_path = Path(static_audio_dir) / f"{file_id}.mp3"
-
-        tts = gTTS(text=text, lang=lang)
-        tts.save(str(out_path))
-
-        # fastapi main.py montează /static -> backend/static
-        return f"/static/audio/{out_path.name}"
+        return get_tts_cache(static_audio_dir).url(text, lang=lang)
     except Exception as e:
         print(f"[TTS synth error] {e}")
         return None
+
+# ---- Streaming: fraze sintetizate în paralel, livrate în ordine ----
+
+TTS_STREAM_WORKERS = int(os.getenv("TTS_STREAM_WORKERS", "4"))
+TTS_STREAM_MIN_CHARS = 60      # frazele scurte se lipesc de următoarea
+TTS_STREAM_MAX_CHARS = 300     # frazele foarte lungi se taie la virgulă / spațiu
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…;])\s+")
+_stream_pool = ThreadPoolExecutor(max_workers=max(1, TTS_STREAM_WORKERS), thread_name_prefix="tts-stream")
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    parts: list[str] = []
+    rest = sentence
+    while len(rest) > max_chars:
+        cut = rest.rfind(", ", 0, max_chars)
+        if cut <= 0:
+            cut = rest.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(rest[:cut + 1].strip())
+        rest = rest[cut + 1:].strip()
+    if rest:
+        parts.append(rest)
+    return parts
+
+def split_into_chunks(text: str, min_chars: int = TTS_STREAM_MIN_CHARS, max_chars: int = TTS_STREAM_MAX_CHARS) -> list[str]:
+    """Textul împărțit la final de frază, în bucăți de ~[min_chars, max_chars]."""
+    chunks: list[str] = []
+    buf = ""
+    for sentence in _SENTENCE_END.split(" ".join((text or "").split())):
+        for piece in _split_long(sentence, max_chars):
+            buf = f"{buf} {piece}".strip() if buf else piece
+            if len(buf) >= min_chars:
+                chunks.append(buf)
+                buf = ""
+    if buf:
+        if chunks and len(chunks[-1]) + len(buf) < max_chars:
+            chunks[-1] = f"{chunks[-1]} {buf}"
+        else:
+            chunks.append(buf)
+    return chunks
+
+async def stream_synthesis(text: str, lang: str = "en", lookahead: int = TTS_STREAM_WORKERS) -> AsyncIterator[bytes]:
+    """
+    Bytes mp3 pentru fiecare bucată, în ordine. Bucățile se sintetizează în
+    paralel (pool mărginit, cel mult `lookahead` înainte de cea redată) și fiecare
+    trece prin cache-ul TTS, deci frazele repetate nu mai ajung la gTTS.
+    Cadrele MP3 concatenate sunt redate continuu de browser.
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_tts_cache()
+    chunks = iter(split_into_chunks(text))
+    pending: deque = deque()
+
+    def _submit_next() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(loop.run_in_executor(_stream_pool, cache.get_or_create, chunk, lang))
+
+    for _ in range(max(1, lookahead)):
+        _submit_next()
+    index = 0
+    try:
+        while pending:
+            try:
+                path = await pending.popleft()
+                data = await asyncio.to_thread(Path(path).read_bytes)
+            except Exception as e:
+                # header-ele audio/mpeg au plecat deja: încheiem stream-ul curat după
+                # bucățile trimise, în loc să lăsăm excepția să rupă răspunsul
+                print(f"[TTS stream error] chunk {index}: {e}")
+                return
+            _submit_next()
+            index += 1
+            yield data
+    finally:
+        # clientul a închis conexiunea sau o bucată a eșuat: nu mai pornim restul
+        for fut in pending:
+            fut.cancel()
+            # cele deja pornite nu se pot anula; le consumăm excepția, ca să nu fie raportată
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+# ---- Pre-warm: rezumatele primelor N cărți din catalog ----
+
+def prewarm_tts_cache(top_n: int = TTS_PREWARM_TOP_N, langs: Optional[list[str]] = None) -> int:
+    """
+    Sintetizează rezumatele primelor `top_n` cărți din catalog, în engleză și în
+    limbile pre-traduse (același text pe care îl trimite chat-ul la /api/tts).
+    Întoarce câte fișiere sunt disponibile în cache.
+    """
+    from backend.services.book_catalog import get_catalog
+    from backend.tools.translation_tool import PRETRANSLATE_LANGS, translate
+
+    langs = langs if langs is not None else ["en", *PRETRANSLATE_LANGS]
+    has_key = bool((os.getenv("OPENAI_API_KEY") or "").strip())
+    cache = get_tts_cache()
+    records = get_catalog().snapshot().records[:max(0, top_n)]
+    done = 0
+    for lang in langs:
+        if lang != "en" and not has_key:
+            continue
+        for rec in records:
+            if not rec.summary:
+                continue
+            text = rec.summary if lang == "en" else translate(rec.summary, target_lang=lang, source_lang="en")
+            if lang != "en" and text == rec.summary:
+                continue    # traducerea a eșuat; nu sintetizăm text englezesc cu voce ro
+            try:
+                cache.get_or_create(text, lang)
+                done += 1
+            except Exception as e:
+                print(f"[TTS prewarm] {rec.title} ({lang}): {e}")
+    return done
+
+def enable_tts_cache_maintenance(top_n: int = TTS_PREWARM_TOP_N) -> None:
+    """Pornește jobul de evicție și pre-warm-ul (în fundal, nu blochează startup-ul)."""
+    start_eviction_job()
+    if top_n <= 0:
+        return
+
+    def _run() -> None:
+        try:
+            n = prewarm_tts_cache(top_n)
+            print(f"[TTS prewarm] {n} summaries ready")
+        except Exception as e:
+            print(f"[TTS prewarm] failed: {e}")
+
+    threading.Thread(target=_run, name="tts-prewarm", daemon=True).start()
@@ -0,0 +1,363 @@
+# backend/vector_store/backends.py
+"""
+Backend-uri de căutare vectorială din spatele BookRetriever.
+
+    VECTOR_BACKEND=chroma   (implicit) colecția Chroma persistentă
+    VECTOR_BACKEND=numpy    matrice float32 memory-mapped (.npy) + sidecar JSON
+
+Ambele întorc BookMatch cu distanțe în același spațiu ("l2" sau "cosine"),
+deci pragul RAG al furnizorului (max_distance) rămâne valid indiferent de backend.
+Fiecare index poartă eticheta furnizorului de embeddings cu care a fost construit
+(embedding_tag; vezi embeddings.py).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").strip().lower()
+CHROMA_PERSIST_DIR = "backend/vector_store/chroma_db"
+NUMPY_INDEX_DIR = os.getenv("NUMPY_INDEX_DIR", "backend/vector_store/numpy_index")
+
+CHROMA_WRITE_CHUNK = 1000   # rânduri per upsert/delete în Chroma
+
+# Spațiul de distanță pentru colecțiile noi. Colecția livrată (și pragurile
+# max_distance din embeddings.py) e pe "l2", spațiul implicit al Chroma; pentru
+# embeddings normalizate l2 = 2 * (1 - cos). Colecțiile existente își păstrează spațiul.
+DEFAULT_SPACE = "l2"
+COLLECTION_METADATA = {"hnsw:space": DEFAULT_SPACE}
+
+
+@dataclass
+class BookMatch:
+    title: str
+    summary: str
+    distance: float
+    # True = distance e pseudo-distanța BM25 (lexical.py), cu pragul ei propriu
+    lexical: bool = False
+
+
+def _match_from(meta: Optional[dict], doc: Optional[str], distance: float) -> BookMatch:
+    meta = meta or {}
+    title = meta.get("title") or ((doc or "")[:80] or "Unknown")
+    summary = meta.get("summary") or (doc or "")
+    return BookMatch(title=title, summary=summary, distance=float(distance))
+
+
+class VectorBackend(ABC):
+    """
+    Interfața comună: interogare în lot + scriere incrementală (pentru builder).
+    Metodele abstracte trebuie implementate toate: un backend incomplet eșuează la creare.
+    """
+
+    name = "base"
+    space = DEFAULT_SPACE
+
+    @abstractmethod
+    def query(self, embeddings: List[List[float]], top_k: int) -> List[List[BookMatch]]:
+        """O listă de BookMatch (sortată după distanță) pentru fiecare embedding."""
+
+    @abstractmethod
+    def get_metadata(self) -> Dict[str, dict]:
+        """id -> metadata pentru toate intrările."""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: List[List[float]], metadatas: List[dict], documents: List[str]) -> None:
+        """Inserează sau înlocuiește intrările date."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Șterge intrările date (id-urile inexistente sunt ignorate)."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Numărul de intrări din index."""
+
+    def warmup(self) -> None:
+        """Încarcă indexul în memorie înainte de primul request (lifespan-ul API-ului)."""
+        self.count()
+
+    @abstractmethod
+    def embedding_tag(self) -> dict:
+        """Furnizorul / modelul / dimensiunea cu care a fost construit indexul ({} = neetichetat)."""
+
+    @abstractmethod
+    def set_embedding_tag(self, tag: dict) -> None:
+        """Scrie eticheta furnizorului în metadata indexului."""
+
+
+# ---------------- Chroma ----------------
+
+def _row(nested, row: int) -> list:
+    if not nested or row >= len(nested):
+        return []
+    return nested[row] or []
+
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+
+    def __init__(self, persist_dir: str = CHROMA_PERSIST_DIR, collection_name: str = "books") -> None:
+        import chromadb
+        from chromadb.config import Settings
+
+        # NU atinge OPENAI aici; doar Chroma
+        self.client = chromadb.PersistentClient(
+            path=persist_dir,
+            settings=Settings(allow_reset=False),
+        )
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name, metadata=COLLECTION_METADATA
+        )
+        self.space = (self.collection.metadata or {}).get("hnsw:space") or _configured_space(self.collection)
+
+    def query(self, embeddings: List[List[float]], top_k: int) -> List[List[BookMatch]]:
+        res = self.collection.query(
+            query_embeddings=embeddings,
+            n_results=max(1, int(top_k)),
+            include=["metadatas", "distances", "documents"],  # documents dacă ții summary acolo
+        )
+
+        # Chroma returnează liste imbricate (un rând per embedding)
+        out: List[List[BookMatch]] = []
+        for row in range(len(embeddings)):
+            ids = _row(res.get("ids"), row)
+            dists = _row(res.get("distances"), row)
+            metas = _row(res.get("metadatas"), row)
+            docs = _row(res.get("documents"), row)
+            out.append([
+                _match_from(
+                    metas[i] if i < len(metas) else None,
+                    docs[i] if i < len(docs) else None,
+                    dists[i] if i < len(dists) else 0.0,
+                )
+                for i in range(len(ids))
+            ])
+        return out
+
+    def get_metadata(self) -> Dict[str, dict]:
+        res = self.collection.get(include=["metadatas"])
+        return {i: (m or {}) for i, m in zip(res.get("ids") or [], res.get("metadatas") or [])}
+
+    def upsert(self, ids, embeddings, metadatas, documents) -> None:
+        for start in range(0, len(ids), CHROMA_WRITE_CHUNK):
+            end = start + CHROMA_WRITE_CHUNK
+            self.collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end],
+                documents=documents[start:end],
+            )
+
+    def delete(self, ids) -> None:
+        for start in range(0, len(ids or []), CHROMA_WRITE_CHUNK):
+            self.collection.delete(ids=ids[start:start + CHROMA_WRITE_CHUNK])
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def embedding_tag(self) -> dict:
+        meta = self.collection.metadata or {}
+        return {k: v for k, v in meta.items() if k.startswith("embedding_")}
+
+    def set_embedding_tag(self, tag: dict) -> None:
+        # modify înlocuiește metadata; cheile hnsw:* nu pot fi retrimise (spațiul stă în configurație)
+        meta = {k: v for k, v in (self.collection.metadata or {}).items() if not k.startswith("hnsw:")}
+        meta.update(tag)
+        self.collection.modify(metadata=meta)
+
+    def warmup(self) -> None:
+        # Chroma încarcă segmentul HNSW abia la prima interogare: o facem acum,
+        # cu un embedding existent (dimensiunea colecției nu e cunoscută altfel)
+        peek = self.collection.peek(limit=1)
+        embs = peek.get("embeddings") if peek else None
+        if embs is not None and len(embs):
+            self.query([list(map(float, embs[0]))], 1)
+
+
+def _configured_space(collection) -> str:
+    # chroma >= 1.0 ține spațiul în configuration_json, nu în metadata
+    try:
+        return collection.configuration_json["hnsw"]["space"] or DEFAULT_SPACE
+    except Exception:
+        return DEFAULT_SPACE
+
+
+# ---------------- NumPy (brute force, memory-mapped) ----------------
+
+class NumpyBackend(VectorBackend):
+    """
+    Embeddings L2-normalizate într-o matrice float32 (N x D) salvată ca .npy și
+    deschisă cu mmap_mode="r", plus un sidecar JSON cu id-uri și metadata.
+    O interogare în lot = un singur produs matrice-matrice + argpartition pentru top-k.
+    Scrierile (builder) rescriu fișierele atomic (tmp + os.replace).
+    """
+
+    name = "numpy"
+
+    def __init__(self, index_dir: str = NUMPY_INDEX_DIR, collection_name: str = "books", space: str = DEFAULT_SPACE) -> None:
+        import numpy as np
+
+        self._np = np
+        self.index_dir = index_dir
+        self.matrix_path = os.path.join(index_dir, f"{collection_name}.npy")
+        self.sidecar_path = os.path.join(index_dir, f"{collection_name}.json")
+        self.space = space
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._metas: List[dict] = []
+        self._tag: dict = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    def _load(self) -> None:
+        np = self._np
+        if not (os.path.exists(self.sidecar_path) and os.path.exists(self.matrix_path)):
+            return
+        with open(self.sidecar_path, "r", encoding="utf-8") as f:
+            side = json.load(f)
+        matrix = np.load(self.matrix_path, mmap_mode="r")
+        if matrix.shape[0] != len(side.get("ids") or []):
+            raise ValueError(f"NumPy index out of sync: {self.matrix_path} vs {self.sidecar_path}")
+        self.space = side.get("space") or self.space
+        self._ids = list(side["ids"])
+        self._metas = list(side.get("metadatas") or [{} for _ in self._ids])
+        self._tag = dict(side.get("embedding") or {})
+        self._matrix = matrix
+
+    def _normalize(self, vectors):
+        np = self._np
+        arr = np.asarray(vectors, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return arr / norms
+
+    def _to_distance(self, sims):
+        np = self._np
+        if self.space == "cosine":
+            return 1.0 - sims
+        if self.space == "ip":
+            return 1.0 - sims
+        # l2 (pătratul distanței, ca în Chroma) pentru vectori unitari
+        return np.maximum(0.0, 2.0 - 2.0 * sims)
+
+    def query(self, embeddings: List[List[float]], top_k: int) -> List[List[BookMatch]]:
+        np = self._np
+        with self._lock:
+            matrix, ids, metas = self._matrix, self._ids, self._metas
+        n = len(ids)
+        if n == 0 or not embeddings:
+            return [[] for _ in embeddings]
+
+        q = self._normalize(embeddings)                      # (B, D)
+        sims = q @ matrix.T                                  # (B, N)
+        k = max(1, min(int(top_k), n))
+        if k < n:
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), (sims.shape[0], n))
+        rows = np.arange(sims.shape[0])[:, None]
+        order = np.argsort(-sims[rows, top], axis=1)
+        top = top[rows, order]
+        dists = self._to_distance(sims[rows, top])
+
+        return [
+            [_match_from(metas[j], None, dists[b, c]) for c, j in enumerate(top[b])]
+            for b in range(top.shape[0])
+        ]
+
+    def get_metadata(self) -> Dict[str, dict]:
+        with self._lock:
+            return {i: dict(m) for i, m in zip(self._ids, self._metas)}
+
+    def _save(self, matrix, ids: List[str], metas: List[dict]) -> None:
+        np = self._np
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp_matrix = self.matrix_path + ".tmp"
+        tmp_side = self.sidecar_path + ".tmp"
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        self._write_sidecar(tmp_side, int(matrix.shape[1]) if matrix.ndim == 2 else 0, ids, metas)
+        # eliberăm mmap-ul vechi înainte de replace (pe Windows altfel e blocat)
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_side, self.sidecar_path)
+        self._load()
+
+    def _write_sidecar(self, path: str, dim: int, ids: List[str], metas: List[dict]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"space": self.space, "dim": dim, "embedding": self._tag,
+                       "ids": ids, "metadatas": metas}, f, ensure_ascii=False)
+
+    def upsert(self, ids, embeddings, metadatas, documents) -> None:
+        np = self._np
+        if not ids:
+            return
+        with self._lock:
+            new = self._normalize(embeddings)
+            pos = {i: p for p, i in enumerate(self._ids)}
+            cur_ids = list(self._ids)
+            cur_metas = list(self._metas)
+            matrix = np.array(self._matrix, dtype=np.float32) if len(cur_ids) else np.zeros((0, new.shape[1]), np.float32)
+            if matrix.shape[1] != new.shape[1]:
+                raise ValueError(f"Embedding dimension mismatch: index {matrix.shape[1]} vs {new.shape[1]}")
+
+            appended = []
+            for r, (i, meta, doc) in enumerate(zip(ids, metadatas, documents)):
+                meta = dict(meta or {})
+                meta.setdefault("summary", doc)
+                if i in pos:
+                    matrix[pos[i]] = new[r]
+                    cur_metas[pos[i]] = meta
+                else:
+                    pos[i] = len(cur_ids)
+                    cur_ids.append(i)
+                    cur_metas.append(meta)
+                    appended.append(r)
+            if appended:
+                matrix = np.vstack([matrix, new[appended]])
+            self._save(matrix, cur_ids, cur_metas)
+
+    def delete(self, ids) -> None:
+        np = self._np
+        drop = set(ids or [])
+        if not drop:
+            return
+        with self._lock:
+            keep = [p for p, i in enumerate(self._ids) if i not in drop]
+            if len(keep) == len(self._ids):
+                return
+            matrix = np.asarray(self._matrix)[keep] if keep else np.zeros((0, self._matrix.shape[1]), np.float32)
+            self._save(matrix, [self._ids[p] for p in keep], [self._metas[p] for p in keep])
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def embedding_tag(self) -> dict:
+        return dict(self._tag)
+
+    def set_embedding_tag(self, tag: dict) -> None:
+        with self._lock:
+            self._tag = dict(tag)
+            if not os.path.exists(self.sidecar_path):
+                return      # indexul gol: eticheta se scrie odată cu primul upsert
+            tmp_side = self.sidecar_path + ".tmp"
+            dim = int(self._matrix.shape[1]) if self._matrix.ndim == 2 else 0
+            self._write_sidecar(tmp_side, dim, list(self._ids), list(self._metas))
+            os.replace(tmp_side, self.sidecar_path)
+
+
+def make_backend(kind: Optional[str] = None, persist_dir: Optional[str] = None, collection_name: str = "books") -> VectorBackend:
+    """Backend-ul selectat prin VECTOR_BACKEND (sau explicit prin `kind`)."""
+    kind = (kind or VECTOR_BACKEND).strip().lower()
+    if kind == "chroma":
+        return ChromaBackend(persist_dir or CHROMA_PERSIST_DIR, collection_name)
+    if kind == "numpy":
+        return NumpyBackend(persist_dir or NUMPY_INDEX_DIR, collection_name)
+    raise ValueError(f"Unknown VECTOR_BACKEND: {kind!r} (expected 'chroma' or 'numpy')")
@@ -0,0 +1,273 @@
+# backend/vector_store/embeddings.py
+"""
+Furnizorii de embeddings din spatele retriever-ului și al builder-ului:
+
+    EMBEDDING_PROVIDER=openai   (implicit) text-embedding-3-small prin API (EMBED_MODEL)
+    EMBEDDING_PROVIDER=local    all-MiniLM-L6-v2 pe CPU (ONNX, modelul livrat cu chromadb:
+                                onnxruntime + tokenizers sunt deja dependențe), fără rețea
+                                după prima descărcare în ~/.cache/chroma
+
+Vectorii celor doi furnizori nu sunt comparabili (alt spațiu, altă dimensiune),
+deci fiecare index e etichetat cu `tag` (furnizor, model, dimensiune), iar
+retriever-ul / builder-ul refuză un index construit cu alt furnizor
+(vezi check_index_tag). Colecția implicită e tot per furnizor (collection_for),
+la fel și pragul de relevanță RAG (max_distance): distanțele nu au aceeași scară.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+Vector = List[float]
+
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").strip().lower()
+OPENAI_EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+
+# modelul local: loturi pentru inferență + câte loturi rulează în paralel
+# (onnxruntime eliberează GIL-ul în session.run)
+LOCAL_EMBED_BATCH = int(os.getenv("LOCAL_EMBED_BATCH", "32"))
+LOCAL_EMBED_THREADS = int(os.getenv("LOCAL_EMBED_THREADS", "2"))
+
+# builder: retry cu backoff pentru loturile mari trimise la API
+EMBED_MAX_RETRIES = 5
+
+DEFAULT_COLLECTION = "books"
+
+_KNOWN_DIMS: Dict[str, int] = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+    "all-MiniLM-L6-v2": 384,
+}
+
+# pragul RAG (distanța l2 a indexului, = 2 * (1 - cos) pentru vectori normalizați) per model:
+# 1.6 e reglat pe text-embedding-3-small; MiniLM dă similarități mai mari pentru texte
+# fără legătură, deci pornim mai strict. RAG_MAX_DISTANCE suprascrie valoarea pentru orice furnizor.
+_MAX_DISTANCES: Dict[str, float] = {
+    "text-embedding-3-small": 1.6,
+    "all-MiniLM-L6-v2": 1.4,
+}
+DEFAULT_MAX_DISTANCE = 1.6
+RAG_MAX_DISTANCE = os.getenv("RAG_MAX_DISTANCE", "").strip()
+
+
+class EmbeddingProvider(ABC):
+    """Interfața comună: embed (sync / async) + embed_documents pentru builder."""
+
+    name = "base"
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self._dim: Optional[int] = _KNOWN_DIMS.get(model)
+
+    @property
+    def dim(self) -> int:
+        """Dimensiunea vectorilor; pentru un model necunoscut costă un embedding de probă."""
+        if self._dim is None:
+            self._dim = len(self.embed(["dimension probe"])[0])
+        return self._dim
+
+    @property
+    def max_distance(self) -> float:
+        """Pragul de relevanță RAG pentru distanțele produse de acest model."""
+        if RAG_MAX_DISTANCE:
+            return float(RAG_MAX_DISTANCE)
+        return _MAX_DISTANCES.get(self.model, DEFAULT_MAX_DISTANCE)
+
+    @property
+    def cache_key(self) -> str:
+        """Cheia din EmbeddingCache (model-ul OpenAI rămâne cheia de până acum)."""
+        return f"{self.name}/{self.model}"
+
+    @property
+    def tag(self) -> Dict[str, object]:
+        """Eticheta scrisă în metadata indexului."""
+        return {"embedding_provider": self.name, "embedding_model": self.model, "embedding_dim": self.dim}
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[Vector]:
+        """Un vector per text, în ordinea input-ului."""
+
+    async def embed_async(self, texts: List[str]) -> List[Vector]:
+        return await asyncio.to_thread(self.embed, texts)
+
+    def embed_documents(self, texts: List[str], batch_size: int, concurrency: int) -> List[Vector]:
+        """Loturi mari (builder); implicit același drum ca embed()."""
+        return self.embed(texts)
+
+    def warmup(self) -> None:
+        """Pregătește furnizorul înainte de primul request (lifespan-ul API-ului)."""
+
+
+# ---------------- OpenAI ----------------
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    name = "openai"
+
+    def __init__(self, model: str = OPENAI_EMBED_MODEL) -> None:
+        super().__init__(model)
+
+    @property
+    def cache_key(self) -> str:
+        return self.model
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        from backend.services.openai_client import get_openai_client
+        resp = get_openai_client("embeddings").embeddings.create(model=self.model, input=texts)
+        # OpenAI returnează embeddings în ordinea input-ului
+        return [d.embedding for d in resp.data]
+
+    async def embed_async(self, texts: List[str]) -> List[Vector]:
+        from backend.services.openai_client import get_async_openai_client
+        resp = await get_async_openai_client("embeddings").embeddings.create(model=self.model, input=texts)
+        return [d.embedding for d in resp.data]
+
+    def _embed_batch(self, texts: List[str]) -> List[Vector]:
+        import openai
+        from backend.services.openai_client import get_openai_client
+
+        retryable = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+        # retry-urile le facem aici (backoff mai lung, potrivit pentru loturi mari)
+        client = get_openai_client("embeddings").with_options(max_retries=0)
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            try:
+                resp = client.embeddings.create(model=self.model, input=texts)
+                return [d.embedding for d in resp.data]
+            except retryable as e:
+                if attempt >= EMBED_MAX_RETRIES:
+                    raise
+                delay = min(30.0, 0.5 * (2 ** attempt)) * (0.5 + random.random())
+                print(f"[Embeddings] Batch failed ({e.__class__.__name__}), retry in {delay:.1f}s")
+                time.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    def embed_documents(self, texts: List[str], batch_size: int, concurrency: int) -> List[Vector]:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            results = list(pool.map(self._embed_batch, batches))
+        return [vec for batch in results for vec in batch]
+
+
+# ---------------- local (ONNX MiniLM) ----------------
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    all-MiniLM-L6-v2 în onnxruntime, încărcat o singură dată per proces. Un apel
+    e împărțit în loturi de LOCAL_EMBED_BATCH rulate pe un pool propriu de
+    LOCAL_EMBED_THREADS thread-uri; varianta async folosește același pool, deci
+    inferența nu ține event loop-ul și nu concurează cu to_thread-ul implicit.
+    Vectorii ies L2-normalizați.
+    """
+
+    name = "local"
+
+    def __init__(self, model: str = "all-MiniLM-L6-v2", batch_size: int = LOCAL_EMBED_BATCH,
+                 threads: int = LOCAL_EMBED_THREADS) -> None:
+        super().__init__(model)
+        self.batch_size = max(1, batch_size)
+        self._fn = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="local-embed")
+
+    def _model(self):
+        if self._fn is None:
+            with self._lock:
+                if self._fn is None:
+                    if self.model != "all-MiniLM-L6-v2":
+                        raise ValueError(f"Unsupported local embedding model: {self.model!r}")
+                    # import lazy: onnxruntime / tokenizers doar când furnizorul local e folosit
+                    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+                    self._fn = ONNXMiniLM_L6_V2()
+        return self._fn
+
+    def _embed_batch(self, texts: List[str]) -> List[Vector]:
+        return [[float(x) for x in vec] for vec in self._model()(texts)]
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        batches = self._batches(texts)
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+        return [vec for batch in self._pool.map(self._embed_batch, batches) for vec in batch]
+
+    async def embed_async(self, texts: List[str]) -> List[Vector]:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(loop.run_in_executor(self._pool, self._embed_batch, b) for b in self._batches(texts)))
+        return [vec for batch in results for vec in batch]
+
+    def embed_documents(self, texts: List[str], batch_size: int, concurrency: int) -> List[Vector]:
+        # loturile / paralelismul API-ului nu se aplică: modelul local are propriile setări
+        return self.embed(texts)
+
+    def warmup(self) -> None:
+        # încărcarea sesiunii ONNX + prima inferență (alocările) înainte de primul request
+        self.embed(["warm up the local embedding model"])
+
+
+# ---------------- selecție + etichete de index ----------------
+
+def make_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """Furnizorul selectat prin EMBEDDING_PROVIDER (sau explicit prin `name`)."""
+    name = (name or EMBEDDING_PROVIDER).strip().lower()
+    if name == "openai":
+        return OpenAIEmbeddingProvider()
+    if name == "local":
+        return LocalEmbeddingProvider()
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER: {name!r} (expected 'openai' or 'local')")
+
+
+_provider: Optional[EmbeddingProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Furnizorul partajat de tot procesul (modelul local se încarcă o singură dată)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = make_provider()
+    return _provider
+
+
+def collection_for(provider: EmbeddingProvider) -> str:
+    """
+    Colecția implicită: "books" pentru modelul OpenAI implicit (indexul livrat),
+    altfel "books-<furnizor>-<dimensiune>", ca indexurile să stea separat. Fără
+    apel de rețea: pentru un model cu dimensiune necunoscută folosim numele modelului.
+    """
+    if provider.name == "openai" and provider.model == "text-embedding-3-small":
+        return DEFAULT_COLLECTION
+    if provider._dim is not None:
+        suffix = str(provider._dim)
+    else:
+        suffix = re.sub(r"[^A-Za-z0-9._-]+", "-", provider.model).strip("-._")
+    return f"{DEFAULT_COLLECTION}-{provider.name}-{suffix}"
+
+
+def check_index_tag(index_tag: Optional[dict], provider: EmbeddingProvider) -> None:
+    """
+    ValueError dacă indexul a fost construit cu alt furnizor / model / dimensiune.
+    Un index fără etichetă (construit înainte de furnizori) e acceptat: builder-ul
+    îl etichetează la următoarea scriere.
+    """
+    if not index_tag or not index_tag.get("embedding_provider"):
+        return
+    expected = provider.tag
+    mismatched = {k: (index_tag.get(k), v) for k, v in expected.items() if index_tag.get(k) != v}
+    if mismatched:
+        details = ", ".join(f"{k}: index={a!r} vs current={b!r}" for k, (a, b) in mismatched.items())
+        raise ValueError(
+            f"Vector index was built with a different embedding provider ({details}); "
+            f"rebuild it with `python -m backend.vector_store.vector_store_builder --provider {provider.name}` "
+            f"or set EMBEDDING_PROVIDER={index_tag.get('embedding_provider')}"
+        )
@@ -0,0 +1,132 @@
+# backend/vector_store/lexical.py
+"""
+Index BM25 în proces peste catalog (titlu + rezumat + alias-uri), construit la
+încărcarea catalogului și reconstruit doar la reload (vezi get_lexical_index).
+
+O interogare e o trecere prin listele inverse ale termenilor din query: câteva
+microsecunde pentru catalogul nostru, fără niciun apel API.
+
+Scorul BM25 nu e o distanță; ca pragul RAG din LLMHW să se aplice la fel în modul
+lexical (LEXICAL_MAX_DISTANCE), îl transformăm în pseudo-distanța
+
+    distance = 2 * K / (score + K)          (K = LEXICAL_HALF_SCORE)
+
+adică analogul lui l2 = 2 * (1 - cos) pentru embeddings normalizate: scor 0 ->
+2.0 (ortogonal), scor K -> 1.0, scor mare -> 0. Cu K = 4 și pragul 1.6, trece
+un scor >= 1, adică (aproximativ) un termen rar din rezumat.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from backend.services.book_catalog import CatalogSnapshot, get_catalog
+from backend.vector_store.backends import BookMatch
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+LEXICAL_HALF_SCORE = float(os.getenv("LEXICAL_HALF_SCORE", "4.0"))
+# pragul RAG pentru pseudo-distanță în modul lexical (vezi docstring-ul modulului)
+LEXICAL_MAX_DISTANCE = 1.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# cuvinte de legătură EN (query-urile ajung aici deja traduse) + cuvinte „de cerere”
+# care apar în aproape orice întrebare și n-ar trebui să potrivească nimic
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i in into is it its me my of on or
+so that the their them they this to was were what which who will with you your
+about any some something want would like give tell recommend book books novel
+story stories read please
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, fără stopwords, cu un stemming minimal pentru plural (dragons -> dragon)."""
+    out: List[str] = []
+    for tok in _TOKEN_RE.findall((text or "").lower()):
+        if tok in STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        out.append(tok)
+    return out
+
+
+def score_to_distance(score: float) -> float:
+    return 2.0 * LEXICAL_HALF_SCORE / (score + LEXICAL_HALF_SCORE)
+
+
+class BM25Index:
+    """Liste inverse termen -> [(doc, tf)], lungimi de document și IDF precalculat."""
+
+    def __init__(self, snapshot: CatalogSnapshot, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.version = snapshot.version
+        self.k1 = k1
+        self.b = b
+        self._records = snapshot.records
+
+        postings: Dict[str, List[tuple[int, int]]] = defaultdict(list)
+        lengths: List[int] = []
+        for doc_id, rec in enumerate(self._records):
+            tokens = tokenize(" ".join((rec.title, rec.summary, *rec.aliases)))
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc_id, tf))
+
+        n = len(self._records)
+        avgdl = (sum(lengths) / n) if n else 0.0
+        # normalizarea de lungime e per document, deci o calculăm o singură dată
+        self._norm = [k1 * (1.0 - b + b * (dl / avgdl if avgdl else 0.0)) for dl in lengths]
+        # IDF-ul „plus unu” (Lucene): mereu pozitiv, chiar și pentru termeni din majoritatea documentelor
+        self._idf = {t: math.log(1.0 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()}
+        self._postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def scores(self, text: str) -> Dict[int, float]:
+        """doc_id -> scor BM25 (doar documentele cu cel puțin un termen comun)."""
+        acc: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(text)):
+            plist = self._postings.get(term)
+            if not plist:
+                continue
+            idf = self._idf[term]
+            for doc_id, tf in plist:
+                acc[doc_id] += idf * tf * (self.k1 + 1.0) / (tf + self._norm[doc_id])
+        return acc
+
+    def search(self, text: str, top_k: int) -> List[BookMatch]:
+        """Primele top_k documente, ca BookMatch cu pseudo-distanță (crescător)."""
+        ranked = sorted(self.scores(text).items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+        return [
+            BookMatch(
+                title=self._records[doc_id].title,
+                summary=self._records[doc_id].summary,
+                distance=score_to_distance(score),
+                lexical=True,
+            )
+            for doc_id, score in ranked
+        ]
+
+
+_index: Optional[BM25Index] = None
+_index_lock = threading.Lock()
+
+
+def get_lexical_index() -> BM25Index:
+    """Indexul pentru versiunea curentă a catalogului (reconstruit doar la reload)."""
+    global _index
+    snap = get_catalog().snapshot()
+    idx = _index
+    if idx is None or idx.version != snap.version:
+        with _index_lock:
+            if _index is None or _index.version != snap.version:
+                _index = BM25Index(snap)
+            idx = _index
+    return idx
@@ -1,12 +1,9 @@
 
-import os
-from openai import OpenAI
 import chromadb
+
+from backend.services.openai_client import get_openai_client
 # .env este încărcat o singură dată în main.py
-api_key = os.getenv("OPENAI_API_KEY")
-if api_key:
-    api_key = api_key.strip()
-client = OpenAI(api_key=api_key)
+client = get_openai_client("embeddings")
 
 PERSIST_PATH = "backend/vector_store/chroma_db"
 COLLECTION_NAME = "books"
@@ -1,84 +1,253 @@
 # backend/vector_store/retriever.py
 from __future__ import annotations
 
+import asyncio
+import math
 import os
+import threading
 from typing import List, Optional
 
 # .env este încărcat o singură dată în main.py
 
-from openai import OpenAI
-import chromadb
-from chromadb.config import Settings
+from backend.services.embedding_cache import cache_key as embedding_key
+from backend.services.embedding_cache import get_embedding_cache
+from backend.services.singleflight import get_singleflight
+from backend.services.tracing import traced
+# BookMatch / COLLECTION_METADATA rămân importabile din retriever
+from backend.vector_store.backends import (
+    COLLECTION_METADATA,
+    BookMatch,
+    VectorBackend,
+    make_backend,
+)
+from backend.vector_store.embeddings import (
+    OPENAI_EMBED_MODEL,
+    check_index_tag,
+    collection_for,
+    get_embedding_provider,
+)
+from backend.vector_store.lexical import LEXICAL_MAX_DISTANCE, get_lexical_index
+
+# compatibilitate: modelul OpenAI implicit (furnizorul efectiv e EMBEDDING_PROVIDER)
+EMBED_MODEL = OPENAI_EMBED_MODEL
+
+# Compromisul latență / cost per deployment:
+#   lexical   doar BM25 peste catalog (microsecunde, fără embeddings)
+#   vector    doar indexul vectorial (implicit, comportamentul de până acum)
+#   hybrid    ambele, fuzionate prin reciprocal-rank fusion; dacă partea vectorială
+#             eșuează (API / index), răspunde doar cea lexicală
+RETRIEVAL_MODES = ("lexical", "vector", "hybrid")
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "vector").strip().lower()
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+
+# același lot de miss-uri cerut simultan (aceeași întrebare de la mai mulți utilizatori)
+# -> un singur request de embeddings
+_embed_flight = get_singleflight("embeddings")
+
+
+def _batch_key(model: str, texts: List[str]) -> str:
+    return embedding_key(model, "\x00".join(texts))
+
+
+@traced("embed")
+def _embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embeddings prin cache (memorie + disc); furnizorul e apelat doar pentru miss-uri."""
+    provider = get_embedding_provider()
 
-# Dacă tu ai deja un dataclass BookMatch, păstrează-l.
-from dataclasses import dataclass
+    def _embed_misses(todo: List[str]) -> List[List[float]]:
+        return _embed_flight.do(_batch_key(provider.cache_key, todo), lambda: provider.embed(todo))
 
-@dataclass
-class BookMatch:
-    title: str
-    summary: str
-    distance: float
+    return get_embedding_cache().embed(provider.cache_key, texts, _embed_misses)
 
-def _get_client() -> OpenAI:
-    """Lazy-init OpenAI client (NU la import)."""
-    raw = os.getenv("OPENAI_API_KEY", "")
-    api_key = raw.strip().strip('"').strip("'")  # <- curățăm newline/spații/ghilimele
-    if not api_key:
-        raise RuntimeError(
-            "OPENAI_API_KEY missing. Set it in your project .env or as environment variable."
-        )
-    return OpenAI(api_key=api_key)
 
+@traced("embed")
+async def _embed_texts_async(texts: List[str]) -> List[List[float]]:
+    provider = get_embedding_provider()
 
-def _embed_texts(texts: List[str]) -> List[List[float]]:
-    """Encapsulează cererea de embeddings (text-embedding-3-small)."""
-    client = _get_client()
-    resp = client.embeddings.create(model="text-embedding-3-small", input=texts)
-    # OpenAI returnează embeddings în ordinea input-ului
-    return [d.embedding for d in resp.data]
+    async def _embed_misses(todo: List[str]) -> List[List[float]]:
+        return await _embed_flight.do_async(_batch_key(provider.cache_key, todo), lambda: provider.embed_async(todo))
+
+    return await get_embedding_cache().embed_async(provider.cache_key, texts, _embed_misses)
 
 class BookRetriever:
     def __init__(
         self,
-        persist_dir: str = "backend/vector_store/chroma_db",
-        collection_name: str = "books",
+        persist_dir: Optional[str] = None,
+        collection_name: Optional[str] = None,
+        backend: Optional[VectorBackend] = None,
+        mode: Optional[str] = None,
     ) -> None:
-        # NU atinge OPENAI aici; doar Chroma
-        self.client = chromadb.PersistentClient(
-            path=persist_dir,
-            settings=Settings(allow_reset=False),
-        )
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine"}
-        )
+        self.mode = (mode or RETRIEVAL_MODE).strip().lower()
+        if self.mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {self.mode!r} (expected one of {', '.join(RETRIEVAL_MODES)})")
+        # NU atinge OPENAI aici; indexul vectorial (Chroma sau NumPy, după VECTOR_BACKEND)
+        # se deschide abia la prima interogare vectorială, deci modul lexical nu-l încarcă deloc.
+        # Colecția implicită depinde de furnizorul de embeddings (collection_for).
+        self._persist_dir = persist_dir
+        self._collection_name = collection_name
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend(self) -> VectorBackend:
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    provider = get_embedding_provider()
+                    backend = make_backend(
+                        persist_dir=self._persist_dir,
+                        collection_name=self._collection_name or collection_for(provider),
+                    )
+                    # un index construit cu alt furnizor ar da distanțe fără sens: refuzăm explicit
+                    check_index_tag(backend.embedding_tag(), provider)
+                    self._backend = backend
+        return self._backend
+
+    @property
+    def uses_embeddings(self) -> bool:
+        return self.mode != "lexical"
+
+    def max_distance_for(self, match: BookMatch) -> float:
+        """
+        Pragul RAG pe scara distanței rezultatului: BM25 (modul lexical sau fallback-ul
+        hybrid când partea vectorială eșuează) vs distanța furnizorului de embeddings.
+        """
+        if match.lexical:
+            return LEXICAL_MAX_DISTANCE
+        return get_embedding_provider().max_distance
+
+    def embed(self, text: str) -> List[float]:
+        """Embedding-ul unui text (prin cache; util pentru cache-ul semantic de răspunsuri)."""
+        return _embed_texts([text])[0]
+
+    async def embed_async(self, text: str) -> List[float]:
+        return (await _embed_texts_async([text]))[0]
 
     def query(self, text: str, top_k: int = 1) -> List[BookMatch]:
-        text = (text or "").strip()
-        if not text:
+        return self.query_many([text], top_k)
+
+    async def query_async(self, text: str, top_k: int = 1) -> List[BookMatch]:
+        return await self.query_many_async([text], top_k)
+
+    def query_many(self, texts: List[str], top_k: int = 1) -> List[BookMatch]:
+        """
+        Mai multe variante de interogare într-un singur drum:
+        un singur embeddings.create + un singur collection.query (+ BM25, după mod).
+        Rezultatele sunt unificate pe titlu; ordinea e rangul final
+        (vector / lexical: distanța crescătoare, hybrid: scorul RRF).
+        """
+        texts = _unique_texts(texts)
+        if not texts:
             return []
-
-        # Embedding doar acum (cheia trebuie să existe DOAR aici)
-        query_emb = _embed_texts([text])[0]
-
-        res = self.collection.query(
-            query_embeddings=[query_emb],
-            n_results=max(1, int(top_k)),
-            include=["metadatas", "distances", "documents"],  # documents dacă ții summary acolo
-        )
-
-        matches: List[BookMatch] = []
-
-        # Chroma returnează liste imbricate
-        ids = (res.get("ids") or [[]])[0]
-        dists = (res.get("distances") or [[]])[0]
-        metas = (res.get("metadatas") or [[]])[0]
-        docs = (res.get("documents") or [[]])[0]
-
-        for i in range(len(ids)):
-            meta = metas[i] if i < len(metas) and metas[i] else {}
-            title = meta.get("title") or (docs[i][:80] if i < len(docs) else "Unknown")
-            summary = meta.get("summary") or (docs[i] if i < len(docs) else "")
-            distance = float(dists[i]) if i < len(dists) else 0.0
-            matches.append(BookMatch(title=title, summary=summary, distance=distance))
-
-        return matches
+        lexical = self._lexical_query(texts, top_k) if self.mode != "vector" else []
+        if self.mode == "lexical":
+            return lexical
+        try:
+            # embedding doar acum (cheia trebuie să existe DOAR aici)
+            vector = self._query_many_by_embeddings(_embed_texts(texts), top_k)
+        except Exception as e:
+            return self._vector_failed(e, lexical)
+        return vector if self.mode == "vector" else reciprocal_rank_fusion([vector, lexical])
+
+    async def query_many_async(self, texts: List[str], top_k: int = 1) -> List[BookMatch]:
+        """
+        Ca query_many(), dar embedding-ul merge pe clientul async, iar interogarea
+        indexului vectorial (sincronă) rulează într-un thread ca să nu blocheze
+        event loop-ul. BM25 rulează direct pe loop (microsecunde).
+        """
+        texts = _unique_texts(texts)
+        if not texts:
+            return []
+        lexical = self._lexical_query(texts, top_k) if self.mode != "vector" else []
+        if self.mode == "lexical":
+            return lexical
+        try:
+            embs = await _embed_texts_async(texts)
+            vector = await asyncio.to_thread(self._query_many_by_embeddings, embs, top_k)
+        except Exception as e:
+            return self._vector_failed(e, lexical)
+        return vector if self.mode == "vector" else reciprocal_rank_fusion([vector, lexical])
+
+    def _vector_failed(self, error: Exception, lexical: List[BookMatch]) -> List[BookMatch]:
+        if self.mode != "hybrid":
+            raise error
+        print(f"[Retriever] Vector search failed, using lexical results only: {error}")
+        return lexical
+
+    @traced("lexical")
+    def _lexical_query(self, texts: List[str], top_k: int) -> List[BookMatch]:
+        index = get_lexical_index()
+        return merge_matches([index.search(t, top_k) for t in texts])
+
+    @traced("retrieve")
+    def _collection_query(self, query_embs: List[List[float]], top_k: int) -> List[List[BookMatch]]:
+        """O listă de BookMatch pentru fiecare embedding (ordinea din input)."""
+        return self.backend.query(query_embs, top_k)
+
+    def _query_many_by_embeddings(self, query_embs: List[List[float]], top_k: int) -> List[BookMatch]:
+        return merge_matches(self._collection_query(query_embs, top_k))
+
+    def warmup(self) -> None:
+        if self.mode != "vector":
+            get_lexical_index()
+        if self.mode != "lexical":
+            self.backend.warmup()
+            get_embedding_provider().warmup()
+
+
+_retriever: Optional[BookRetriever] = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever() -> BookRetriever:
+    """Retriever-ul partajat, creat la primul apel (nu la import): Chroma pornește abia atunci."""
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = BookRetriever()
+    return _retriever
+
+
+def _unique_texts(texts: List[str]) -> List[str]:
+    out: List[str] = []
+    for t in texts or []:
+        t = (t or "").strip()
+        if t and t not in out:
+            out.append(t)
+    return out
+
+
+def merge_matches(rows: List[List[BookMatch]]) -> List[BookMatch]:
+    """Dedup pe titlu, păstrând distanța minimă; rezultat sortat după distanță."""
+    best: dict[str, BookMatch] = {}
+    for matches in rows:
+        for m in matches:
+            cur = best.get(m.title)
+            if cur is None or m.distance < cur.distance:
+                best[m.title] = m
+    return sorted(best.values(), key=lambda m: m.distance)
+
+
+def reciprocal_rank_fusion(rankings: List[List[BookMatch]], k: int = RRF_K) -> List[BookMatch]:
+    """
+    RRF: scor(titlu) = sum 1 / (k + rang) peste listele în care apare; ordinea
+    după scor descrescător, la egalitate după cel mai bun rang, apoi după ordinea
+    listelor (prima câștigă). Distanțele nu se compară între liste (l2 vs
+    pseudo-distanța BM25), deci fiecare titlu poartă doar distanța din PRIMA listă
+    (cea vectorială), iar titlurile care lipsesc din ea primesc inf: pragul
+    pragul RAG (max_distance_for) se aplică numai pe distanța vectorială reală.
+    """
+    scores: dict[str, float] = {}
+    best_rank: dict[str, int] = {}
+    order: dict[str, int] = {}
+    matches: dict[str, BookMatch] = {}
+    for i, ranking in enumerate(rankings):
+        for rank, m in enumerate(ranking, start=1):
+            scores[m.title] = scores.get(m.title, 0.0) + 1.0 / (k + rank)
+            best_rank[m.title] = min(rank, best_rank.get(m.title, rank))
+            if m.title not in matches:
+                order[m.title] = len(order)
+                matches[m.title] = m if i == 0 else BookMatch(title=m.title, summary=m.summary, distance=math.inf)
+    return sorted(matches.values(), key=lambda m: (-scores[m.title], best_rank[m.title], order[m.title]))
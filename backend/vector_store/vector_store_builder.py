@@ -1,67 +1,233 @@
-import os
+# backend/vector_store/vector_store_builder.py
+"""
+Indexer incremental pentru indexul vectorial de cărți (Chroma sau NumPy).
+
+    python -m backend.vector_store.vector_store_builder [--backend numpy] [--full] [--dry-run]
+
+sau din cod: build_index().
+Fiecare carte are un id stabil (derivat din titlu) și un hash al conținutului
+(titlu + rezumat). Re-embeduim doar cărțile noi/modificate, scriem cu upsert
+și ștergem id-urile care nu mai există în JSON, deci retrieval-ul rămâne
+disponibil pe tot parcursul rebuild-ului.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
 import json
-import shutil
-# ...existing code...
-from openai import OpenAI
-import chromadb
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from backend.services.book_catalog import normalize_title
+from backend.services.embedding_cache import get_embedding_cache
+from backend.vector_store.backends import VECTOR_BACKEND, VectorBackend, make_backend
+from backend.vector_store.embeddings import (
+    EMBEDDING_PROVIDER,
+    EmbeddingProvider,
+    check_index_tag,
+    collection_for,
+    make_provider,
+)
 
 # --- Config ---
 DATA_PATH = "backend/data/book_summaries.json"
-PERSIST_PATH = "backend/vector_store/chroma_db"
-COLLECTION_NAME = "books"
-EMBED_MODEL = "text-embedding-3-small"
-
-# --- Setup secrets ---
-api_key = os.getenv("OPENAI_API_KEY")
-if api_key:
-    api_key = api_key.strip()
-if not api_key:
-    raise ValueError("OPENAI_API_KEY missing in backend/.env")
-client = OpenAI(api_key=api_key)
-
-# --- Load data ---
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    books = json.load(f)
-if not isinstance(books, list) or not books:
-    raise ValueError("book_summaries.json must be a non-empty JSON list")
-
-# --- Ensure a clean persistent directory (optional but clear for first build) ---
-# Comment the next 3 lines if you want to keep previous data and just upsert new docs.
-if os.path.exists(PERSIST_PATH):
-    shutil.rmtree(PERSIST_PATH)
-
-# --- Persistent Chroma client ---
-chroma_client = chromadb.PersistentClient(path=PERSIST_PATH)
-
-# Drop existing collection if present (for a clean rebuild)
-existing = [c.name for c in chroma_client.list_collections()]
-if COLLECTION_NAME in existing:
-    chroma_client.delete_collection(COLLECTION_NAME)
-
-collection = chroma_client.create_collection(name=COLLECTION_NAME)
-
-# --- Build embeddings and add to Chroma ---
-ids = []
-docs = []
-metas = []
-vectors = []
-
-for idx, book in enumerate(books):
-    title = book["title"].strip()
-    summary = book["summary"].strip()
-    if not title or not summary:
-        continue
-
-    # Create embedding
-    emb = client.embeddings.create(model=EMBED_MODEL, input=summary).data[0].embedding
-
-    ids.append(f"book-{idx}")
-    docs.append(summary)
-    metas.append({"title": title})
-    vectors.append(emb)
-
-# Important: pass `embeddings` explicitly so Chroma stores vectors
-collection.add(ids=ids, documents=docs, metadatas=metas, embeddings=vectors)
-
-print(f"OK: Built collection '{COLLECTION_NAME}' with {len(ids)} items.")
-print(f"Persisted at: {os.path.abspath(PERSIST_PATH)}")
+PERSIST_PATH = None         # implicit: directorul backend-ului (chroma_db / numpy_index)
+COLLECTION_NAME = None      # implicit: colecția furnizorului de embeddings ("books" pentru OpenAI)
+
+EMBED_BATCH_SIZE = 256      # input-uri per embeddings.create
+EMBED_CONCURRENCY = 4       # request-uri de embeddings în paralel
+
+
+def book_id(title: str) -> str:
+    """Id stabil: nu depinde de poziția în JSON."""
+    return "book-" + hashlib.sha1(normalize_title(title).encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(title: str, summary: str) -> str:
+    return hashlib.sha256(f"{title}\x00{summary}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class BuildReport:
+    total: int = 0
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    embedded: int = 0           # texte trimise efectiv la furnizor (miss-uri de cache)
+    seconds: float = 0.0
+    deleted_ids: List[str] = field(default_factory=list)
+
+
+# ---------------- Embeddings (loturi + paralel + retry) ----------------
+
+def embed_documents(
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+    report: Optional[BuildReport] = None,
+    provider: Optional[EmbeddingProvider] = None,
+) -> List[List[float]]:
+    """Embeddings în ordinea input-ului; doar miss-urile din cache ajung la furnizor."""
+    if not texts:
+        return []
+    provider = provider or make_provider()
+
+    def _embed_misses(misses: List[str]) -> List[List[float]]:
+        if report is not None:
+            report.embedded += len(misses)
+        return provider.embed_documents(misses, batch_size=batch_size, concurrency=concurrency)
+
+    return get_embedding_cache().embed(provider.cache_key, texts, _embed_misses)
+
+
+# ---------------- Index ----------------
+
+def _load_books(data_path: str) -> list:
+    with open(data_path, "r", encoding="utf-8") as f:
+        books = json.load(f)
+    if not isinstance(books, list) or not books:
+        raise ValueError("book_summaries.json must be a non-empty JSON list")
+    return books
+
+
+def open_backend(
+    persist_path: Optional[str] = PERSIST_PATH,
+    collection_name: Optional[str] = COLLECTION_NAME,
+    backend: Optional[str] = None,
+    provider: Optional[EmbeddingProvider] = None,
+) -> VectorBackend:
+    """
+    Indexul existent (cu spațiul lui de distanță, indiferent care e) sau unul nou
+    creat cu COLLECTION_METADATA. Nu schimbăm spațiul unui index existent:
+    pragul de distanță din chat_with_llm e calibrat pe el.
+    Un index etichetat cu alt furnizor de embeddings e refuzat (ValueError).
+    """
+    provider = provider or make_provider()
+    index = make_backend(backend, persist_dir=persist_path, collection_name=collection_name or collection_for(provider))
+    check_index_tag(index.embedding_tag(), provider)
+    return index
+
+
+def build_index(
+    data_path: str = DATA_PATH,
+    persist_path: Optional[str] = PERSIST_PATH,
+    collection_name: Optional[str] = COLLECTION_NAME,
+    backend: Optional[str] = None,
+    provider: Optional[str] = None,
+    full: bool = False,
+    dry_run: bool = False,
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+) -> BuildReport:
+    """
+    Sincronizează colecția cu JSON-ul:
+      - cărți noi / modificate (hash diferit) -> embedding + upsert
+      - id-uri care nu mai sunt în JSON -> delete
+    full=True tratează toate cărțile ca modificate (embeddings tot din cache, dacă există).
+    """
+    t0 = time.perf_counter()
+    report = BuildReport()
+
+    # --- JSON -> (id -> record) ---
+    wanted: dict[str, dict] = {}
+    for book in _load_books(data_path):
+        title = (book.get("title") or "").strip()
+        summary = (book.get("summary") or "").strip()
+        if not title or not summary:
+            continue
+        wanted.setdefault(book_id(title), {
+            "title": title,
+            "summary": summary,
+            "content_hash": content_hash(title, summary),
+        })
+    report.total = len(wanted)
+
+    embedder = make_provider(provider)
+    index = open_backend(persist_path, collection_name, backend, embedder)
+    existing_hash = {i: m.get("content_hash") for i, m in index.get_metadata().items()}
+
+    to_upsert: List[str] = []
+    for bid, rec in wanted.items():
+        if bid not in existing_hash:
+            report.added += 1
+            to_upsert.append(bid)
+        elif full or existing_hash[bid] != rec["content_hash"]:
+            report.updated += 1
+            to_upsert.append(bid)
+        else:
+            report.unchanged += 1
+
+    report.deleted_ids = [i for i in existing_hash if i not in wanted]
+    report.deleted = len(report.deleted_ids)
+
+    if dry_run:
+        report.seconds = time.perf_counter() - t0
+        return report
+
+    # --- embeddings doar pentru ce s-a schimbat ---
+    docs = [wanted[i]["summary"] for i in to_upsert]
+    vectors = embed_documents(docs, batch_size=batch_size, concurrency=concurrency, report=report, provider=embedder)
+
+    index.upsert(
+        ids=to_upsert,
+        embeddings=vectors,
+        metadatas=[dict(wanted[i]) for i in to_upsert],
+        documents=docs,
+    )
+
+    # ștergem la final: până aici indexul a rămas interogabil
+    index.delete(report.deleted_ids)
+    if index.embedding_tag() != embedder.tag:
+        index.set_embedding_tag(embedder.tag)
+
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+# ---------------- CLI ----------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Incremental vector index builder for book summaries.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default=VECTOR_BACKEND)
+    parser.add_argument("--persist", default=PERSIST_PATH, help="index directory (default depends on backend)")
+    parser.add_argument("--provider", choices=["openai", "local"], default=EMBEDDING_PROVIDER,
+                        help="embedding provider (default: EMBEDDING_PROVIDER)")
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="default depends on the embedding provider")
+    parser.add_argument("--full", action="store_true", help="re-upsert every book (embeddings still come from cache)")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv, find_dotenv
+    load_dotenv(find_dotenv(), override=False)
+
+    collection = args.collection or collection_for(make_provider(args.provider))
+    report = build_index(
+        data_path=args.data,
+        persist_path=args.persist,
+        collection_name=collection,
+        backend=args.backend,
+        provider=args.provider,
+        full=args.full,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    prefix = "DRY RUN: " if args.dry_run else "OK: "
+    print(
+        f"{prefix}{args.backend} index '{collection}': "
+        f"{report.total} books, +{report.added} added, ~{report.updated} updated, ={report.unchanged} unchanged, "
+        f"-{report.deleted} deleted, {report.embedded} embedded via {args.provider} ({report.seconds:.2f}s)"
+    )
+    if args.persist:
+        print(f"Persisted at: {os.path.abspath(args.persist)}")
+    print(f"Embedding cache: {get_embedding_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# tests/conftest.py
+"""
+Testele rulează din rădăcina repo-ului (căile "backend/..." sunt relative la ea)
+și fără cache-urile persistente, ca să nu scrie în backend/cache.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+for var in ("EMBED_CACHE_PATH", "TRANSLATION_CACHE_PATH", "TRANSCRIPTION_CACHE_PATH"):
+    os.environ.setdefault(var, "")
+os.environ.setdefault("TTS_PREWARM_TOP_N", "0")
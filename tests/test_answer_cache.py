@@ -0,0 +1,82 @@
+# tests/test_answer_cache.py
+import asyncio
+
+import pytest
+
+from backend import LLMHW
+from backend.services import answer_cache as answer_cache_module
+from backend.services.answer_cache import SemanticAnswerCache
+
+
+def test_hit_inside_radius_miss_outside():
+    cache = SemanticAnswerCache(radius=0.1)
+    cache.store("en", "The Hobbit", [1.0, 0.0], "answer")
+    assert cache.lookup("en", "The Hobbit", [1.0, 0.05]) == "answer"    # 1 - cos ~ 0.001
+    assert cache.lookup("en", "The Hobbit", [1.0, 1.0]) is None          # 1 - cos ~ 0.29
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_buckets_are_isolated():
+    cache = SemanticAnswerCache(radius=0.1)
+    cache.store("en", "The Hobbit", [1.0, 0.0], "hobbit")
+    assert cache.lookup("ro", "The Hobbit", [1.0, 0.0]) is None
+    assert cache.lookup("en", "1984", [1.0, 0.0]) is None
+    assert cache.lookup("en", "The Hobbit", [1.0, 0.0]) == "hobbit"
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache_module.time, "monotonic", lambda: now[0])
+    cache = SemanticAnswerCache(radius=0.1, ttl_s=60)
+    cache.store("en", "The Hobbit", [1.0, 0.0], "answer")
+    now[0] += 59
+    assert cache.lookup("en", "The Hobbit", [1.0, 0.0]) == "answer"
+    now[0] += 2
+    assert cache.lookup("en", "The Hobbit", [1.0, 0.0]) is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_bucket_and_global_eviction():
+    cache = SemanticAnswerCache(radius=0.1, max_entries=3, bucket_size=2)
+    axes = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    for i, vec in enumerate(axes):
+        cache.store("en", "A", vec, f"a{i}")
+    assert cache.stats()["evictions"] == 1            # bucket-ul A ține doar 2
+    assert cache.stats()["size"] == 2
+
+    cache.store("en", "B", axes[0], "b0")
+    cache.store("en", "C", axes[0], "c0")
+    assert cache.stats()["evictions"] == 2            # LRU global: max 3 intrări
+    assert cache.stats()["size"] == 3
+    assert cache.lookup("en", "A", axes[0]) is None      # a0: evicție din bucket
+    assert cache.lookup("en", "A", axes[1]) is None      # a1, cea mai veche, a ieșit la LRU-ul global
+    assert cache.lookup("en", "A", axes[2]) == "a2"
+
+
+@pytest.mark.parametrize("radius", [0.0, -1.0])
+def test_disabled_when_radius_not_positive(radius):
+    cache = SemanticAnswerCache(radius=radius)
+    assert not cache.enabled
+    cache.store("en", "The Hobbit", [1.0, 0.0], "answer")
+    assert cache.lookup("en", "The Hobbit", [1.0, 0.0]) is None
+    assert cache.stats()["size"] == 0
+
+
+class _FailingRetriever:
+    uses_embeddings = True
+
+    def embed(self, text):
+        raise RuntimeError("embeddings API down")
+
+    async def embed_async(self, text):
+        raise RuntimeError("embeddings API down")
+
+
+def test_embedding_failure_is_a_cache_miss(monkeypatch):
+    monkeypatch.setattr(LLMHW, "get_retriever", lambda: _FailingRetriever())
+    monkeypatch.setattr(LLMHW, "get_answer_cache", lambda: SemanticAnswerCache(radius=0.1))
+    turn = LLMHW._RagTurn(lang="en", english_input="dragons", title="The Hobbit", summary="", full_summary=None)
+    assert asyncio.run(LLMHW._cached_answer_async(turn)) == (None, None)
+    assert LLMHW._answer_cache_embedding(_FailingRetriever(), "dragons") is None
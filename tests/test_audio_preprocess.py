@@ -0,0 +1,26 @@
+# tests/test_audio_preprocess.py
+import io
+
+import numpy as np
+
+from backend.tools.audio_preprocess import encode_wav, preprocess_upload
+
+
+def test_malformed_wav_is_sent_as_is():
+    raw = b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00" + b"not really pcm" * 4
+    prepared = preprocess_upload(io.BytesIO(raw), "upload.wav", len(raw))
+    assert prepared.reason == "passthrough"
+    assert not prepared.silent
+    assert prepared.audio.read() == raw
+
+
+def test_webm_is_sent_as_is():
+    raw = b"\x1a\x45\xdf\xa3" + b"\x00" * 64
+    prepared = preprocess_upload(io.BytesIO(raw), "upload.webm", len(raw))
+    assert (prepared.reason, prepared.filename) == ("passthrough", "upload.webm")
+
+
+def test_silent_wav_is_rejected_locally():
+    raw = encode_wav(np.zeros(16000, dtype=np.float32)).getvalue()
+    prepared = preprocess_upload(io.BytesIO(raw), "upload.wav", len(raw))
+    assert prepared.silent
@@ -0,0 +1,60 @@
+# tests/test_backends.py
+import numpy as np
+import pytest
+
+from backend.vector_store.backends import ChromaBackend, NumpyBackend, VectorBackend
+
+N_DOCS, DIM = 40, 16
+
+
+def _unit_rows(rng, n):
+    v = rng.normal(size=(n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(7)
+    ids = [f"book-{i}" for i in range(N_DOCS)]
+    metas = [{"title": f"Book {i}", "summary": f"Summary {i}"} for i in range(N_DOCS)]
+    docs = [m["summary"] for m in metas]
+    return ids, _unit_rows(rng, N_DOCS).tolist(), metas, docs, _unit_rows(rng, 5).tolist()
+
+
+def test_incomplete_backend_fails_at_creation():
+    class Partial(VectorBackend):
+        def query(self, embeddings, top_k):
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_numpy_matches_chroma_l2(tmp_path, corpus):
+    ids, embs, metas, docs, queries = corpus
+    chroma = ChromaBackend(str(tmp_path / "chroma"), "parity")
+    numpy_backend = NumpyBackend(str(tmp_path / "numpy"), "parity")
+    for b in (chroma, numpy_backend):
+        b.upsert(ids, embs, metas, docs)
+
+    expected = chroma.query(queries, top_k=5)
+    got = numpy_backend.query(queries, top_k=5)
+    for exp_row, got_row in zip(expected, got):
+        assert [m.title for m in got_row] == [m.title for m in exp_row]
+        assert [m.distance for m in got_row] == pytest.approx([m.distance for m in exp_row], abs=1e-4)
+
+
+def test_numpy_mmap_sidecar_round_trip(tmp_path, corpus):
+    ids, embs, metas, docs, queries = corpus
+    writer = NumpyBackend(str(tmp_path), "books-test")
+    writer.upsert(ids, embs, metas, docs)
+    writer.set_embedding_tag({"embedding_provider": "local", "embedding_dim": DIM})
+    writer.delete(["book-0"])
+
+    reader = NumpyBackend(str(tmp_path), "books-test")
+    assert isinstance(reader._matrix, np.memmap)
+    assert reader.count() == N_DOCS - 1
+    assert reader.embedding_tag() == {"embedding_provider": "local", "embedding_dim": DIM}
+    assert reader.get_metadata()["book-1"] == metas[1]
+    assert [[m.title for m in row] for row in reader.query(queries, 3)] == \
+        [[m.title for m in row] for row in writer.query(queries, 3)]
@@ -0,0 +1,25 @@
+# tests/test_benchmark_results.py
+import json
+
+from backend.benchmarks.results import compare, save
+
+
+def test_config_is_saved_under_meta_and_not_compared(tmp_path):
+    old = json.loads(open(save("load", {"achieved_rps": 10.0, "latency": {"p95_ms": 100.0}},
+                                str(tmp_path / "old.json"), {"target_rps": 10})).read())
+    new = json.loads(open(save("load", {"achieved_rps": 10.0, "latency": {"p95_ms": 100.0}},
+                                str(tmp_path / "new.json"), {"target_rps": 5})).read())
+    assert old["meta"]["config"] == {"target_rps": 10}
+    rows = compare(old, new)
+    assert {r["key"] for r in rows} == {"achieved_rps", "latency.p95_ms"}
+    assert not any(r["regression"] for r in rows)
+
+
+def test_regression_directions():
+    rows = {r["key"]: r for r in compare(
+        {"results": {"achieved_rps": 10.0, "p95_ms": 100.0, "requests": 100}},
+        {"results": {"achieved_rps": 8.0, "p95_ms": 130.0, "requests": 50}},
+    )}
+    assert rows["achieved_rps"]["regression"]
+    assert rows["p95_ms"]["regression"]
+    assert not rows["requests"]["regression"]
@@ -0,0 +1,21 @@
+# tests/test_cache.py
+from backend.services.cache import TwoTierCache
+
+
+def test_two_tier_cache_reads_back_from_disk(tmp_path):
+    path = str(tmp_path / "kv.sqlite3")
+    first = TwoTierCache(path, "kv", memory_size=8, disk_max_entries=100, ttl_s=None, label="Test Cache")
+    first.set("k", "valoare")
+    assert first.get("k") == "valoare"
+
+    second = TwoTierCache(path, "kv", memory_size=8, disk_max_entries=100, ttl_s=None, label="Test Cache")
+    assert second.get("k") == "valoare"
+    assert second.get("missing") is None
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_two_tier_cache_without_disk():
+    cache = TwoTierCache("", "kv", memory_size=8, disk_max_entries=100, ttl_s=None, label="Test Cache")
+    assert cache.disk is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
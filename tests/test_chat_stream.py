@@ -0,0 +1,100 @@
+# tests/test_chat_stream.py
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import LLMHW
+from backend.api.routes_chat import router as chat_router
+
+
+class _FakeStream:
+    """Imită stream-ul AsyncOpenAI: chunk-uri cu choices[0].delta.content; opțional eșuează la final."""
+
+    def __init__(self, deltas: list[str], fail: bool = False):
+        self._deltas = deltas
+        self._fail = fail
+
+    async def __aiter__(self):
+        for delta in self._deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+        if self._fail:
+            raise RuntimeError("upstream closed")
+
+
+def _fake_client(stream: _FakeStream):
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def client_for(monkeypatch):
+    def _make(stream: _FakeStream) -> TestClient:
+        turn = LLMHW._RagTurn(
+            lang="en",
+            english_input="a book about hobbits",
+            title="The Hobbit",
+            summary="Bilbo goes on an adventure.",
+            full_summary="Bilbo Baggins leaves the Shire.",
+        )
+
+        async def route(user_input):
+            return turn
+
+        async def no_cache(turn):
+            return None, None
+
+        monkeypatch.setattr(LLMHW, "_route_turn_async", route)
+        monkeypatch.setattr(LLMHW, "_cached_answer_async", no_cache)
+        monkeypatch.setattr(LLMHW, "_get_async_client", lambda: _fake_client(stream))
+
+        app = FastAPI()
+        app.include_router(chat_router)
+        return TestClient(app)
+    return _make
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_event_order(client_for):
+    client = client_for(_FakeStream(["Bilbo ", "is ", "a hobbit."]))
+    resp = client.post("/api/chat/stream", json={"text": "a book about hobbits"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(resp.text)
+    assert [name for name, _ in events] == ["token", "token", "token", "summary", "meta", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == "Bilbo is a hobbit."
+    assert events[3][1]["title"] == "The Hobbit"
+    assert events[4][1] == {
+        "lang": "en",
+        "title": "The Hobbit",
+        "summary": "Bilbo Baggins leaves the Shire.",
+        "tts_available": True,
+    }
+
+
+def test_stream_emits_error_when_generator_raises(client_for, capsys):
+    client = client_for(_FakeStream(["Bilbo "], fail=True))
+    resp = client.post("/api/chat/stream", json={"text": "a book about hobbits"})
+    assert resp.status_code == 200
+
+    events = _events(resp.text)
+    assert [name for name, _ in events] == ["token", "error", "done"]
+    assert events[1][1] == {"detail": "Chat failed"}
+    assert "[Chat stream error] upstream closed" in capsys.readouterr().out
+
+
+def test_empty_text_is_rejected(client_for):
+    client = client_for(_FakeStream([]))
+    assert client.post("/api/chat/stream", json={"text": "   "}).status_code == 422
@@ -0,0 +1,44 @@
+# tests/test_embeddings.py
+import pytest
+
+from backend.vector_store.embeddings import (
+    LocalEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    check_index_tag,
+    collection_for,
+)
+
+
+class _NoNetwork(OpenAIEmbeddingProvider):
+    def embed(self, texts):
+        raise AssertionError("collection_for must not embed")
+
+
+def test_collection_for_does_not_probe_unknown_models():
+    assert collection_for(OpenAIEmbeddingProvider()) == "books"
+    assert collection_for(LocalEmbeddingProvider()) == "books-local-384"
+    assert collection_for(_NoNetwork("my-org/embed v2")) == "books-openai-my-org-embed-v2"
+
+
+def test_max_distance_is_per_model():
+    assert OpenAIEmbeddingProvider().max_distance == 1.6
+    assert LocalEmbeddingProvider().max_distance == 1.4
+
+
+def test_check_index_tag():
+    local = LocalEmbeddingProvider()
+    check_index_tag(None, local)
+    check_index_tag({}, local)
+    check_index_tag(local.tag, local)
+    with pytest.raises(ValueError, match="different embedding provider"):
+        check_index_tag(OpenAIEmbeddingProvider().tag, local)
+
+
+def test_provider_without_embed_fails_at_creation():
+    from backend.vector_store.embeddings import EmbeddingProvider
+
+    class Partial(EmbeddingProvider):
+        name = "partial"
+
+    with pytest.raises(TypeError):
+        Partial("model")
@@ -0,0 +1,44 @@
+# tests/test_language_detection.py
+import pytest
+
+from backend.services.language_detection import LanguageDetector, looks_like
+
+# setul etichetat din user-012 + cazurile în care româna câștiga pe un cuvânt comun
+SAMPLES = [
+    ("Recommend a book about friendship and magic", "en"),
+    ("What is 1984 about?", "en"),
+    ("Tell me about The Hobbit", "en"),
+    ("hi", "en"),
+    ("thanks", "en"),
+    ("I want a story with dragons", "en"),
+    ("Can you recommend something like Harry Potter?", "en"),
+    ("A book about war and peace", "en"),
+    ("Vreau o carte despre dragoni", "ro"),
+    ("Ce carte imi recomanzi despre prietenie?", "ro"),
+    ("spune-mi despre Hobbitul", "ro"),
+    ("Îmi poți recomanda o carte?", "ro"),
+    ("buna, ce stii despre 1984", "ro"),
+    ("Mulțumesc!", "ro"),
+    ("vreau ceva cu magie", "ro"),
+    ("Povestea lui Harry Potter", "ro"),
+    ("carte despre razboi si pace", "ro"),
+    ("Recommande-moi un livre sur l'amitié", "fr"),
+    ("Quel est le livre le plus célèbre?", "fr"),
+    ("Je veux un roman de science-fiction", "fr"),
+    ("¿Qué libro me recomiendas sobre la amistad?", "es"),
+    ("Quiero un libro de amor", "es"),
+    ("Ich möchte ein Buch über Drachen", "de"),
+    ("Parlami di un libro sulla magia", "it"),
+    ("Você pode recomendar um livro?", "pt"),
+    ("O que é 1984?", "pt"),
+]
+
+
+@pytest.mark.parametrize("text,expected", SAMPLES)
+def test_detect(text, expected):
+    assert LanguageDetector().detect(text) == expected
+
+
+def test_shared_word_tie_is_not_romanian():
+    assert not looks_like("un de", "ro")
+    assert looks_like("vreau un roman", "ro")
@@ -0,0 +1,23 @@
+# tests/test_lexical.py
+from backend.services.book_catalog import get_catalog
+from backend.vector_store.lexical import BM25Index, score_to_distance, tokenize
+
+
+def test_tokenize_drops_stopwords_and_plural():
+    assert tokenize("Tell me about Dragons and the Glass") == ["dragon", "glass"]
+
+
+def test_score_to_distance_is_monotonic():
+    assert score_to_distance(0.0) == 2.0
+    assert score_to_distance(4.0) == 1.0
+    assert score_to_distance(10.0) < score_to_distance(1.0)
+
+
+def test_bm25_finds_title_terms():
+    snapshot = get_catalog().snapshot()
+    index = BM25Index(snapshot)
+    assert len(index) == len(snapshot.records)
+    hits = index.search("hobbit dragon treasure", top_k=3)
+    assert hits and hits[0].title == "The Hobbit"
+    assert [m.distance for m in hits] == sorted(m.distance for m in hits)
+    assert index.search("recommend a book please", top_k=3) == []
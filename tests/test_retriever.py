@@ -0,0 +1,60 @@
+# tests/test_retriever.py
+import math
+
+from backend import LLMHW
+from backend.vector_store import retriever as retriever_module
+from backend.vector_store.backends import BookMatch
+from backend.vector_store.embeddings import LocalEmbeddingProvider
+from backend.vector_store.lexical import LEXICAL_MAX_DISTANCE
+from backend.vector_store.retriever import BookRetriever, merge_matches, reciprocal_rank_fusion
+
+
+def _m(title, distance):
+    return BookMatch(title=title, summary=f"{title} summary", distance=distance)
+
+
+def test_rrf_keeps_vector_distance_only():
+    vector = [_m("A", 1.1), _m("B", 1.3)]
+    lexical = [_m("C", 0.4), _m("A", 0.9)]
+    fused = reciprocal_rank_fusion([vector, lexical])
+    assert [m.title for m in fused] == ["A", "C", "B"]
+    by_title = {m.title: m.distance for m in fused}
+    assert by_title["A"] == 1.1
+    assert math.isinf(by_title["C"])
+
+
+def test_rrf_ties_break_on_rank_then_list_order():
+    # B și C au același scor (rang 2 într-o singură listă); A și D la fel (rang 1)
+    vector = [_m("A", 1.5), _m("B", 0.2)]
+    lexical = [_m("D", 0.1), _m("C", 0.1)]
+    assert [m.title for m in reciprocal_rank_fusion([vector, lexical])] == ["A", "D", "B", "C"]
+
+
+def test_merge_matches_keeps_min_distance():
+    merged = merge_matches([[_m("A", 1.2), _m("B", 0.9)], [_m("A", 0.5)]])
+    assert [(m.title, m.distance) for m in merged] == [("A", 0.5), ("B", 0.9)]
+
+
+class _BrokenLocalProvider(LocalEmbeddingProvider):
+    def embed(self, texts):
+        raise RuntimeError("embedding model unavailable")
+
+
+class _UnusedBackend:
+    def query(self, embs, top_k):
+        raise AssertionError("vector index must not be queried")
+
+
+def test_hybrid_fallback_is_gated_on_the_lexical_scale(monkeypatch):
+    monkeypatch.setattr(retriever_module, "get_embedding_provider", lambda: _BrokenLocalProvider())
+    retriever = BookRetriever(mode="hybrid", backend=_UnusedBackend())
+
+    matches = retriever.query_many(["hobbit dragon treasure"], top_k=3)
+    assert matches and all(m.lexical for m in matches)
+    assert retriever.max_distance_for(matches[0]) == LEXICAL_MAX_DISTANCE
+
+    # între pragul MiniLM (1.4) și cel BM25 (1.6): acceptat doar pe scara lexicală
+    lexical_hit = BookMatch(title="The Hobbit", summary="", distance=1.5, lexical=True)
+    assert LLMHW._best_candidate([lexical_hit], retriever) == (1.5, "The Hobbit", "")
+    vector_hit = BookMatch(title="The Hobbit", summary="", distance=1.5)
+    assert LLMHW._best_candidate([vector_hit], retriever) is None
@@ -0,0 +1,31 @@
+# tests/test_route_turn.py
+import asyncio
+
+import pytest
+
+from backend import LLMHW
+
+
+def test_moderation_failure_cancels_translation(monkeypatch):
+    translation = {}
+
+    async def failing_moderation(text):
+        await asyncio.sleep(0)
+        raise RuntimeError("moderation down")
+
+    async def slow_translate(text, target_lang, source_lang):
+        translation["task"] = asyncio.current_task()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(LLMHW, "detect_language", lambda text: "ro")
+    monkeypatch.setattr(LLMHW, "is_offensive_async", failing_moderation)
+    monkeypatch.setattr(LLMHW, "translate_async", slow_translate)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="moderation down"):
+            await LLMHW._route_turn_async("Recomandă-mi o carte despre hobbiți")
+        await asyncio.sleep(0)
+        # verificăm în interiorul buclei: la închidere asyncio.run anulează oricum task-urile rămase
+        assert translation["task"].cancelled()
+
+    asyncio.run(run())
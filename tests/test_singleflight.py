@@ -0,0 +1,84 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services.singleflight import SingleFlight
+
+
+def test_eight_threads_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    def worker():
+        barrier.wait()
+        results.append(flight.do("k", upstream))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_async_waiters_share_result_and_errors():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def main():
+        assert await asyncio.gather(*(flight.do_async("a", upstream) for _ in range(8))) == ["ok"] * 8
+        errors = await asyncio.gather(*(flight.do_async("e", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(e, ValueError) for e in errors)
+
+    asyncio.run(main())
+    assert len(calls) == 1
+    assert not flight.in_flight("a") and not flight.in_flight("e")
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    flight = SingleFlight("test")
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(main()) == 7
+
+
+def test_keys_are_released_after_the_call():
+    flight = SingleFlight("test")
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["calls"] == 2
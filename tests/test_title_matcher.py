@@ -0,0 +1,71 @@
+# tests/test_title_matcher.py
+import random
+import re
+from difflib import get_close_matches
+
+from backend.services.book_catalog import normalize_title
+from backend.tools.book_summary_tool import _resolve_in_single_text, list_titles, title_alias_map
+
+
+def _reference_resolve(raw_text):
+    """_resolve_in_single_text de dinainte de TitleMatcher (scanare liniară), ca referință."""
+    if not raw_text:
+        return None
+    t_low = raw_text.lower()
+    for title in list_titles():
+        if re.search(r"\b" + re.escape(title.lower()) + r"\b", t_low):
+            return title
+    norm_text = normalize_title(t_low)
+    amap = title_alias_map()
+    for ak, canonical in amap.items():
+        if ak and ak in norm_text:
+            return canonical
+    norm_titles = {normalize_title(tt): tt for tt in list_titles()}
+    for nk, orig in norm_titles.items():
+        if nk and nk in norm_text:
+            return orig
+    alias_keys = list(amap.keys())
+    close = get_close_matches(norm_text, alias_keys, n=1, cutoff=0.82)
+    if close:
+        return amap[close[0]]
+    tokens = norm_text.split()
+    candidates = {" ".join(tokens[i:i + size]) for size in (2, 3, 4) for i in range(max(0, len(tokens) - size + 1))}
+    if candidates:
+        close = get_close_matches(" ".join(tokens), alias_keys, n=1, cutoff=0.75)
+        if close:
+            return amap[close[0]]
+        for cand in sorted(candidates):
+            c1 = get_close_matches(cand, alias_keys, n=1, cutoff=0.8)
+            if c1:
+                return amap[c1[0]]
+    close2 = get_close_matches(norm_text, list(norm_titles), n=1, cutoff=0.82)
+    if close2:
+        return norm_titles[close2[0]]
+    return None
+
+
+def _random_inputs(n, seed=1):
+    rng = random.Random(seed)
+    pool = list_titles() + list(title_alias_map()) + [
+        "tell me about", "what is", "hobit", "mockin bird", "gatsbi", "1984?", "harry", "poter",
+        "_1984", "x1984", "the", "frankenstien", "moby dick", "jane eyre!", "animal farms",
+        "brave new wrld", "narnya",
+    ]
+    for _ in range(n):
+        txt = rng.choice([" ", "", "-", "_"]).join(rng.choice(pool) for _ in range(rng.randint(1, 3)))
+        if rng.random() < 0.3:
+            i = rng.randrange(len(txt) + 1)
+            txt = txt[:i] + rng.choice("abcxyz _-") + txt[i + 1:]
+        yield txt
+
+
+def test_matches_reference_on_randomized_inputs():
+    mismatches = [(t, _reference_resolve(t), _resolve_in_single_text(t))
+                  for t in _random_inputs(30_000) if _reference_resolve(t) != _resolve_in_single_text(t)]
+    assert mismatches[:5] == []
+
+
+def test_known_queries():
+    assert _resolve_in_single_text("Tell me about The Hobbit") == "The Hobbit"
+    assert _resolve_in_single_text("") is None
+    assert _resolve_in_single_text("something cozy for a rainy weekend") is None
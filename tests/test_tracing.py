@@ -0,0 +1,25 @@
+# tests/test_tracing.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.services.tracing import TimingMiddleware, route_stats
+
+
+def test_unmatched_paths_share_one_label():
+    app = FastAPI(root_path="/prefix")
+    app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: str):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nope/1")
+    client.get("/nope/2")
+
+    labels = set(route_stats())
+    assert "GET /items/{item_id}" in labels
+    assert "GET unmatched" in labels
+    assert not any("nope" in label or label.endswith("/prefix") for label in labels)
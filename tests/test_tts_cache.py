@@ -0,0 +1,20 @@
+# tests/test_tts_cache.py
+import time
+
+from backend.services.tts_cache import TTSCache
+
+
+def _fake_synth(text, lang, out_path):
+    with open(out_path, "wb") as f:
+        f.write(b"ID3" + text.encode("utf-8"))
+
+
+def test_evict_only_touches_cache_files(tmp_path):
+    legacy = tmp_path / "87bf51ab35e5422fadec17fe46023429.mp3"
+    legacy.write_bytes(b"ID3 legacy")
+    cache = TTSCache(directory=str(tmp_path), max_age_s=60, synthesize=_fake_synth)
+    cache.get_or_create("hello", "en")
+
+    assert cache.evict(now=time.time() + 3600) == 1
+    assert legacy.exists()
+    assert not list(tmp_path.glob("tts-*.mp3"))
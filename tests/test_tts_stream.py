@@ -0,0 +1,33 @@
+# tests/test_tts_stream.py
+import asyncio
+
+from backend.tools import tts_tool
+
+
+class _FailingCache:
+    """Prima bucată reușește, a doua eșuează; restul n-ar trebui să conteze."""
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.calls = []
+
+    def get_or_create(self, text, lang):
+        self.calls.append(text)
+        if len(self.calls) == 2:
+            raise RuntimeError("gTTS failed")
+        path = self.tmp_path / f"chunk-{len(self.calls)}.mp3"
+        path.write_bytes(f"ID3-{len(self.calls)}".encode())
+        return str(path)
+
+
+def test_failing_chunk_ends_stream_cleanly(tmp_path, monkeypatch, capsys):
+    cache = _FailingCache(tmp_path)
+    monkeypatch.setattr(tts_tool, "get_tts_cache", lambda: cache)
+    text = " ".join(f"This is sentence number {i}, long enough to be its own chunk." for i in range(6))
+
+    async def collect():
+        return [data async for data in tts_tool.stream_synthesis(text, "en", lookahead=1)]
+
+    assert asyncio.run(collect()) == [b"ID3-1"]
+    assert "[TTS stream error] chunk 1: gTTS failed" in capsys.readouterr().out
+    assert len(cache.calls) == 2      # lookahead=1: după eșec nu mai pornim alte bucăți